@@ -0,0 +1,171 @@
+"Benchmarks of the calculator. Run `python bench.py [name ...]`."
+
+import sys
+sys.path.append('src')
+
+from time import perf_counter
+
+import config
+import os, tempfile
+from parse import calc_parse, ScriptCache
+
+
+def timeit(f, *args, repeat=3):
+    "The best time of several runs of $f on $args."
+    best = float('inf')
+    for _ in range(repeat):
+        start = perf_counter()
+        f(*args)
+        best = min(best, perf_counter() - start)
+    return best
+
+
+def report(title, make_line, sizes, run=calc_parse):
+    "Time $run on the lines made for each size and show the time per item."
+    print(title)
+    for n in sizes:
+        line = make_line(n)
+        t = timeit(run, line)
+        print('  n = %-7d %8.4fs  %6.2fµs/item' % (n, t, t / n * 1e6))
+
+
+def bench_parse():
+    "Parsing should scale linearly with the length of the line."
+    sizes = [1000, 2000, 4000, 8000, 16000]
+    report('list literal [1, 2, ...]',
+           lambda n: '[%s]' % ', '.join(map(str, range(n))), sizes)
+    report('SEQ chain x+1*2-3...',
+           lambda n: 'x' + ''.join('+*-/'[i % 4] + str(i) for i in range(n)), sizes)
+
+
+def bench_eval():
+    "Calls of recursive Maps, made again after k is rebound to forget the memoized results."
+    import format  # sets objects.tree2str
+    from eval import calc_eval
+
+    def rebind_and_eval(line):
+        calc_eval('k = 1')
+        return calc_eval(line)
+
+    calc_eval('count[n] = 0 if n == 0 else k + count[n-1]')
+    calc_eval('sum_to[n] = 0 if n == 0 else n + k*sum_to[n-1]')
+    report('count[n]', lambda n: 'count[%d]' % n, [10, 20, 40], run=rebind_and_eval)
+    report('sum_to[n]', lambda n: 'sum_to[%d]' % n, [10, 20, 40], run=rebind_and_eval)
+
+    calc_eval('count_down[n] = 0 if n == 0 else count_down[n-k]')  # in tail position
+    report('count_down[n]', lambda n: 'count_down[%d]' % n, [1000, 2000, 4000],
+           run=rebind_and_eval)
+
+    def chain(n):
+        calc_eval('h[x] = k*x' + ''.join('+*-/'[i % 4] + str(i+1) for i in range(n)))
+        return 'h[2]'
+    report('h[x] = k*x+1*2-3...', chain, [100, 200, 400], run=rebind_and_eval)
+
+    calc_eval('deg[x] = 2*PI/360*x*k')  # the conversion factor is folded
+    report('deg[x] = 2*PI/360*x*k', lambda n: 'deg[%d]' % n, [1], run=rebind_and_eval)
+
+
+def bench_array():
+    "Item-wise operations on n floats, kept as a list or made an array by array[...]."
+    import format
+    from eval import calc_eval
+
+    for make in ('%s', 'array[%s]'):
+        def make_floats(n):
+            calc_eval('xs = ' + make % ('[i*0.5 for i in 1:%d]' % n))
+            return '(xs + 1) / (xs + 2)'
+        report('(xs + 1) / (xs + 2), xs = ' + make % '...', make_floats,
+               [10000, 100000], run=calc_eval)
+
+
+def bench_shape():
+    "The depth and shape of a list are measured once, then read from the list."
+    import format
+    from eval import calc_eval
+
+    def make_matrix(n):
+        calc_eval('m = [[i+j for j in 1:%d] for i in 1:%d]' % (n, n))
+        return 'depth[m] + shape[m][0]'
+    report('depth[m] + shape[m][0] of an n×n matrix', make_matrix, [100, 300], run=calc_eval)
+
+
+def bench_matmul():
+    "Products of n×n matrices of integers, multiplied exactly, and of floats, by numpy."
+    import format
+    from eval import calc_eval
+
+    def make_matrix(entry):
+        def make(n):
+            calc_eval('m = [[%s for j in 1:%d] for i in 1:%d]' % (entry, n + 1, n + 1))
+            return 'm . m'
+        return make
+    report('m . m, integers', make_matrix('i*j % 7'), [50, 100, 200], run=calc_eval)
+    report('m . m, floats', make_matrix('i/j*0.5'), [50, 100, 200], run=calc_eval)
+
+
+def bench_power():
+    "Powers of a 2×2 matrix by repeated squaring, and modulo 1000."
+    import format
+    from eval import calc_eval
+
+    calc_eval('fib = [[1,1],[1,0]]')
+    report('fib^n', lambda n: 'fib^%d' % n, [1000, 10000, 100000], run=calc_eval)
+    report('powmod[fib, n, 1000]', lambda n: 'powmod[fib, %d, 1000]' % n, [10**6, 10**12], run=calc_eval)
+
+
+def bench_det():
+    "Exact determinants of n×n integer matrices by fraction-free elimination."
+    from random import Random
+    from modules.gauss_jordan import det
+
+    rand = Random(0)
+    report('det of integers in -100..100', lambda n: [[rand.randint(-100, 100) for _ in range(n)]
+                                                      for _ in range(n)], [25, 50, 100], run=det)
+
+
+def bench_sparse():
+    "Building, squaring and solving the sparse Laplacian of a k×k grid, of n = k² rows."
+    from math import isqrt
+    import funcs
+    from objects import Sparse
+
+    def laplacian(n):
+        k = isqrt(n)
+        return Sparse([(p, p, 4.0) for p in range(n)] +
+                      [(p, p + 1, -1.0) for p in range(n - 1) if (p + 1) % k] +
+                      [(p + 1, p, -1.0) for p in range(n - 1) if (p + 1) % k] +
+                      [(p, p + k, -1.0) for p in range(n - k)] +
+                      [(p + k, p, -1.0) for p in range(n - k)], (n, n))
+    sizes = [50**2, 100**2, 200**2]
+    report('build', lambda n: n, sizes, run=laplacian)
+    report('a . a', laplacian, sizes, run=lambda a: a @ a)
+    report('spsolve[a, b]', laplacian, sizes, run=lambda a: a.solve((1.0,) * a.shape[0]))
+
+
+def bench_load():
+    "Parsing the lines of a script again should hit the parse-tree cache."
+    lines = [l.strip() for l in open('scripts/tests/tests.cal') if l.strip()]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'script.cal')
+        open(path, 'w').write('\n'.join(lines))
+
+        def load():
+            cache = ScriptCache(path)
+            for line in lines: cache.parse(line)
+            cache.save()
+
+        cold = timeit(lambda: [calc_parse(line) for line in lines])
+        load()
+        warm = timeit(load)
+    print('script of %d lines' % len(lines))
+    print('  parsed %8.4fs  cached %8.4fs' % (cold, warm))
+
+
+benchmarks = {name[6:]: f for name, f in list(globals().items())
+              if name.startswith('bench_')}
+
+
+if __name__ == "__main__":
+    config.debug = False
+    for name in sys.argv[1:] or benchmarks:
+        benchmarks[name]()
@@ -7,7 +7,7 @@ from objects import stack
 from eval import calc_eval, LOAD
 from format import calc_format
 from funcs import eq_ as equal
-from parse import BracketTracker
+from parse import BracketTracker, ScriptCache, calc_parse
 from utils.debug import log
 from utils.backslash import subst_escape
 
@@ -58,65 +58,70 @@ def run(filename=None, test=False, start=0, verbose=True):
 
     interactive = filename is None
     buffer, count, indent = [], 0, 0
-
-    for line in get_lines(filename):
-        try:
-            if line.find('#TEST') == 0 and not test:
-                return  # the lines after #TEST are run only in test mode
-
-            if verbose:  # make prompt
-                if buffer:  # last line not completed
-                    prompt = ' ' * indent
-                else:
-                    prompt = make_prompt()
-                print(prompt, end='', flush=True)
+    cache = None if interactive else ScriptCache(scripts_dir + filename)
+    parse = cache.parse if cache else calc_parse
+
+    try:
+        for line in get_lines(filename):
+            try:
+                if line.find('#TEST') == 0 and not test:
+                    return  # the lines after #TEST are run only in test mode
+
+                if verbose:  # make prompt
+                    if buffer:  # last line not completed
+                        prompt = ' ' * indent
+                    else:
+                        prompt = make_prompt()
+                    print(prompt, end='', flush=True)
                 
-            if interactive:  # get input
-                line = input()
-            elif verbose:  # print content in the loaded script
-                print(line, indent=0)
-
-            line, comment = split_comment(line)
-            if not line: continue
-
-            indent = BracketTracker.next_insertion(prompt + line)
-            if line[-3:] == '...':
-                line = line[:-3]
-                if not indent: indent = len(prompt)
-
-            buffer.append(line)
-            if indent: continue
-
-            line = subst_escape(''.join(buffer))
-            buffer, indent = [], 0
-
-            result = calc_eval(line)
-            if result is None: continue
-
-            if verbose:  # print output
-                prompt = make_prompt('out')
-                print(prompt, end='')
-                opts = {opt: comment == opt.upper()
-                        for opt in ['sci', 'tex', 'bin', 'hex']}
-                linesep = '\n' + ' ' * len(prompt)
-                output = calc_format(result, linesep=linesep, **opts)
-                print(output, flush=True)
-
-            if test and comment:
-                verify_answer(line, result, comment)
-
-            count += 1
-
-        except KeyboardInterrupt:
-            return
-        except Warning as w:
-            print(w)
-            if test and config.debug: raise Warning
-        except Exception as e:
-            if str(e): print('Error:', e)
-            else: print('Exiting due to an exception...')
-            if test or config.debug: raise
-            
+                if interactive:  # get input
+                    line = input()
+                elif verbose:  # print content in the loaded script
+                    print(line, indent=0)
+
+                line, comment = split_comment(line)
+                if not line: continue
+
+                indent = BracketTracker.next_insertion(prompt + line)
+                if line[-3:] == '...':
+                    line = line[:-3]
+                    if not indent: indent = len(prompt)
+
+                buffer.append(line)
+                if indent: continue
+
+                line = subst_escape(''.join(buffer))
+                buffer, indent = [], 0
+
+                result = calc_eval(line, parse=parse)
+                if result is None: continue
+
+                if verbose:  # print output
+                    prompt = make_prompt('out')
+                    print(prompt, end='')
+                    opts = {opt: comment == opt.upper()
+                            for opt in ['sci', 'tex', 'bin', 'hex']}
+                    linesep = '\n' + ' ' * len(prompt)
+                    output = calc_format(result, linesep=linesep, **opts)
+                    print(output, flush=True)
+
+                if test and comment:
+                    verify_answer(line, result, comment)
+
+                count += 1
+
+            except KeyboardInterrupt:
+                return
+            except Warning as w:
+                print(w)
+                if test and config.debug: raise Warning
+            except Exception as e:
+                if str(e): print('Error:', e)
+                else: print('Exiting due to an exception...')
+                if test or config.debug: raise
+    finally:
+        if cache: cache.save()
+
     if test:
         print('\nCongratulations, tests all passed in "%s"!\n' % filename)
 
@@ -131,8 +136,8 @@ if __name__ == "__main__":
     config.debug = debug
     if debug:
         sys.argv.remove('-d')
-        from src.grammar import grammar
-        parse.grammar = grammar  # reload grammar only when debugging
+        from src.grammar import grammar  # rebuild the parser only when debugging
+        parse.load_parser()
         
     if test: sys.argv.remove('-t')
             
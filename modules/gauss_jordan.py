@@ -1,5 +1,8 @@
 from modules.matrix import *
-from functools import reduce
+from numbers import Number, Rational
+from operator import floordiv
+from sympy import cancel
+import numpy as np
 
 
 # row operations
@@ -9,65 +12,127 @@ def swap_rows(rows, i, j, display=None):
         print('\\overset{E_{%d, %d}}{\\longrightarrow}'%(i+1, j+1))
         print_latex_code(rows)
 
-def scale_row(rows, k, s, display=None):
-    rows[k] = [s*e for e in rows[k]]
+def show_step(rows, r, c, display=None):
     if display:
-        print('\\overset{E_{\\left(%s\\right)%d}}{\\longrightarrow}'%(str(s), k+1))
+        print('\\overset{(%d, %d)}{\\longrightarrow}'%(r+1, c+1))
         print_latex_code(rows)
 
-def scale_and_add(rows, src, scale, dest, display=None):
-    rows[dest] = [scale*oe+de for oe, de in zip(rows[src], rows[dest])]
-    if display:
-        print('\\overset{E_{\\left(%s\\right)%d,%d}}{\\longrightarrow}'%(str(scale), src+1, dest+1))
-        print_latex_code(rows)
 
-
-def eliminate(mat, back=1, display=0):
-    # return the row operation matrix
+def bareiss(rows, c_num, back=True, display=None):
+    """Fraction-free elimination of the list of rows in place, pivoting in
+    their first c_num columns.
+
+    At the step on a pivot p, every other row below it (or every other row if
+    back) becomes (p * row - a * pivot row) / q, where a is its entry in the
+    pivot column and q the previous pivot. The division is exact, so the
+    entries of an integer matrix stay integers, and every pivot of the
+    rows reduced up to it is a minor of the matrix: the last one is its
+    determinant up to the sign of the row swaps.
+    Return the pivots and that sign."""
+    if all(type(e) is int for row in rows for e in row):
+        div = floordiv
+    elif all(isinstance(e, Rational) for row in rows for e in row):
+        div = Fraction
+    else:
+        div = lambda x, y: cancel(x / y)  # a polynomial division for the symbols
+    r_num = len(rows)
+    q, sign, r, pivots = 1, 1, 0, []
+    for c in range(c_num):
+        if r == r_num: break
+        i = next((i for i in range(r, r_num) if rows[i][c] != 0), None)
+        if i is None: continue
+        if i != r:
+            swap_rows(rows, r, i, display)
+            sign = -sign
+        pivot_row = rows[r]
+        p = pivot_row[c]
+        for i in range(0 if back else r+1, r_num):
+            if i == r: continue
+            row = rows[i]
+            a = row[c]
+            start = 0 if i < r else c  # the entries of a row below the pivot left of c are zeros
+            row[start:] = [div(p*x - a*y, q) for x, y in zip(row[start:], pivot_row[start:])]
+        pivots.append(p)
+        show_step(rows, r, c, display)
+        q, r = p, r+1
+    return pivots, sign
+
+
+def reduce_float(rows, c_num, back=True, display=None, partial=True):
+    """Gaussian elimination of the numpy array of rows in place, pivoting in
+    their first c_num columns on the entries of the greatest magnitude if
+    partial, or else on the first nonzero ones like bareiss.
+    An entry within the rounding error of the largest one in its column is
+    taken as zero. Return the pivots and the sign of the row swaps."""
+    r_num = len(rows)
+    tol = 1e-12 * np.abs(rows[:, :c_num]).max(axis=0, initial=0)
+    sign, r, pivots = 1, 0, []
+    for c in range(c_num):
+        if r == r_num: break
+        nonzero = np.abs(rows[r:, c]) > tol[c]
+        if not nonzero.any():
+            rows[r:, c] = 0
+            continue
+        i = r + (np.abs(rows[r:, c]).argmax() if partial else nonzero.argmax())
+        if i != r:
+            rows[[r, i]] = rows[[i, r]]
+            sign = -sign
+        p = rows[r, c]
+        pivots.append(p)
+        if back:
+            rows[r] /= p
+            others = np.arange(r_num) != r
+        else:
+            others = np.arange(r_num) > r
+        rows[others] -= np.outer(rows[others, c] / rows[r, c], rows[r])
+        rows[others, c] = 0
+        show_step(rows.tolist(), r, c, display)
+        r += 1
+    return pivots, sign
+
+
+def is_inexact(mat):
+    return (all(isinstance(e, Number) for row in mat for e in row) and
+            not all(isinstance(e, Rational) for row in mat for e in row))
+
+def exact_div(x, y):
+    if isinstance(x, Rational) and isinstance(y, Rational):
+        q = Fraction(x, y)
+        return q.numerator if q.denominator == 1 else q
+    return cancel(x / y)
+
+
+def echelon(mat, c_num, back=True, display=None, partial=True):
+    """The echelon form of the matrix (reduced if back) by row operations
+    pivoting in its first c_num columns, as a list of lists."""
+    if is_inexact(mat):
+        rows = np.array(mat, dtype=complex if any(
+            type(e) is complex for row in mat for e in row) else float)
+        reduce_float(rows, c_num, back, display, partial)
+        return rows.tolist()
+    rows = [list(row) for row in mat]
+    pivots, _ = bareiss(rows, c_num, back, display)
+    # bring the rows to the scale of Gaussian elimination: after Bareiss, the rows
+    # all have the last pivot as the scale if back, or else the pivot before theirs
+    for r in range(len(rows)):
+        k = len(pivots) if back else min(r, len(pivots))
+        q = pivots[k-1] if k else 1
+        if q != 1:
+            rows[r] = [exact_div(e, q) for e in rows[r]]
+    return rows
+
+
+def eliminate(mat, back=1, display=0, partial=True):
+    # return the row operation matrix E and the echelon form E mat
 
     check_matrix(mat)
 
     if display:
         print_latex_code(mat)
 
-    def all_zero(vect):
-        return all(x == 0 for x in vect)
-    def pivot_col_pos(rows):
-        c_num = cols_num(rows)
-        for i in range(c_num):
-            if not all_zero(col(rows, i)):
-                return i
-
     r_num = rows_num(mat)
     c_num = cols_num(mat)
-    A = augment(mat, idmat(r_num))
-
-    for r in range(r_num):
-        pivcol = pivot_col_pos(A[r:])
-        if pivcol is None: break
-        pivrow, pivot = 0, 0
-        for i in range(r, r_num):
-            entry = A[i][pivcol]
-            if entry != 0:
-                pivrow, pivot = i, entry
-                break
-        if pivrow != r:
-            swap_rows(A, r, pivrow, display)
-        if back and pivot != 1:
-            scale_row(A, r, Fraction(1, pivot), display)
-        for i in range(r+1, r_num):
-            entry = A[i][pivcol]
-            if entry == 0: continue
-            scale_and_add(A, r, Fraction(-entry, A[r][pivcol]), i, display)
-    # back substitution
-    if back:
-        for r in range(r_num-1, 0, -1):
-            c = pivot_col_pos(A[r:])
-            if not c: continue
-            for i in range(r):
-                entry = A[i][c]
-                if entry != 0:
-                    scale_and_add(A, r, -entry, i, display)
+    A = echelon(augment(mat, idmat(r_num)), c_num, back, display, partial)
 
     Ref, E = slice(A, 0, c_num), slice(A, c_num)
     return [E, Ref]
@@ -82,15 +147,22 @@ def inverse(m):
 
 
 def LU(m):
-    E, U = eliminate(m, False)
+    # without partial pivoting, so that L is lower triangular unless a zero pivot needs a swap
+    E, U = eliminate(m, False, partial=False)
     return [inverse(E), U]
 
 
 def det(m):
     assert(issquare(m))
-    _, rref = eliminate(m, False)
-    return reduce(lambda x, y: x*y, [rref[i][i] for i in range(len(rref))])
+    n = len(m)
+    if is_inexact(m):
+        rows = np.array(m, dtype=complex if any(
+            type(e) is complex for row in m for e in row) else float)
+        pivots, sign = reduce_float(rows, n, False)
+        return sign * np.prod(pivots).item() if len(pivots) == n else 0
+    pivots, sign = bareiss([list(row) for row in m], n, False)
+    return sign * pivots[-1] if len(pivots) == n else 0
 
 
 export = {'eliminate': eliminate, 'inverse': inverse, 'LU': LU, 'det': det,
-          'idmat': idmat, 'scalem': scalem, 'addm': addm}
\ No newline at end of file
+          'idmat': idmat, 'scalem': scalem, 'addm': addm}
@@ -1,9 +1,11 @@
 from functools import reduce
+from itertools import product
 from numbers import Number, Rational
 from fractions import Fraction
 from math import inf
 from operator import (floordiv, mod, neg, lt, gt, le, ge, xor, inv)
-from numpy import (array, where)
+import numpy as np
+from numpy import where
 from sympy import (
     sqrt, log, exp, gcd, factorial, floor, E, pi, factorint,
     sin, cos, tan, asin, acos, atan, cosh, sinh, tanh, nan,
@@ -11,11 +13,12 @@ from sympy import (
 )
 
 import config
-from objects import Op, Env, Range, Builtin, Enum
+from objects import Op, Env, Range, Builtin, Enum, Lazy, Array, whole, elementwise, on_range
 from funcs import (
     is_iter, is_function, is_matrix, is_number, is_vector, is_symbol, is_list, is_env,
     add_, sub_, mul_, div_, pow_, and_, or_, not_, eq_, ne_, adjoin, unpack, dot, all_, any_,
-    first, findall, range_, compose, apply, transpose, depth, shape, substitute, flatten
+    first, findall, range_, compose, apply, transpose, depth, shape, substitute, flatten,
+    powmod, prod, sparse
 )
 
 
@@ -45,9 +48,87 @@ for op_type, op_dict in operators.items():
 
 binary_ops['(app)'].nested = False
 
+kinds = ['scalar', 'list', 'matrix', 'array', 'sparse', 'function', 'env', 'symbol', 'other']
+seqs = ['list', 'matrix']
+vecs = [*seqs, 'array']
 
-builtins = {'sin': sin, 'cos': cos, 'tan': tan, 'asin': asin, 'acos': acos, 'atan': atan, 'abs': abs, 'sqrt': sqrt, 'floor': floor, 'log': log, 'E': E, 'PI': pi, 'I': 1j, 'INF': inf, 'max': max, 'min': min, 'gcd': gcd, 'binom': lambda n, m: factorial(n) / (factorial(m) * factorial(n-m)), 'len': len, 'sort': sorted, 'exp': exp, 'lg': lambda x: log(x)/log(10), 'ln': log, 'log2': lambda x: log(x)/log(2), 'number?': is_number, 'symbol?': is_symbol, 'iter?': is_iter, 'map?': is_function, 'matrix?': is_matrix, 'vector?': is_vector, 'list?': is_list, 'list': tuple, 'sum': lambda *x: reduce(add_, x), 'prod': lambda *x: reduce(dot, x), 'compose': compose, 'matrix': Matrix, 'car': lambda l: l[0], 'cdr': lambda l: l[1:], 'cons': lambda a, l: (a,) + l, 'enum': Enum, 'shape': shape, 'depth': depth, 'transp': transpose, 'flatten': flatten, 'all': all_, 'any': any_, 'same': lambda l: True if l == [] else all(x == l[0] for x in l[1:]), 'sinh': sinh, 'cosh': cosh, 'tanh': tanh, 'degrees': lambda x: x / pi * 180, 'real': lambda z: z.real if type(z) is complex else z, 'imag': lambda z: z.imag if type(z) is complex else 0, 'conj': lambda z: z.conjugate(), 'angle': lambda z: atan(z.imag / z.real), 'reduce': reduce, 'filter': filter, 'map': map, 'zip': zip, 'find': findall, 'solve': solve, 'lim': limit, 'diff': diff, 'int': integrate, 'subs': substitute, 'expand': expand, 'factor': factor, 'pfactors': factorint, 'next': next, 'array': array, 'where': where}
+# the kinds of operands on which an operator applies as a whole instead of on their items
+whole_kinds = {
+    'BOP': {
+        '*': [*product(['scalar'], seqs), *product(seqs, ['scalar'])],  # repeated by an integer
+        '.': [*product(vecs, vecs), *product(['function'], seqs),
+              *product(['sparse'], vecs), *product(vecs, ['sparse'])],
+        '^': [('matrix', 'scalar')],  # a power of the matrix
+        '&': [*product(seqs, seqs)],
+        '<': [*zip(seqs, seqs)], '>': [*zip(seqs, seqs)],
+        '<=': [*zip(seqs, seqs)], '>=': [*zip(seqs, seqs)],
+        '|': [*product(vecs, vecs), *product(kinds, ['list', 'array']),
+              *product(['list', 'array'], kinds)],
+        ':': [('range', 'scalar')],  # a range with its step
+        **{op: [*product([*kinds, 'range'], [*kinds, 'range'])]
+           for op in ['==', '/=', 'and', 'or', 'in', '(adj)']}
+    },
+    'LOP': {'not': [(k,) for k in seqs]},
+    'ROP': {'..': [(k,) for k in seqs]}
+}
+
+for op_type, op_dict in operators.items():
+    for op, kinds_list in whole_kinds[op_type].items():
+        op_dict[op].paths.update(dict.fromkeys(kinds_list, whole))
+
+# a range shifted or scaled by a number is still a range
+range_kinds = {
+    '+': [('range', 'scalar'), ('scalar', 'range'), ('range', 'range')],
+    '-': [('range', 'scalar'), ('scalar', 'range'), ('range', 'range')],
+    '*': [('range', 'scalar'), ('scalar', 'range')], '/': [('range', 'scalar')]
+}
+for op, kinds_list in range_kinds.items():
+    binary_ops[op].paths.update(dict.fromkeys(kinds_list, on_range))
+unary_l_ops['-'].paths[('range',)] = on_range
+
+# an array with an array or a list of the same length applies by numpy on their items
+for op in ['+', '-', '*', '/', '//', '%', '^', '<', '>', '<=', '>=']:
+    binary_ops[op].paths.update(dict.fromkeys(
+        [('array', 'array'), ('array', 'list'), ('list', 'array')], elementwise))
+
+
+def items(args):
+    "The items reduced by sum or prod: the args, or the items of the single lazy list passed."
+    return iter(args[0] if len(args) == 1 and type(args[0]) is Lazy else args)
+
+def sum_(*args):
+    "The sum of the items in $args, added by the operator + so that lists add item-wise; 0 if there is none."
+    xs = items(args)
+    return reduce(binary_ops['+'], xs, next(xs, 0))
+
+
+def with_array(f, array_f):
+    "Apply $array_f of numpy on an array or a range passed alone, and $f on other args."
+    def g(*args):
+        if len(args) == 1 and type(args[0]) in (Array, Range):
+            x = Array(list(args[0])) if type(args[0]) is Range else args[0]
+            try:
+                result = array_f(x)
+            except TypeError:  # the exact numbers, which numpy holds as objects
+                result = array_f(x.astype(float))
+            return result.item() if np.ndim(result) == 0 else result
+        return f(*args)
+    g.__name__, g.__doc__ = f.__name__, f.__doc__
+    return g
+
+array_funcs = {
+    'sin': np.sin, 'cos': np.cos, 'tan': np.tan, 'asin': np.arcsin, 'acos': np.arccos,
+    'atan': np.arctan, 'sinh': np.sinh, 'cosh': np.cosh, 'tanh': np.tanh, 'abs': np.abs,
+    'sqrt': np.sqrt, 'floor': np.floor, 'exp': np.exp, 'log': np.log, 'ln': np.log,
+    'lg': np.log10, 'log2': np.log2, 'max': np.max, 'min': np.min, 'sum': np.sum,
+    'prod': np.prod, 'real': np.real, 'imag': np.imag, 'conj': np.conj
+}
+
+
+builtins = {'sin': sin, 'cos': cos, 'tan': tan, 'asin': asin, 'acos': acos, 'atan': atan, 'abs': abs, 'sqrt': sqrt, 'floor': floor, 'log': log, 'E': E, 'PI': pi, 'I': 1j, 'INF': inf, 'max': max, 'min': min, 'gcd': gcd, 'binom': lambda n, m: factorial(n) / (factorial(m) * factorial(n-m)), 'len': len, 'sort': sorted, 'exp': exp, 'lg': lambda x: log(x)/log(10), 'ln': log, 'log2': lambda x: log(x)/log(2), 'number?': is_number, 'symbol?': is_symbol, 'iter?': is_iter, 'map?': is_function, 'matrix?': is_matrix, 'vector?': is_vector, 'list?': is_list, 'list': tuple, 'sum': sum_, 'prod': lambda *x: prod(items(x)), 'powmod': powmod, 'compose': compose, 'matrix': Matrix, 'car': lambda l: l[0], 'cdr': lambda l: l[1:], 'cons': lambda a, l: (a,) + l, 'enum': Enum, 'shape': shape, 'depth': depth, 'transp': transpose, 'flatten': flatten, 'all': all_, 'any': any_, 'same': lambda l: True if l == [] else all(x == l[0] for x in l[1:]), 'sinh': sinh, 'cosh': cosh, 'tanh': tanh, 'degrees': lambda x: x / pi * 180, 'real': lambda z: z.real if type(z) is complex else z, 'imag': lambda z: z.imag if type(z) is complex else 0, 'conj': lambda z: z.conjugate(), 'angle': lambda z: atan(z.imag / z.real), 'reduce': reduce, 'filter': filter, 'map': map, 'zip': zip, 'find': findall, 'solve': solve, 'lim': limit, 'diff': diff, 'int': integrate, 'subs': substitute, 'expand': expand, 'factor': factor, 'pfactors': factorint, 'next': next, 'array': Array, 'where': where, 'sparse': sparse, 'dense': lambda s: s.dense(), 'spsolve': lambda a, b: a.solve(b)}
 
 for name, val in builtins.items():
+    if name in array_funcs:
+        val = with_array(val, array_funcs[name])
     if callable(val):
         builtins[name] = Builtin(val, name)
\ No newline at end of file
@@ -0,0 +1,210 @@
+"""Compile syntax trees into nested python closures.
+
+The body of a Map is compiled once at its first call (if config.compile is on)
+into a function of the env, so that its calls skip the dispatch of eval_tree
+at every node and look up its parameters by their slots in the Frame.
+A tree without a specialized compiler is compiled into a call of its
+evaluation rule, so the compiled tree evaluates the same as eval_tree.
+An application of a Map in tail position of the body returns a TailCall,
+which the calling Map makes in a loop instead of a nested python call."""
+
+from node import Node, opcode, tree_tag
+from builtin import operators
+from objects import Map, Op, Lazy, TailCall, List, UnboundName
+from funcs import convert
+from eval import eval_tree, subs_rules, eval_rules, dont_eval, special_names, \
+    match, split_constraint, par_names, var_names, SEQ as eval_seq, \
+    is_logic, split_logic, eval_logic
+
+
+compilers = {}  # opcode -> compiler
+
+def compiler(f):
+    "Register $f as the compiler of the trees tagged by its name."
+    compilers[opcode(f.__name__)] = f
+    return f
+
+
+def compile_tree(tree, scope=None, tail=False):
+    """Compile $tree into a function which evaluates it in the env passed in.
+
+    $scope lists the names bound in the env and its parents, innermost first:
+    a dict from each name to its slot if the env is a Frame, or to None if
+    the env is a plain Env. The names in a Frame are looked up by their slots.
+    A scope of None means that the env is only known at run time.
+    $tail tells if the value of $tree is the result of the Map being compiled."""
+    if type(tree) is not Node:
+        return lambda env: tree
+    elif tree.op in tail_compilers:
+        return tail_compilers[tree.op](tree, scope, tail)
+    elif tree.op in compilers:
+        return compilers[tree.op](tree, scope)
+    else:
+        return compile_rule(tree, scope)
+
+Map.compile = lambda body, scope: compile_tree(body, scope, tail=True)
+
+tail_compilers = {}  # opcode -> compiler passing the tail position to the subtrees
+
+def tail_compiler(f):
+    "Register $f as the compiler of the trees tagged by its name, which may be in tail position."
+    tail_compilers[opcode(f.__name__)] = f
+    return f
+
+
+def address(name, scope):
+    "The (depth, slot) of $name in the Frames of $scope, or None if it is unknown."
+    for depth, names in enumerate(scope or ()):
+        if names is None:  # the names in this env are unknown
+            return None
+        if name in names:
+            slot = names[name]
+            return None if slot is None else (depth, slot)
+    return None
+
+
+def compile_rule(tree, scope):
+    "Compile $tree into a call of its evaluation rule."
+    op = tree.op
+    if op in dont_eval:
+        return lambda env: eval_tree(tree, env)
+    items = [compile_tree(t, scope) for t in tree.args]
+    if op in subs_rules:
+        rule = subs_rules[op]
+        return lambda env: rule([f(env) for f in items])
+    elif op in eval_rules:
+        rule = eval_rules[op]
+        return lambda env: rule([f(env) for f in items], env)
+    else:
+        return lambda env: Node(op, [f(env) for f in items])
+
+
+def compile_literal(tree, scope):
+    "The args of a literal are terminals, so its value is computed only once."
+    val = eval_tree(tree)
+    return lambda env: val
+
+for tag in ['REAL', 'BIN', 'HEX', 'ATTR', *operators]:
+    compilers[opcode(tag)] = compile_literal
+
+
+@compiler
+def NAME(tree, scope):
+    name = tree.args[0]
+    if name in special_names:
+        return compile_rule(tree, scope)
+
+    addr = address(name, scope)
+    if addr:
+        depth, slot = addr
+        if depth == 0:
+            return lambda env: env.slots[slot]
+        elif depth == 1:
+            return lambda env: env.parent.slots[slot]
+        def load(env):
+            for _ in range(depth): env = env.parent
+            return env.slots[slot]
+        return load
+
+    rule = eval_rules[tree.op]
+    def lookup(env):
+        try: return env[name]
+        except KeyError:  # make a symbol or raise UnboundName
+            return rule(tree.args, env)
+    return lookup
+
+@tail_compiler
+def IF_ELSE(tree, scope, tail):
+    t_case, pred, f_case = tree.args
+    t_case, f_case = (compile_tree(t, scope, tail) for t in (t_case, f_case))
+    pred = compile_tree(pred, scope)
+    return lambda env: t_case(env) if pred(env) else f_case(env)
+
+@tail_compiler
+def BODY(tree, scope, tail):
+    if not (tail and tree_tag(tree.args[0]) == 'PRINT'):
+        return compile_rule(tree, scope)
+    show, body = compile_tree(tree.args[0], scope), compile_tree(tree.args[1], scope, tail)
+    def print_first(env):
+        show(env)
+        return body(env)
+    return print_first
+
+@tail_compiler
+def CLOSURE(tree, scope, tail):
+    get_local = compile_tree(tree.args[0], scope)
+    body = compile_tree(tree.args[1], None, tail)  # evaluated in the env of get_local
+    def closure(env):
+        local = get_local(env)
+        try:
+            return body(local)
+        except UnboundName:  # should only happen when @ is used
+            return body(env)
+    return closure
+
+@tail_compiler
+def SEQ(tree, scope, tail):
+    args = tree.args
+    if any(map(is_logic, args)):
+        groups = [[compile_tree(items[0] if len(items) == 1 else Node(tree.op, items), scope)
+                   for items in group] for group in split_logic(args)]
+        return lambda env: eval_logic(groups, lambda i, j: groups[i][j](env))
+    if not tail or len(args) != 2 or any(isinstance(x, Op) or type(x) is Node and
+                                         x.op in operator_ops for x in args):
+        return compile_rule(tree, scope)
+    # an application f[x] in tail position
+    func, arg = (compile_tree(x, scope) for x in args)
+    def tail_call(env):
+        f, x = func(env), arg(env)
+        if type(f) is Map and type(x) is not Node and not isinstance(x, Op):
+            return TailCall(f, convert(x))
+        return eval_seq([f, x])
+    return tail_call
+
+operator_ops = {opcode(tag) for tag in operators}
+
+def compile_generator(tree, scope):
+    "Compile the comprehension $tree into a function making the generator of its items."
+    exp, *constraints = tree.args
+    constraints = list(map(split_constraint, constraints))
+    # the names bound in the local env of the comprehension
+    names = {}
+    for form, _, binds, _ in constraints:
+        form_names = par_names(form)
+        if form_names is None:
+            names = None
+            break
+        names.update(dict.fromkeys(form_names))
+        for bind in binds:
+            names.update(dict.fromkeys(var_names(bind.args[0])))
+    scope = [names, *(scope or [None])]
+
+    exp = compile_tree(exp, scope)
+    constrs = [(form, compile_tree(ran, scope), [compile_tree(b, scope) for b in binds],
+                cond and compile_tree(cond, scope))
+               for form, ran, binds, cond in constraints]
+
+    def generator(env):
+        def generate(i):
+            if i == len(constrs):
+                yield exp(local)
+                return
+            form, ran, binds, cond = constrs[i]
+            for val in ran(local):
+                match(form, val, local)
+                for bind in binds: bind(local)
+                if not cond or cond(local):
+                    yield from generate(i + 1)
+        local = env.child()
+        return generate(0)
+    return generator
+
+@compiler
+def GEN_LST(tree, scope):
+    generator = compile_generator(tree, scope)
+    return lambda env: List(generator(env))
+
+@compiler
+def LAZY_LST(tree, scope):
+    generator = compile_generator(tree, scope)
+    return lambda env: Lazy(lambda: generator(env))
@@ -2,4 +2,8 @@ tolerance = 1e-12
 precision = 6
 latex = False
 symbolic = 0
+compile = True  # compile the bodies of Maps into python closures
+memo_size = 10000  # the max number of results memoized by each Map; 0 for no limit
+memo_policy = 'lru'  # which result to evict from a full memo: 'lru' or 'fifo'
+simplify = 'always'  # when to simplify symbolic results: 'always', 'on-output' or 'never'
 debug = 1
\ No newline at end of file
@@ -1,11 +1,13 @@
 from functools import wraps
-from copy import deepcopy
+from numbers import Number
+from math import inf
 import re
 
-from parse import calc_parse, is_name, is_tree, tree_tag
+from node import Node, opcode, tags, is_tree, tree_tag
+from parse import calc_parse, is_name
 from builtin import operators, builtins
-from funcs import Symbol, is_list, is_function
-from objects import Env, stack, Op, Attr, Function, Map, UnboundName, OperationError
+from funcs import Symbol, Expr, is_list, is_function, standardize, convert, simplify_all
+from objects import Env, stack, Op, Attr, Function, Builtin, Map, Memo, Lazy, Range, Array, List, UnboundName, OperationError
 from utils import debug
 import config
 
@@ -19,13 +21,13 @@ Builtins = Env(name='_builtins_', binds=builtins)
 Global = GlobalEnv()
 
 
-def calc_eval(exp, env=None):
+def calc_eval(exp, env=None, parse=calc_parse):
     # suppress output (and recording) if the last character is ';'
     suppress = exp[-1] == ';'
     if suppress: exp = exp[:-1]
     
     # parse the expression into a syntax tree
-    tree, rest = calc_parse(exp)
+    tree, rest = parse(exp)
     if rest: raise SyntaxError(f'syntax error in "{rest}"')
     
     if env is None: env = Global 
@@ -40,42 +42,45 @@ def calc_eval(exp, env=None):
             NAME.force_symbol = False
         else: raise
     
+    if config.simplify == 'on-output':
+        result = simplify_all(result)
+    
     if result is not None and not suppress:
         # record and return the result
         Global._ans.append(result)
         return result
 
 
-# substitution rules
+# substitution rules: they are applied on the evaluated $args of the node
 
-def EMPTY(tr): return None
+def EMPTY(args): return None
 
-def LINE(tr): return tr[-1]
+def LINE(args): return args[-1]
 
 def op_getter(op_type):
     ops = operators[op_type]
-    def get(tr): return ops[tr[1]]
+    def get(args): return ops[args[0]]
     return get
 
 OPERATORS = {op_type: op_getter(op_type)
              for op_type, op_dict in operators.items()}
 
-def COMPLEX(tr):
-    re, pm, im = tr[1:]
+def COMPLEX(args):
+    re, pm, im = args
     return re + im*1j if pm == '+' else re - im*1j
 
-def REAL(tr):
-    if len(tr) > 2: return eval(tr[1]+'e'+tr[2])
-    else: return eval(tr[1])
+def REAL(args):
+    if len(args) > 1: return eval(args[0]+'e'+args[1])
+    else: return eval(args[0])
 
-def BIN(tr): return eval(tr[1])
+def BIN(args): return eval(args[0])
 
-def HEX(tr): return eval(tr[1])
+def HEX(args): return eval(args[0])
 
-def ATTR(tr): return Attr(tr[1])
+def ATTR(args): return Attr(args[0])
 
-def ANS(tr):
-    s = tr[1]
+def ANS(args):
+    s = args[0]
     if all(c == '%' for c in s):
         id = -len(s)
     else:
@@ -83,40 +88,155 @@ def ANS(tr):
         except: raise SyntaxError('invalid history index!')
     return Global._ans[id]
 
-def DIR(tr):
-    if len(tr) == 1:
+def DIR(args):
+    if not args:
         field = Global
     else:
-        field = tr[1]
+        field = args[0]
         print(f"(dir): {field.dir()}")
     for name, val in field.items():
         print(f"{name}: {debug.log.format(val)}")
         
-def INFO(tr):
-    print(tr[1].__doc__)
+def INFO(args):
+    obj = args[0]
+    print(obj.__doc__)
+    f = getattr(obj, 'val', obj)  # a Map with a docstring is kept in an Env
+    if isinstance(f, Map):
+        names = 'unknown' if f.free_names is None else ', '.join(sorted(f.free_names))
+        print(f'free names: {names or "none"}')
+        if f.effects:
+            print('effects: ' + ', '.join(sorted(f.effects)))
+        print('memoized' if f.pure() else 'not memoized')
+
+def MEMO(args):
+    "Show how the memos of the Maps in Global (or the Map in $args) are used."
+    if args:
+        maps = {repr(args[0]): args[0]}
+    else:
+        maps = {name: val for name, val in Global.items() if isinstance(val, Map)}
+    for name, f in maps.items():
+        if not isinstance(f, Map):
+            raise TypeError(f'{name} is not a Map')
+        if isinstance(f._memo, Memo):
+            print(f'{name}: {f._memo!r}')
+        else:
+            print(f'{name}: not memoized')
         
 
 def hold_tree(f):
     "A decorator that makes a substitution rule to hold the tree form."
+    op = opcode(f.__name__)
     @wraps(f)
-    def _f(tr):
-        if any(is_tree(t) for t in tr):
-            return tr
+    def _f(args):
+        if any(type(t) is Node for t in args):
+            return Node(op, args)
         else:
-            return f(tr)
+            return f(args)
     return _f
 
+BOP = operators['BOP']
+adjoin, apply, dot = BOP['(adj)'], BOP['(app)'], BOP['.']
+
 @hold_tree
-def SEQ(tr):
-    # stk = stack()
+def SEQ(args):
+    items = seq_items(args)
+    try:
+        plan = seq_plans[items]
+    except KeyError:
+        if len(seq_plans) > 1000: seq_plans.clear()
+        plan = seq_plans[items] = seq_plan(items)
+    try:
+        return run_plan(plan, args)
+    except AdjoinMismatch:  # the adjoin of a reduced operand was not predicted
+        return reduce_seq(args)
+
+seq_plans = {}  # seq_items -> plan
+
+def seq_items(args):
+    """The Ops in the SEQ $args, with each value replaced by how it joins the
+    item before it: None (after an Op), '(app)', '(adj)' or '.' (when adjoin fails).
+    >>> seq_items([2, BOP['+'], 3, Attr('real')])
+    (None, BOP(+, 6), None, '(adj)')
+    """
+    items, prev = [], None
+    for x in args:
+        if isinstance(x, Op):
+            items.append(x)
+        elif prev is None or isinstance(prev, Op):
+            items.append(None)
+        elif is_function(prev):
+            items.append('(app)')
+        else:
+            items.append('(adj)' if adjoins(prev, x) else '.')
+        prev = x
+    return tuple(items)
+
+def adjoins(x1, x2):
+    "Whether adjoin applies on $x1 and $x2 rather than failing."
+    def is_seq(x):
+        if isinstance(x, Env): x = getattr(x, 'val', None)
+        return isinstance(x, (tuple, list))
+    return isinstance(x2, Attr) or (is_seq(x1) or isinstance(x1, (Range, Array))) and is_seq(x2)
+
+PUSH, UNARY, BINARY, ADJOIN, DOT = range(5)  # steps of a plan
+junctions = {'(app)': (apply, BINARY), '(adj)': (adjoin, ADJOIN), '.': (dot, DOT)}
+
+def seq_plan(items):
+    """Resolve the precedence of the operations in $items by the shunting-yard
+    algorithm and return the postfix order of the steps to evaluate them.
+    >>> seq_plan(seq_items([2, BOP['+'], 3, BOP['*'], 4]))
+    [(0, 0), (0, 2), (0, 4), (2, BOP(*, 8)), (2, BOP(+, 6))]
+    """
+    plan, ops = [], stack()
+
+    def push(op, step):
+        while ops and op.priority <= ops.peek()[0].priority:
+            op_, step_ = ops.pop()
+            plan.append((step_, op_))
+        ops.push((op, step))
+
+    for i, item in enumerate(items):
+        if isinstance(item, Op):
+            push(item, BINARY if item.type == 'BOP' else UNARY)
+        else:
+            if item == '(app)':
+                ops.push(junctions[item])  # application binds tightest
+            elif item:
+                push(*junctions[item])
+            plan.append((PUSH, i))
+    while ops:
+        op, step = ops.pop()
+        plan.append((step, op))
+    return plan
+
+class AdjoinMismatch(Exception):
+    "The adjoin of two values in a SEQ differs from the one in its plan."
+
+def run_plan(plan, args):
+    vals = []
+    for step, x in plan:
+        if step is PUSH:
+            vals.append(args[x])
+        elif step is UNARY:
+            vals.append(apply(x, (vals.pop(),)))
+        else:
+            operands = vals.pop(-2), vals.pop()
+            if step is ADJOIN:
+                try: vals.append(apply(x, operands))
+                except OperationError: raise AdjoinMismatch
+            elif step is DOT and adjoins(*operands):
+                raise AdjoinMismatch
+            else:
+                vals.append(apply(x, operands))
+    val = vals.pop()
+    assert not vals, 'sequence evaluation failed'
+    return val
+
+def reduce_seq(args):
+    "Evaluate the SEQ $args by the shunting-yard algorithm (without a plan)."
     ops = stack()
     vals = stack()
     
-    BOP = operators['BOP']
-    adjoin = BOP['(adj)']
-    apply = BOP['(app)']
-    dot = BOP['.']
-    
     def reduce():
         op = ops.pop()
         if op.type == 'BOP':
@@ -155,44 +275,98 @@ def SEQ(tr):
         push.prev = x
 
     push.prev = None
-    for x in tr[1:]: push(x)
+    for x in args: push(x)
     while ops: reduce()
     val = vals.pop()
     assert not vals, 'sequence evaluation failed'
     return val
 
+AND, OR = BOP['and'], BOP['or']
+and_node, or_node = Node('BOP', ['and']), Node('BOP', ['or'])
+
+def is_logic(x):
+    "Whether $x is the 'and' or 'or' operator (as a tree or an Op) in a SEQ."
+    return x is AND or x is OR or type(x) is Node and (x == and_node or x == or_node)
+
+def split_logic(args):
+    """Split the items of a SEQ by 'or' and then by 'and'. Since they have the
+    lowest priorities, each part is an operand evaluated by itself.
+    >>> split_logic([1, BOP['<'], 2, AND, 0, OR, 3])
+    [[[1, BOP(<, 0), 2], [0]], [[3]]]
+    """
+    groups, items = [[]], []
+    for x in args:
+        if is_logic(x):
+            groups[-1].append(items)
+            items = []
+            if x is OR or x == or_node:
+                groups.append([])
+        else:
+            items.append(x)
+    groups[-1].append(items)
+    return groups
+
+def eval_logic(groups, evaluate):
+    """Evaluate the 'or' of the 'and' of the operands in $groups, where
+    $evaluate(i, j) gives the value of the operand j in the group i.
+    An operand is not evaluated if the operands before it decide the result.
+    """
+    vals = {}
+    def value(i, j):
+        if (i, j) not in vals:
+            vals[i, j] = evaluate(i, j)
+        return vals[i, j]
+
+    try:
+        for i, group in enumerate(groups):
+            for j in range(len(group)):
+                val = value(i, j)
+                if type(val) is Node: raise TypeError  # it is held
+                if not val: break
+            if val: break
+        return standardize(convert(val))
+    except (TypeError, ValueError):  # the truth of the value is unknown
+        args = []
+        for i, group in enumerate(groups):
+            if i: args.append(OR)
+            for j in range(len(group)):
+                if j: args.append(AND)
+                args.append(value(i, j))
+        return SEQ(args)
+
 @hold_tree
-def FIELD(tr):
-    field = tr[1]
-    for attr in tr[2:]:
+def FIELD(args):
+    field = args[0]
+    for attr in args[1:]:
         field = attr.getFrom(field)
     return field
 
 @hold_tree
-def VAL_LST(tr):
+def VAL_LST(args):
     lst = []
-    for it in tr[1:]:
-        if is_list(it) and it[0] == '(unpack)':
+    for it in args:
+        if is_list(it) and type(it[0]) is str and it[0] == '(unpack)':
             lst.extend(it[1])
         else:
             lst.append(it)
-    return tuple(lst)
+    return List(lst)
 
 IDC_LST = VAL_LST
 
 @hold_tree
-def SYM_LST(tr): return tuple(tr[1:])
+def SYM_LST(args): return tuple(args)
 
 @hold_tree
-def SLICE(tr): return slice(*tr[1:])
+def SLICE(args): return slice(*args)
 
 
 ## eval rules which require environment
+# the delayed ones get the unevaluated $args and evaluate them by themselves
 
 special_names = {'super'}
 
-def NAME(tr, env):
-    name = tr[1]
+def NAME(args, env):
+    name = args[0]
     try:
         if name == 'super':
             if env is Global:
@@ -207,12 +381,12 @@ def NAME(tr, env):
         else:
             raise UnboundName(f"unbound symbol '{name}'")
         
-def SYM(tr, env):
-    s = format_string(tr[1], env, char=r'\w')
+def SYM(args, env):
+    s = format_string(args[0], env, char=r'\w')
     return Symbol(s)
 
-def PRINT(tr, env):
-    print(format_string(tr[1][2:-1], env))
+def PRINT(args, env):
+    print(format_string(args[0][2:-1], env))
     return '(printed)'
 
 def format_string(s, env, char='.'):
@@ -231,11 +405,11 @@ def format_string(s, env, char='.'):
     brace_pattern = '{(%s+?)}' % char
     return re.sub(brace_pattern, subs, s)
 
-def BODY(tr, env):
-    return tr[2] if tr[1] == '(printed)' else tr[1]
+def BODY(args, env):
+    return args[1] if args[0] == '(printed)' else args[0]
 
-def IF_ELSE(tr, env):
-    _, t_case, pred, f_case = tr
+def IF_ELSE(args, env):
+    t_case, pred, f_case = args
     case = t_case if eval_tree(pred, env) else f_case
     return eval_tree(case, env)
 
@@ -246,63 +420,75 @@ def IF_ELSE(tr, env):
 #             return eval_tree(exp, env)
 #     return eval_tree(default, env)
 
-def GEN_LST(tr, env):
-    def generate(exp, constraints):
+def GEN_LST(args, env):
+    return List(generate(args, env))
+
+def LAZY_LST(args, env):
+    return Lazy(lambda: generate(args, env))
+
+def generate(args, env):
+    "Generate the items of the comprehension $args in a child env of $env."
+    def gen(exp, constraints):
         if constraints:
-            constr = constraints[0]
-            _, form, ran, *rest = constr
-            binds, cond = [], None
-            if rest and tree_tag(rest[0]) == 'WITH':
-                binds = rest.pop(0)[1]
-                binds = binds[1:] if tree_tag(binds) == 'DICT' else [binds]
-            if rest: cond = rest[0]
-            for val in eval_tree(ran, local, False):
+            form, ran, binds, cond = split_constraint(constraints[0])
+            for val in eval_tree(ran, local):
                 match(form, val, local)
-                for bind in binds: BIND(deepcopy(bind), local)
-                if not cond or eval_tree(cond, local, False):
-                    yield from generate(exp, constraints[1:])
+                for bind in binds: BIND(bind.args, local)
+                if not cond or eval_tree(cond, local):
+                    yield from gen(exp, constraints[1:])
         else:
-            yield eval_tree(exp, local, False)
-    _, exp, *constraints = tr
+            yield eval_tree(exp, local)
+    exp, *constraints = args
     local = env.child()
-    return tuple(generate(exp, constraints))
-
-def DICT(tr, env):
+    return gen(exp, constraints)
+
+def split_constraint(constr):
+    "Split a CONSTR tree into the form, the range, the BINDs in WITH and the condition."
+    form, ran, *rest = constr.args
+    binds, cond = (), None
+    if rest and tree_tag(rest[0]) == 'WITH':
+        binds = rest.pop(0).args[0]
+        binds = binds.args if tree_tag(binds) == 'DICT' else [binds]
+    if rest: cond = rest[0]
+    return form, ran, binds, cond
+
+def DICT(args, env):
     local = env.child()
-    for t in tr[1:]: BIND(t, local)
+    for t in args: BIND(t.args, local)
     return local
 
 MAP = Map  # the MAP evaluation rule is the same as Map constructor
 Map.builtins = Builtins
 
-def CLOSURE(tr, env):
-    _, local, body = tr
+def CLOSURE(args, env):
+    local, body = args
+    local = eval_tree(local, env)
     try:
         return eval_tree(body, env=local)
     except UnboundName:  # should only happen when @ is used
         return eval_tree(body, env=env)
 
-def BIND(tr, env):
-    var, exp = tr[1:3]
-    try: doc = tr[3][1][1:-1]
+def BIND(args, env):
+    var, exp = args[:2]
+    try: doc = args[2].args[0][1:-1]
     except: doc = None
     define(var, exp, env, doc)
     
-def MATCH(tr, env):
-    _, form, val = tr
+def MATCH(args, env):
+    form, val = args
     local = env.child()
     match(form, val, local)
     return local
 
 def match(form, val, local: Env):
     try:
-        _, pars, opt_pars, ext_par = form
-        pars, opt_pars = pars[1:], opt_pars[1:]
+        pars, opt_pars, ext_par = form.args
+        pars, opt_pars = pars.args, list(opt_pars.args)
         # remove the tags & make copies
         vals = list(val) if is_list(val) else [val]
     except:  # a single parameter
         if tree_tag(form) == 'PAR':
-            par = form[1]
+            par = form.args[0]
             local[par] = val
             return
         else: raise
@@ -328,6 +514,245 @@ def match(form, val, local: Env):
         raise TypeError(f'too many arguments in {vals}')
         
 
+def par_names(form):
+    "The names of the parameters in $form, or None if they are not all plain names."
+    tag = tree_tag(form)
+    if tag == 'PAR':
+        return [form.args[0]]
+    elif tag != 'FORM':
+        return None
+    pars, opt_pars, ext_par = form.args
+    names = []
+    for par in pars.args:
+        if is_name(par):
+            names.append(par)
+        else:
+            sub_names = par_names(par)
+            if sub_names is None: return None
+            names.extend(sub_names)
+    for var, _ in opt_pars.args:
+        if tree_tag(var) != 'VAR': return None
+        names.append(var.args[0])
+    if ext_par is not None:
+        names.append(ext_par)
+    return names
+
+def form_slots(form):
+    "Resolve the slots of the parameters in the frame of a Map with $form."
+    names = par_names(form) or []
+    return {name: slot for slot, name in enumerate(names)}
+
+def var_names(var):
+    "The names bound by a BIND of $var."
+    tag = tree_tag(var)
+    if tag == 'VARS':
+        return [name for v in var.args for name in var_names(v)]
+    elif tag == 'FUNC':
+        return [var.args[0].args[0]]
+    else:
+        return [var.args[0]]
+
+def analyze(tree):
+    """Find the names that $tree looks up outside of itself, and its effects.
+
+    Return the set of the free names, or None if they are only known at run
+    time (as in a CLOSURE in an env value), and the set of the tags of the
+    nodes which print, run a command or read the history.
+    >>> names, effects = analyze(calc_parse('[x] -> f"x" sin[%] + [i+j+k for i in x with j=i]')[0])
+    >>> sorted(names), sorted(effects)
+    (['k', 'sin'], ['ANS', 'PRINT'])
+    """
+    names, effects = set(), set()
+    known = True
+
+    def walk(t, bound):
+        nonlocal known
+        if type(t) is tuple:  # an optional parameter and its default
+            for x in t: walk(x, bound)
+            return
+        elif isinstance(t, Map):  # composed into the body
+            known = False
+            return
+        elif type(t) is not Node:
+            return
+        tag = tags[t.op]
+        if t.op in effect_ops:
+            effects.add(tag)
+        if tag == 'NAME':
+            if t.args[0] not in bound: names.add(t.args[0])
+        elif tag == 'SYM':  # the names in {} are substituted
+            names.update(name for name in re.findall(r'{(\w+?)}', t.args[0])
+                         if is_name(name) and name not in bound)
+        elif tag == 'MAP':
+            form, body = t.args
+            walk(form, bound)
+            walk_in(body, bound, par_names(form))
+        elif tag in ('GEN_LST', 'LAZY_LST'):
+            exp, *constraints = t.args
+            for constr in constraints:
+                form, ran, binds, cond = split_constraint(constr)
+                walk(ran, bound)
+                bound = with_names(bound, par_names(form))
+                for bind in binds: bound = walk_bind(bind, bound)
+                walk(cond, bound)
+            walk(exp, bound)
+        elif tag == 'DICT':
+            for bind in t.args: bound = walk_bind(bind, bound)
+        elif tag == 'BIND':
+            walk_bind(t, bound)
+        elif tag == 'CLOSURE':
+            local, body = t.args
+            local_tag = tree_tag(local)
+            if local_tag == 'DICT':
+                inner = bound
+                for bind in local.args: inner = walk_bind(bind, inner)
+                walk(body, inner)
+            elif local_tag == 'MATCH':
+                walk(local, bound)
+                walk_in(body, bound, par_names(local.args[0]))
+            else:  # the names of the body may be bound in the env
+                walk(local, bound)
+                known = False
+        else:
+            for x in t.args: walk(x, bound)
+
+    def with_names(bound, new_names):
+        nonlocal known
+        if new_names is None:
+            known = False
+            return bound
+        return bound | set(new_names)
+
+    def walk_in(body, bound, new_names):
+        walk(body, with_names(bound, new_names))
+
+    def walk_bind(bind, bound):
+        "Walk a BIND; return the names bound after it."
+        var, exp = bind.args[:2]
+        after = bound | set(var_names(var))
+        if tree_tag(var) == 'FUNC':  # the Map may call itself by the name
+            form = var.args[1]
+            walk(form, bound)
+            walk_in(exp, after, par_names(form))
+        else:
+            walk(exp, bound)
+        return after
+
+    walk(tree, frozenset())
+    return (names if known else None), effects
+
+def fold(tree, consts):
+    """Evaluate the constant subtrees of $tree, where the names in the dict
+    $consts are bound to constants, and pick the case of an IF_ELSE whose
+    predicate is constant. A subtree whose value is not an immutable value
+    (or raises an error) is kept to be evaluated at each time.
+    >>> fold(calc_parse('[x] -> 2*PI/360*x + (1 if 0 else 2)')[0].args[1], {'PI': 3.6})
+    ['SEQ', 0.02, BOP(*, 8), ['NAME', 'x'], BOP(+, 6), 2]
+    """
+    if type(tree) is not Node:
+        return tree
+    tag, args = tags[tree.op], tree.args
+
+    if tag == 'NAME':
+        return consts.get(args[0], tree)
+    elif tag == 'IF_ELSE':
+        t_case, pred, f_case = args
+        pred = fold(pred, consts)
+        if type(pred) is not Node:
+            try: case = t_case if pred else f_case
+            except TypeError: pass  # such as a relation of symbols
+            else: return fold(case, consts)
+        return Node(tree.op, (fold(t_case, consts), pred, fold(f_case, consts)))
+    elif tag == 'CLOSURE' and tree_tag(args[0]) == 'DICT':
+        binds = [bind.args for bind in args[0].args]
+        vals = [fold(exp, consts) for _, exp, *_ in binds]
+        if all(tree_tag(var) == 'VAR' and is_constant(val)
+               for (var, *_), val in zip(binds, vals)):  # inline the binds
+            consts = {**consts, **{var.args[0]: val for (var, *_), val in zip(binds, vals)}}
+            return fold(args[1], consts)
+        consts = {}
+    elif tag in binder_types:  # the names bound inside may shadow consts
+        names = bound_names(tree)
+        consts = {} if names is None else \
+            {name: val for name, val in consts.items() if name not in names}
+
+    args = [fold(t, consts) for t in args]
+    if tag == 'SEQ':
+        args = fold_seq(args)
+        if len(args) == 1: return args[0]
+    if tag in fold_types and not any(type(t) is Node for t in args):
+        try: val = subs_rules[tree.op](args)
+        except Exception: pass
+        else:
+            if tag not in value_types or is_constant(val):
+                return val
+    return Node(tree.op, args)
+
+def fold_seq(args):
+    "Evaluate the leading operations in the SEQ $args which are on constants."
+    if len(args) > 1 and isinstance(args[0], Builtin) and is_constant(args[1]):
+        # the application binds tighter than any operation after it
+        try: val = SEQ(args[:2])
+        except Exception: return args
+        if not is_constant(val): return args
+        args = [val, *args[2:]]
+    if not args or not is_constant(args[0]):
+        return args
+    end, priority = 1, inf
+    # stop before a constant joined with the item after it first
+    while end + 2 <= len(args) and is_binary(args[end]) and is_constant(args[end+1]) \
+            and (end + 2 == len(args) or is_binary(args[end+2])):
+        priority = min(priority, args[end].priority)
+        end += 2
+    if end == 1 or end < len(args) and args[end].priority > priority:
+        return args
+    try: val = SEQ(args[:end])
+    except Exception: return args
+    return [val, *args[end:]] if is_constant(val) else args
+
+def is_binary(x):
+    return isinstance(x, Op) and x.type == 'BOP'
+
+def is_constant(val):
+    "Whether $val is an immutable value which may take the place of a subtree."
+    if isinstance(val, tuple):
+        return all(map(is_constant, val))
+    return isinstance(val, (Number, str, Expr))
+
+def bound_names(tree):
+    "The names bound in the binder $tree, or None if they are not known statically."
+    tag = tags[tree.op]
+    if tag == 'MAP':
+        return par_names(tree.args[0])
+    elif tag in ('GEN_LST', 'LAZY_LST'):
+        names = []
+        for constr in tree.args[1:]:
+            form, _, binds, _ = split_constraint(constr)
+            form_names = par_names(form)
+            if form_names is None: return None
+            names += form_names
+            for bind in binds: names += var_names(bind.args[0])
+        return names
+    else:
+        return None
+
+def fold_body(form, body, env):
+    """Fold the $body of a Map with $form defined in $env; return the folded body
+    and the builtin names folded in it, whose rebinding makes it stale."""
+    names = par_names(form)
+    if names is None: return body, ()
+    free_names, _ = analyze(body)
+    consts = {}
+    for name in free_names or ():
+        if name in names: continue
+        scope = env
+        while scope is not None and scope is not Builtins and name not in scope:
+            scope = scope.parent
+        if scope is Builtins and name in Builtins:
+            consts[name] = Builtins[name]
+    return fold(body, consts), tuple(consts)
+
+
 def define(var, exp, env, doc=None):
 
     def def_(name, val, env):
@@ -348,7 +773,7 @@ def define(var, exp, env, doc=None):
         env[name] = val
 
     def def_all(vars, val, env):
-        t, vars = vars[0], vars[1:]
+        t, vars = tree_tag(vars), vars.args
         if t == 'VARS':
             assert is_list(val), 'vars assigned to non-list'
             assert len(vars) == len(val), 'list lengths mismatch'
@@ -361,8 +786,8 @@ def define(var, exp, env, doc=None):
 
     # evaluate the exp
     if var_tag == 'FUNC':
-        form = eval_tree(var[2], env)  # eval the opt_pars
-        val = Map(['MAP', form, exp], env)
+        form = eval_tree(var.args[1], env)  # eval the opt_pars
+        val = Map((form, exp), env)
     else:
         val = eval_tree(exp, env)
 
@@ -370,40 +795,41 @@ def define(var, exp, env, doc=None):
     if var_tag == 'VARS':
         def_all(var, val, env)
     else:
-        name = var[1] if var_tag == 'VAR' else var[1][1]
+        name = var.args[0] if var_tag == 'VAR' else var.args[0].args[0]
         def_(name, val, env)
         
 def split_field(tr, env):
-    if is_name(tr[1]):
-        parent, attr = env, tr[1]
+    args = tr.args
+    if is_name(args[0]):
+        parent, attr = env, args[0]
     else:
-        parent, attr = tr[:-1], tr[-1][1]
-        parent = eval_tree(parent, env) if len(parent) > 1 else env
+        parent, attr = args[:-1], args[-1].args[0]
+        parent = eval_tree(Node(tr.op, parent), env) if parent else env
     return parent, attr
 
 
 # these rules are commands in the calc
 
-def DEF(tr):
-    _, field, body = tr
+def DEF(args):
+    field, body = args
     upper, field_name = split_field(field, Global)
     field = upper[field_name]
     if not isinstance(field, Env):
         # if field is not Env instance, convert it into one
         field = upper.child(field, field_name)
         upper[field_name] = field
-    BIND(body, field)
+    BIND(body.args, field)
     
-def DEL(tr):
-    for t in tr[1:]:
+def DEL(args):
+    for t in args:
         field, attr = split_field(t, Global)
         field.delete(attr)
 
-def LOAD(tr):
-    test = '-t' in tr
-    verbose = '-v' in tr
-    overwrite = '-w' in tr
-    path = '%s.cal' % '/'.join(tr[1].split('.'))
+def LOAD(args):
+    test = '-t' in args
+    verbose = '-v' in args
+    overwrite = '-w' in args
+    path = '%s.cal' % '/'.join(args[0].split('.'))
 
     global Global
     current_global = Global
@@ -413,7 +839,8 @@ def LOAD(tr):
     debug.log.indent -= 2
     
     if overwrite:
-        current_global.update(Global)
+        for name in Global:  # bound one by one to stamp the new versions
+            current_global[name] = Global[name]
     else:
         for name in Global:
             if name not in current_global:
@@ -422,10 +849,10 @@ def LOAD(tr):
                 print(f'name "{name}" not loaded because it is already bound')
     Global = current_global
 
-def IMPORT(tr):
-    modname = tr[1]
-    verbose = '-v' in tr
-    overwrite = '-w' in tr
+def IMPORT(args):
+    modname = args[0]
+    verbose = '-v' in args
+    overwrite = '-w' in args
     env = definitions = {}
     try:
         exec('from modules.%s import export'%modname, env)
@@ -441,51 +868,68 @@ def IMPORT(tr):
                 val = Function(val)
             Global[name] = val
 
-def CONF(tr):
-    conf = tr[1]
+def CONF(args):
+    conf = args[0]
     if conf in ('prec', 'precision'):
-        if len(tr) == 2:
+        if len(args) == 1:
             return config.precision
         else:
-            config.precision = max(1, tr[2])
+            config.precision = max(1, eval_tree(args[1]))
     elif conf == 'tolerance':
-        if len(tr) == 2:
+        if len(args) == 1:
             return config.tolerance
         else:
-            val = eval_tree(tr[2])
+            val = eval_tree(args[1])
             config.tolerance = float(val)
+    elif conf == 'memo_size' and len(args) > 1:
+        config.memo_size = max(0, int(eval_tree(args[1])))
+    elif conf == 'memo_policy' and len(args) > 1:
+        if args[1] not in ('lru', 'fifo'):
+            raise ValueError('the memo_policy should be lru or fifo')
+        config.memo_policy = args[1]
+    elif conf == 'simplify' and len(args) > 1:
+        if args[1] not in ('always', 'on-output', 'never'):
+            raise ValueError('the simplify mode should be always, on-output or never')
+        config.simplify = args[1]
     elif hasattr(config, conf):
-        if len(tr) == 2:
+        if len(args) == 1:
             return getattr(config, conf)
         else:
-            val = eval_tree(tr[2])
+            val = eval_tree(args[1])
             if val == 'off': val = False
             setattr(config, conf, val)
     else:
         raise ValueError('no such field in the config')
     
-def EXIT(tr): exit()
+def EXIT(args): exit()
     
 
-def eval_tree(tree, env=None, mutable=True):
-    if not is_tree(tree):
+def eval_tree(tree, env=None):
+    "Evaluate the syntax $tree in $env; the tree itself is never modified."
+    if type(tree) is not Node:
         return tree
-    if not mutable:
-        tree = deepcopy(tree)
-    tag = tree_tag(tree)
+    op, args = tree.op, tree.args
     
-    if tag not in dont_eval and env:
-        for i in range(1, len(tree)):
-            tree[i] = eval_tree(tree[i], env)
+    if env and op not in dont_eval:
+        if op == seq_op and any(map(is_logic, args)):  # evaluate and/or lazily
+            groups = split_logic(args)
+            def evaluate(i, j):
+                items = groups[i][j]
+                if len(items) == 1: return eval_tree(items[0], env)
+                return SEQ([eval_tree(t, env) for t in items])
+            return eval_logic(groups, evaluate)
+        args = [eval_tree(t, env) for t in args]
         
-    if tag in subs_rules:
-        return subs_rules[tag](tree)
-    elif tag in eval_rules and env:
-        return eval_rules[tag](tree, env)
-    elif tag in exec_rules:
-        return exec_rules[tag](tree)
-    else:
+    if op in subs_rules:
+        return subs_rules[op](args)
+    elif op in eval_rules and env:
+        return eval_rules[op](args, env)
+    elif op in exec_rules:
+        return exec_rules[op](args)
+    elif args is tree.args:
         return tree
+    else:
+        return Node(op, args)
 
 
 # manage function attributes here
@@ -494,38 +938,60 @@ LOAD.run  = lambda path, test, start, verbose: NotImplemented
 # ASSIGN it in 'calc.py'
 Map.match = match
 Map.eval  = eval_tree
+Map.resolve = form_slots
+Map.analyze = analyze
+Map.fold_body = fold_body
+Map.standardize = standardize
 
 
 delay_types = {
-    'MAP',      'GEN_LST',  'BIND',     'CLOSURE' 
-    'IF_ELSE',  'DICT',     'INHERIT'
+    'MAP',      'GEN_LST',  'BIND',     'CLOSURE',
+    'IF_ELSE',  'DICT',     'INHERIT',  'LAZY_LST'
 }
 
 subs_types = {
     'LINE',     'DIR',      'ANS',      'SEQ',
     'FIELD',    'ATTR',     'REAL',     'COMPLEX',
     'BIN',      'HEX',      'IDC_LST',  'SLICE',
-    'VAL_LST',  'SYM_LST',  'EMPTY',    'INFO'
+    'VAL_LST',  'SYM_LST',  'EMPTY',    'INFO',
+    'MEMO'
 }
 subs_rules = {name: eval(name) for name in subs_types}
 subs_rules.update(OPERATORS)
+subs_rules = {opcode(name): rule for name, rule in subs_rules.items()}
+
+fold_types = {
+    'SEQ',      'VAL_LST',  'SLICE',    'REAL',
+    'COMPLEX',  'BIN',      'HEX',      'ATTR',
+    *operators
+}
+value_types = {'SEQ', 'VAL_LST', 'SLICE'}
+binder_types = {'MAP', 'GEN_LST', 'LAZY_LST', 'DICT', 'CLOSURE', 'BIND', 'MATCH'}
+# the subtrees of these types are folded when a Map is defined
 
 eval_types = {
     'NAME',     'MAP',      'PRINT',    'DICT',
     'MATCH',    'IF_ELSE',  'CLOSURE',  'SYM',
-    'BIND',     'GEN_LST',  'BODY',
+    'BIND',     'GEN_LST',  'BODY',     'LAZY_LST'
 } 
-eval_rules = {name: eval(name) for name in eval_types}
+eval_rules = {opcode(name): eval(name) for name in eval_types}
 
 exec_types = {
     'DEL',      'DEF',      'LOAD',     'IMPORT',
     'CONF',     'EXIT'
 }
-exec_rules = {name: eval(name) for name in exec_types}
+exec_rules = {opcode(name): eval(name) for name in exec_types}
 
-dont_eval = delay_types | exec_types
+effect_types = exec_types | {'PRINT', 'ANS', 'DIR', 'INFO', 'MEMO'}
+effect_ops = {opcode(name) for name in effect_types}
+# a Map whose body has these is not memoized
+
+dont_eval = {opcode(name) for name in delay_types | exec_types}
+seq_op = opcode('SEQ')
 # trees of these types are not recursively evaluated
 
+import compiler  # assigns Map.compile; it relies on the rules above
+
 
 if __name__ == "__main__":
     import doctest
@@ -1,7 +1,8 @@
 from sympy import latex, pretty
 from re import sub as translate
+from math import log10
 from builtin import Rational, Fraction, Matrix, is_number, is_function, is_env, is_matrix, floor, inf, log
-from objects import Range, Env, Function
+from objects import Range, Array, Sparse, Env, Function
 from parse import rev_parse
 from utils.debug import log
 from utils.backslash import gr_to_tex
@@ -45,7 +46,7 @@ def calc_format(val, linesep='\n', **opts):
     def format_scinum(x):
         def positive_case(x):
             supscripts = '⁰¹²³⁴⁵⁶⁷⁸⁹'
-            e = floor(log(x)/log(10))
+            e = floor(log10(x))
             b = format_float(x/10**e)
             supscript_pos = lambda n: ''.join([supscripts[int(i)] for i in str(n)])
             supscript = lambda n: '⁻' + supscript_pos(-n) if e < 0 else supscript_pos(n)
@@ -89,7 +90,7 @@ def calc_format(val, linesep='\n', **opts):
                 return calc_format(val.val)
             else:
                 return str(val) if depth == 1 else repr(val)
-        elif isinstance(val, Range):
+        elif isinstance(val, (Range, Sparse)):
             return str(val)
         else:
             return pretty(val, use_unicode=True)
@@ -97,7 +98,7 @@ def calc_format(val, linesep='\n', **opts):
     depth += 1
     indent = ' ' * indent_width * indent_level
     s = indent
-    if type(val) is tuple:
+    if isinstance(val, tuple):
         if any(map(is_matrix, val)):
             indent_level += 1
             items = f',{linesep}'.join(map(calc_format, val))
@@ -107,6 +108,12 @@ def calc_format(val, linesep='\n', **opts):
             s += format_matrix(val)
         else:
             s += '[%s]' % ', '.join(map(calc_format, val))
+    elif type(val) is Array:
+        # show only the first and the last items of a long array
+        parts = [val[:3], val[-3:]] if len(val) > 6 else [val]
+        parts = [part.tolist() if val.ndim == 1 else list(part) for part in parts]
+        items = parts[0] + ['...'] + parts[1] if len(parts) > 1 else parts[0]
+        s += '[%s]' % ', '.join(map(calc_format, items))
     else:
         s += format_atom(val)
     depth -= 1
@@ -1,66 +1,98 @@
-from operator import and_ as b_and, or_ as b_or, concat
-from functools import reduce, wraps
+from operator import and_ as b_and, or_ as b_or, concat, mul
+from functools import reduce, wraps, lru_cache
+from itertools import groupby
 from numbers import Number, Rational
 from fractions import Fraction
+import numpy as np
 from sympy import Expr, Integer, Float, Matrix, Symbol, factor, simplify, factorial
-from objects import Range, Map, Attr, Env, Op, Function, Builtin, OperationError
+from objects import Range, Map, Lazy, Array, List, Sparse, Attr, Env, Op, Function, Builtin, OperationError
 import config
 
 
-def apply(func, args):
-    "Apply $func on $val with pre-processing and post-processing."
-    
-    def numfy(val):
-        "convert a number into python number type"
-        if isinstance(val, (int, float, complex, Fraction)):
-            if isinstance(val, complex):
-                return val.real if eq_(val.imag, 0) else val
-            else:
-                return val
-        elif isinstance(val, Integer):
-            return int(val)
-        elif isinstance(val, Float):
-            return float(val)
-        else:
-            val = complex(val)
+def numfy(val):
+    "convert a number into python number type"
+    if isinstance(val, (int, float, complex, Fraction)):
+        if isinstance(val, complex):
             return val.real if eq_(val.imag, 0) else val
-
-    def standardize(val):
-        "standardize the result"
-        if type(val) is bool:
-            return 1 if val else 0
-        elif type(val) is list:
-            return tuple(standardize(a) for a in val)
-        elif type(val) is dict:
-            return Env(binds=val)
-        elif callable(val) and not isinstance(val, Function):
-            return Function(val)
-        else:
-            try: return numfy(val)
-            except (ValueError, TypeError):
-                if isinstance(val, Expr):
-                    return factor(simplify(val))
-                else: return val
-                
-    def convert(arg):
-        "convert input value"
-        if type(arg) in (list, tuple):
-            return tuple(map(convert, arg))
-        elif isinstance(arg, Env) and hasattr(arg, 'val'):
-            return arg.val
-        # elif isinstance(arg, str) and config.symbolic:
-        #     return Symbol(arg)
         else:
-            return arg
-        
+            return val
+    elif isinstance(val, Integer):
+        return int(val)
+    elif isinstance(val, Float):
+        return float(val)
+    else:
+        val = complex(val)
+        return val.real if eq_(val.imag, 0) else val
+
+
+def standardize(val):
+    "standardize the result"
+    if type(val) is bool:
+        return 1 if val else 0
+    elif type(val) is Array:
+        return Array(val.astype(int)) if val.dtype == bool else val
+    elif isinstance(val, np.generic):  # an item of an array
+        return standardize(val.item())
+    elif type(val) is list:
+        return List(standardize(a) for a in val)
+    elif type(val) is dict:
+        return Env(binds=val)
+    elif callable(val) and not isinstance(val, Function):
+        return Function(val)
+    else:
+        try: return numfy(val)
+        except (ValueError, TypeError):
+            if isinstance(val, Expr) and config.simplify == 'always':
+                return simplest(val)
+            else: return val
+
+
+@lru_cache(maxsize=1000)
+def simplest(exp):
+    "The simplified and factored form of the sympy expression $exp, cached by its structure."
+    return factor(simplify(exp))
+
+
+def simplify_all(val):
+    "Simplify the sympy expressions in $val."
+    if isinstance(val, Expr):
+        try: return simplest(val)
+        except TypeError: return val  # not hashable
+    elif isinstance(val, tuple):
+        return tuple(map(simplify_all, val))
+    else:
+        return val
+
+
+def convert(arg):
+    "convert input value"
+    if type(arg) is List and arg.plain:  # keep the list with what it has measured
+        return arg
+    elif type(arg) in (list, tuple, List):
+        return tuple(map(convert, arg))
+    elif isinstance(arg, Env) and hasattr(arg, 'val'):
+        return arg.val
+    # elif isinstance(arg, str) and config.symbolic:
+    #     return Symbol(arg)
+    else:
+        return arg
+
+
+def apply(func, args):
+    "Apply $func on $val with pre-processing and post-processing."
     args = convert(args)
-    if isinstance(func, Map):
+    if isinstance(func, Map) or type(args) in (Lazy, Array):  # passed as a whole
         result = func(args)
     else:
         result = func(*args)
     return standardize(result)
 
 
+def demote(x):
+    "The List of the items of $x if it is an Array, or else $x itself."
+    return List(x.tolist()) if type(x) is Array else x
+
+
 def is_number(value):
     return isinstance(value, Number)
 
@@ -94,9 +126,14 @@ def is_matrix(value):
     '''
     if isinstance(value, Matrix): 
         return True
+    elif type(value) is List:
+        return value.is_matrix
     else:
-        return (depth(value) == depth(value, min) == 2 and
-                same(map(len, value)) and len(value[0]) > 0)
+        return measure_matrix(value)
+
+def measure_matrix(value):
+    return (depth(value) == depth(value, min) == 2 and
+            same(map(len, value)) and len(value[0]) > 0)
 
 
 def is_function(value):
@@ -161,6 +198,8 @@ def sub_(x, y):
     return x - y
 
 def mul_(x, y):
+    if is_list(x) and not isinstance(y, int) or is_list(y) and not isinstance(x, int):
+        return broadcast(mul_)(x, y)  # a list is only repeated by an integer
     return x * y
 
 def div_(x, y):
@@ -178,6 +217,11 @@ def dot(x1, x2):
     '''
     if is_function(x1) and is_list(x2):
         return broadcast(x1)(x2)
+    if type(x1) is Sparse or type(x2) is Sparse:
+        return mul_(x1, x2) if is_number(x1) or is_number(x2) else demote(x1) @ demote(x2)
+    if type(x1) is Array or type(x2) is Array:
+        result = np.dot(x1, x2)
+        return standardize(result) if np.ndim(result) == 0 else Array(result)
     if not (is_list(x1) or is_list(x2)):
         return mul_(x1, x2)
     d1, d2 = depth(x1), depth(x2)
@@ -188,17 +232,114 @@ def dot(x1, x2):
             raise ValueError('dim mismatch for dot product')
         return sum(map(mul_, x1, x2))
     elif d1 == 1:
-        return dot([x1], x2)
+        return dot((x1,), x2)
     elif d2 == 1:
         return dot(x1, transpose(x2))
+    elif is_matrix(x1) and is_matrix(x2):
+        return matmul(x1, x2)
+    else:
+        cols = transpose(x2)
+        return List(List(dot(r, c) for c in cols) for r in x1)
+
+def matmul(m1, m2):
+    """The product of the matrices $m1 and $m2. Matrices of python numbers are
+    multiplied by numpy if some entry is inexact or no sum of products of the
+    integers can overflow int64, or else exactly row by column.
+    >>> matmul(((1, 2), (3, 4)), ((1, 2), (3, 4)))
+    ((7, 10), (15, 22))
+    >>> matmul(((0.5, 0), (0, 2)), ((1, 2), (3, 4)))
+    ((0.5, 1.0), (6.0, 8.0))
+    >>> matmul(((2**40, 1),), ((2**40,), (1,)))
+    ((1208925819614629174706177,),)
+    >>> matmul(((1, 2),), ((1, 2),))
+    Traceback (most recent call last):
+    ...
+    ValueError: dim mismatch for dot product
+    """
+    if len(m1[0]) != len(m2):
+        raise ValueError('dim mismatch for dot product')
+    types = {type(a) for m in (m1, m2) for r in m for a in r}
+    if types == {int} and (max(abs(a) for r in m1 for a in r) *
+                           max(abs(a) for r in m2 for a in r) * len(m2) < 2**63):
+        return List(map(List, (np.array(m1, np.int64) @ np.array(m2, np.int64)).tolist()))
+    elif types <= {int, Fraction}:
+        cols = tuple(zip(*m2))
+        return List(List(sum(map(mul, r, c)) for c in cols) for r in m1)
+    elif types <= {int, float, complex}:
+        return List(map(List, (np.array(m1) @ np.array(m2)).tolist()))
     else:
-        return tuple(tuple(dot(r, c) for c in transpose(x2)) for r in x1)
+        cols = transpose(m2)
+        return List(List(sum(map(mul_, r, c)) for c in cols) for r in m1)
 
 def pow_(x, y):
-    if isinstance(y, int):
-        return reduce(dot, [x] * y, 1)
+    """
+    >>> pow_(2, -2), pow_(((1, 1), (1, 0)), 10), pow_(((1, 1), (1, 0)), 0)
+    (Fraction(1, 4), ((89, 55), (55, 34)), ((1, 0), (0, 1)))
+    """
+    if isinstance(y, int) and type(x) is not Array:
+        if y >= 0:
+            return power(x, y)
+        elif isinstance(x, Rational):
+            return Fraction(x) ** y
+    elif is_list(x):
+        return broadcast(pow_)(x, y)  # only a natural power is a power of the matrix
+    return x ** y
+
+def power(x, n, mul=dot):
+    "$x to the natural power $n by repeated squaring, in O(log n) multiplications by $mul."
+    if n == 0: return identity(x)
+    result = None
+    while n:
+        if n & 1:
+            result = x if result is None else mul(result, x)
+        n >>= 1
+        if n: x = mul(x, x)
+    return result
+
+def identity(x):
+    "The power 0 of $x: the identity matrix of its size if it is a matrix, or else 1."
+    if not (isinstance(x, Matrix) or type(x) is Sparse or is_matrix(x)):
+        return 1
+    n, m = x.shape if isinstance(x, Matrix) else shape(x)
+    if n != m:
+        raise ValueError('power of a non-square matrix')
+    if isinstance(x, Matrix):
+        return Matrix.eye(n)
+    elif type(x) is Sparse:
+        return Sparse(((i, i, 1) for i in range(n)), (n, n))
+    return List(List(int(i == j) for j in range(n)) for i in range(n))
+
+def powmod(x, n, m):
+    """$x to the power $n modulo $m, reduced after each multiplication, where $x
+    is an integer or a matrix of integers.
+    >>> powmod(3, 10**18, 1000), powmod(((1, 1), (1, 0)), 10**18, 1000)
+    (1, ((501, 875), (875, 626)))
+    """
+    if not is_list(x) and not isinstance(x, Matrix):
+        return pow(x, n, m)
+    if n < 0:
+        raise ValueError('negative power of a matrix modulo %s' % m)
+    return reduce_mod(power(reduce_mod(x, m), n, lambda a, b: reduce_mod(dot(a, b), m)), m)
+
+def reduce_mod(x, m):
+    if isinstance(x, Matrix):
+        return x.applyfunc(lambda a: a % m)
+    elif is_list(x):
+        return List(reduce_mod(a, m) for a in x)
     else:
-        return x ** y
+        return x % m
+
+def sparse(entries, *shape):
+    """The sparse matrix of the dense matrix $entries, or of the triplets
+    (row, column, entry) in $entries if its $shape is given."""
+    if not shape:
+        return Sparse.from_dense(entries)
+    return Sparse(entries, shape[0] if len(shape) == 1 else shape)
+
+def prod(factors):
+    "The product of $factors, where a run of equal factors is raised to a power; 1 if there is none."
+    powers = (power(x, len(list(run))) for x, run in groupby(factors))
+    return reduce(dot, powers, next(powers, 1))
 
 
 
@@ -209,6 +350,9 @@ def and_(x, y):
         return b_and(x, y)
 
 def or_(x, y):
+    if type(x) is Array or type(y) is Array:
+        result = or_(demote(x), demote(y))
+        return Array(result) if all(map(is_number, result)) else result
     if any_([x, y], is_list):
         dx, dy = depth(x), depth(y)
         if abs(dx - dy) <= 1:
@@ -231,7 +375,18 @@ def not_(x):
     return 0 if x else 1
 
 def eq_(x, y):
-    if is_list(x):
+    '''
+    >>> eq_(Range(3, 11, 2), (3, 5, 7, 9, 11)), eq_((1, 2), Range(1, 3))
+    (True, False)
+    '''
+    if type(x) is Array or type(y) is Array:
+        return np.shape(x) == np.shape(y) and \
+            bool(np.all(abs(np.subtract(x, y)) <= config.tolerance))
+    if isinstance(x, Range) and isinstance(y, Range):
+        return x == y
+    if isinstance(y, Range):
+        x, y = y, x
+    if is_list(x) or isinstance(x, Range):
         if not is_list(y) or len(x) != len(y):
             return False
         else:
@@ -262,6 +417,12 @@ def depth(value, key=max):
     >>> depth([1, [2, [3]]])
     3
     '''
+    if type(value) is List:
+        return value.depth if key is max else value.min_depth
+    return measure_depth(value, key)
+
+def measure_depth(value, key=max):
+    if type(value) is Array: return value.ndim
     if not is_list(value): return 0
     if len(value) == 0: return 1
     return 1 + key(map(depth, value))
@@ -274,11 +435,9 @@ def broadcast(f):
         if not same(depths):
             i = depths.index(max(depths))
             args = [[*args[:i], a, *args[i+1:]] for a in args[i]]
-        return tuple(f(*a) for a in args)
+        return List(f(*a) for a in args)
     return wrapped
 
-Function.broadcast = broadcast
-
 
 def adjoin(x1, x2):
     '''
@@ -291,7 +450,7 @@ def adjoin(x1, x2):
     '''
     if isinstance(x2, Attr):
         return x2.getFrom(x1)
-    elif is_list(x1) and is_list(x2):
+    elif (is_list(x1) or isinstance(x1, (Range, Array))) and is_list(x2):
         return subscript(x1, x2)
     else:
         raise OperationError('invalid types for adjoin')
@@ -310,21 +469,46 @@ def unpack(lst):
 
 
 def subscript(lst, subs):
+    '''
+    >>> subscript(Range(1, 10), (Range(2, 5),)), subscript((1, 2, 3, 4), (Range(-2, -1),))
+    (3:6, (3, 4))
+    '''
     if not subs: return lst
     assert depth(subs) == 1
     id0 = subs[0]
+    if isinstance(id0, Range):
+        id0 = index_slice(id0)
     items = lst[id0]
     if type(id0) is slice:
+        if len(subs) == 1: return items  # a slice of a range is a range
         return tuple(subscript(item, subs[1:]) for item in items)
     else:
         return subscript(items, subs[1:])
 
 
+def index_slice(r):
+    "The slice of the indices in the range $r, which are all integers of the same sign."
+    if not all(type(i) is int for i in (r.first, r.step)):
+        raise TypeError('the indices in a range should be integers')
+    if (r.first < 0) != (r.last < 0):
+        raise IndexError('the indices in a range should be of the same sign')
+    stop = r.last + r.step
+    if (stop < 0) != (r.last < 0): stop = None  # up to an end of the list
+    return slice(r.first, stop, r.step)
+
+
 def shape(x):
+    if type(x) in (Array, List, Sparse): return x.shape
+    return measure_shape(x)
+
+def measure_shape(x):
     if not is_iter(x): return tuple()
     subshapes = [shape(a) for a in x]
     return (len(x),) + tuple(map(min, *subshapes))
 
+List.measure_depth, List.measure_shape, List.measure_matrix = \
+    measure_depth, measure_shape, measure_matrix
+
 
 def flatten(l):
     """
@@ -342,14 +526,15 @@ def flatten(l):
 
 
 def transpose(value):
+    if type(value) is Sparse:
+        return value.T
     d = depth(value, min)
     if d == 0:
         return value
     elif d == 1:
-        return transpose([value])
+        return transpose((value,))
     else:
-        rn, cn = rows(value), cols(value)
-        return [[value[r][c] for r in range(rn)] for c in range(cn)]
+        return List(map(List, zip(*value)))
 
 
 # def canmap(f):
@@ -365,8 +550,15 @@ def first(cond, lst):
     return -1
 
 
-def findall(cond, lst):
-    if is_function(cond):
+def findall(cond, lst=None):
+    """The indices of the items of $lst satisfying $cond, a function or else a value
+    they equal; or the indices of the true items of $cond if it is the only arg.
+    >>> findall(lambda x: x > 1, [1, 2, 3]), findall(2, [1, 2, 2]), findall(iter([0, 1, 1]))
+    ([1, 2], [1, 2], [1, 2])
+    """
+    if lst is None:
+        return [i for i, x in enumerate(cond) if x]
+    elif is_function(cond):
         return [i for i, x in enumerate(lst) if cond(x)]
     else:
         return [i for i, x in enumerate(lst) if eq_(x, cond)]
@@ -4,6 +4,7 @@ import json
 from builtin import binary_ops, unary_l_ops, unary_r_ops
 from utils.deco import memo, trace, disabled
 from utils.debug import check_record
+from parsegen import gen_parser
 
 trace = disabled
 
@@ -191,6 +192,7 @@ def post_process(grammar, macros):
 grammar = calc_grammar(Grammar)
 json.dump(grammar, open('src/utils/grammar.json', 'w', 
                         encoding='utf8'), indent=2)
+gen_parser(grammar)  # build src/utils/parser.py
 
 
 if __name__ == "__main__":
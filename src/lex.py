@@ -0,0 +1,79 @@
+"Split a line of calc into typed tokens before parsing."
+
+import re
+from sys import intern
+from collections import namedtuple
+from builtin import binary_ops, unary_l_ops, unary_r_ops
+
+
+keywords = {'if', 'else', 'in', 'dir', 'for', 'with', 'load',
+            'config', 'import', 'del', 'info', 'memo'}
+
+Token = namedtuple('Token', 'type text start end')
+
+all_ops = {*binary_ops, *unary_l_ops, *unary_r_ops}
+word_ops = {op for op in all_ops if op.isalpha()}
+marks = {'->', '::', '=', ',', ';', '@', "'", '$'}  # punctuations in the grammar
+symbols = sorted({op for op in all_ops if not op[0].isalnum() and op[0] != '('} | marks,
+                 key=len, reverse=True)
+
+name_pattern = r"[^\W\d][\w]*'*"  # the same as NAME in grammar.txt
+
+token_patterns = [
+    ('SPACE',   r'\s+'),
+    ('STR',     r'f?".*?"'),
+    ('NUM',     r'0b[01]+|0x[0-9a-fA-F]+|\d+(\.\d+)?([eE]-?\d+)?'),
+    ('NAME',    name_pattern),
+    ('OP',      '|'.join(map(re.escape, symbols))),
+    ('BRACKET', r'[()\[\]{}]'),
+    ('CHAR',    r'.'),
+]
+token_re = re.compile('|'.join('(?P<%s>%s)' % p for p in token_patterns))
+
+
+def tokenize(text):
+    """Split $text into a list of tokens.
+
+    >>> [tok.text for tok in tokenize('f[x] = x.y->2e-3 and not 1..3')]
+    ['f', '[', 'x', ']', '=', 'x', '.', 'y', '->', '2e-3', 'and', 'not', '1', '..', '3']
+    >>> tokenize('1 <= x')[1]
+    Token(type='OP', text='<=', start=2, end=4)
+    """
+    tokens = []
+    for m in token_re.finditer(text):
+        type = m.lastgroup
+        if type == 'SPACE': continue
+        tok = m[0]
+        if type == 'NAME' and (tok in keywords or tok in word_ops):
+            type = 'KEYWORD'
+        if type in ('OP', 'KEYWORD', 'BRACKET'):
+            tok = intern(tok)
+        tokens.append(Token(type, tok, m.start(), m.end()))
+    return tokens
+
+
+class Literals(tuple):
+    "Alternative literals of a grammar rule, tried in order."
+
+    def __init__(self, literals):
+        self.cache = {}
+
+    def candidates(self, token):
+        """The literals that may match where the lexer finds $token.
+
+        Two strings both matching at the same offset must be a prefix of
+        each other, so only these literals need to be compared with the text.
+        >>> Literals(['//', '/=', '-', '/']).candidates('/')
+        ('//', '/=', '/')
+        """
+        try: return self.cache[token]
+        except KeyError: pass
+        if len(self.cache) > 1000: self.cache.clear()
+        found = self.cache[token] = tuple(
+            lit for lit in self if lit.startswith(token) or token.startswith(lit))
+        return found
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,74 @@
+"Nodes of the syntax trees produced by the parser and walked by the evaluator."
+
+from sys import intern
+
+
+tags = []     # opcode -> tag
+opcodes = {}  # tag -> opcode
+
+def opcode(tag):
+    "The integer opcode of $tag, allocated on its first use."
+    try:
+        return opcodes[tag]
+    except KeyError:
+        op = opcodes[tag] = len(tags)
+        tags.append(intern(tag))
+        return op
+
+
+class Node:
+    """An immutable node of a syntax tree.
+
+    It consists of an integer opcode $op, on which the evaluator dispatches,
+    and a tuple $args of the subtrees and the terminal strings. Since a node
+    is never modified, a tree is shared by all the calls of a Map.
+    >>> tree = Node('SEQ', [Node('NAME', ['x']), '+', 1])
+    >>> tree.tag, tree.args[0].tag
+    ('SEQ', 'NAME')
+    >>> tree
+    ['SEQ', ['NAME', 'x'], '+', 1]
+    >>> tree.args = ()
+    Traceback (most recent call last):
+    ...
+    AttributeError: syntax tree nodes are immutable
+    """
+
+    __slots__ = 'op', 'args'
+
+    def __init__(self, tag, args=()):
+        set_op(self, opcode(tag) if type(tag) is str else tag)
+        set_args(self, tuple(args))
+
+    def __setattr__(self, name, value):
+        raise AttributeError('syntax tree nodes are immutable')
+
+    @property
+    def tag(self):
+        return tags[self.op]
+
+    def __eq__(self, other):
+        return type(other) is Node and self.op == other.op and self.args == other.args
+
+    def __hash__(self):
+        return hash((self.op, self.args))
+
+    def __repr__(self):
+        return repr([self.tag, *self.args])
+
+    def __reduce__(self):
+        # opcodes are allocated per process, so pickle the tag instead
+        return Node, (self.tag, self.args)
+
+set_op, set_args = Node.op.__set__, Node.args.__set__
+
+
+def is_tree(t):
+    return type(t) is Node
+
+def tree_tag(t):
+    return tags[t.op] if type(t) is Node else None
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
@@ -1,4 +1,13 @@
-from sympy import Symbol
+from collections import OrderedDict
+from functools import cached_property
+from itertools import count
+from fractions import Fraction
+from numbers import Number, Real, Rational
+from math import floor
+from numpy import ndarray, asarray
+import numpy as np
+from sympy import Symbol, Basic
+from node import Node, tree_tag
 from utils.deco import log, trace
 import config
 
@@ -12,7 +21,6 @@ class stack(list):
         
         
 class Function:
-    broadcast = lambda f: NotImplemented
     compose = lambda f, g: NotImplemented
 
     def __init__(self, func):
@@ -36,17 +44,39 @@ class Op(Function):
         self.symbol = symbol
         self.priority = priority
         self.nested = True
+        self.paths = {}  # kinds of the operands -> path
         
     def __call__(self, *args):
-        try:
-            return super().__call__(*args)
+        if len(args) == 2 and type(args[0]) in scalar_types and type(args[1]) in scalar_types:
+            path = whole  # the fast path of two numbers
+        else:
+            kinds = tuple(map(kind, args))
+            try: path = self.paths[kinds]
+            except KeyError: path = self.paths[kinds] = self.choose(kinds)
+        try: return path(self, args)
         except TypeError:
             if not self.nested: raise
-        call = self.__call__
-        try: return tuple(map(call, *args))
-        except TypeError: pass
-        try: return Function.broadcast(call)(*args)
-        except TypeError: raise OperationError
+            raise OperationError
+
+    def choose(self, kinds):
+        """Choose the path to apply self on the operands of $kinds, unless one
+        is registered: on the operands as a whole if none of them is a list,
+        on their items in pairs if all of them are, else broadcast. A range
+        is taken as the list of its items."""
+        seqs = [k in ('list', 'matrix') for k in kinds]
+        if self.nested and 'range' in kinds:
+            listed = tuple('list' if k == 'range' else k for k in kinds)
+            try: path = self.paths[listed]
+            except KeyError: path = self.paths[listed] = self.choose(listed)
+            path = on_items(path)
+        elif not self.nested or not any(seqs):
+            path = whole
+        elif all(seqs):
+            path = itemwise
+        else:
+            path = broadcast
+        log(f'{self.symbol} on {", ".join(kinds)}: {path.__name__}')
+        return path
 
     def __repr__(self):
         return f"{self.type}({self.symbol}, {self.priority})"
@@ -55,6 +85,100 @@ class Op(Function):
         return self.symbol
 
 
+class List(tuple):
+    """A list of calc: a tuple which measures its depth, the min depth of
+    its items, its shape and whether it is a matrix once, when first needed.
+    >>> l = List([List([1, 2]), List([3, 4])])
+    >>> l == ((1, 2), (3, 4)), l.plain, List([Env()]).plain
+    (True, True, False)
+    """
+
+    measure_depth = measure_shape = measure_matrix = NotImplemented  # assigned in funcs.py
+
+    @cached_property
+    def depth(self): return List.measure_depth(self)
+
+    @cached_property
+    def min_depth(self): return List.measure_depth(self, min)
+
+    @cached_property
+    def shape(self): return List.measure_shape(self)
+
+    @cached_property
+    def is_matrix(self): return List.measure_matrix(self)
+
+    @cached_property
+    def plain(self):
+        "Whether it holds no Env at any depth, so that it needs no conversion."
+        return all(type(x) is List and x.plain if isinstance(x, tuple)
+                   else not isinstance(x, Env) for x in self)
+
+
+scalar_types = {int, float, complex, Fraction, bool}
+
+def kind(x):
+    "The kind of the operand $x, on which the operators dispatch."
+    if type(x) in scalar_types: return 'scalar'
+    if isinstance(x, tuple): return 'matrix' if x and isinstance(x[0], (tuple, Array)) else 'list'
+    if isinstance(x, Env): return 'env'
+    if type(x) is Range: return 'range'
+    if type(x) is Array: return 'array'
+    if type(x) is Sparse: return 'sparse'
+    if isinstance(x, Number): return 'scalar'
+    if isinstance(x, Basic): return 'symbol'
+    if callable(x): return 'function'
+    return 'other'
+
+# the paths to apply an operator
+def whole(op, args): return op._func(*args)
+def itemwise(op, args): return List(map(op, *args))
+
+def broadcast(op, args):
+    "Apply $op on each item of the list in $args with the other operand."
+    x, y = args
+    if isinstance(x, tuple): return List(op(a, y) for a in x)
+    else: return List(op(x, b) for b in y)
+
+def on_items(path):
+    "The $path applied with the ranges among the operands made lists of their items."
+    def apply(op, args):
+        return path(op, [List(x) if type(x) is Range else x for x in args])
+    apply.__name__ = path.__name__
+    return apply
+
+def on_range(op, args):
+    """Apply $op on the operands as a whole, which keeps a range a range in
+    a constant time, or else on the items of the ranges among them.
+    >>> from operator import add
+    >>> plus = Op('BOP', '+', add, 6)
+    >>> plus.paths[('list', 'scalar')] = broadcast
+    >>> on_range(plus, (Range(1, 3), 1)), on_range(plus, (Range(1, 3), 1j))
+    (2:4, ((1+1j), (2+1j), (3+1j)))
+    """
+    try: return op._func(*args)
+    except TypeError:
+        return op(*(List(x) if type(x) is Range else x for x in args))
+
+def elementwise(op, args):
+    """Apply $op on the items of the arrays or lists in $args of the same shape at once by numpy.
+    >>> from operator import add
+    >>> plus = Op('BOP', '+', add, 6)
+    >>> elementwise(plus, (Array([1.5, 2, 3]), (1, 2, 3)))
+    Array([2.5, 4. , 6. ])
+    >>> elementwise(plus, (Array([1.5, 2, 3]), (1, 2)))
+    Traceback (most recent call last):
+    ...
+    ValueError: shape mismatch: (3,) and (2,)
+    """
+    shapes = tuple(map(np.shape, args))
+    if len(set(shapes)) > 1:
+        raise ValueError('shape mismatch: ' + ' and '.join(map(str, shapes)))
+    arrays = [x if type(x) is Array else Array(x) for x in args]
+    if any(a.dtype.kind in 'fc' for a in arrays):  # the integers are made floats anyway
+        arrays = [a.astype(float) if a.dtype == object else a for a in arrays]
+    return op._func(*arrays)
+
+
 class Builtin(Function):
     def __init__(self, func, name):
         super().__init__(func)
@@ -68,72 +192,209 @@ tree2str = NotImplemented
 # a function to restore syntax tree to an expression
 # ASSIGN it in format.py
 
+class Memo(OrderedDict):
+    """The results of a Map memoized by its arguments.
+
+    It holds at most config.memo_size results (no limit if it is 0): a new
+    result evicts the least recently used one if config.memo_policy is 'lru',
+    or the earliest memoized one if it is 'fifo'. The results are all
+    forgotten when a free name of the Map is rebound, which changes its stamp.
+    >>> config.memo_size, config.memo_policy = 2, 'lru'
+    >>> m = Memo(); m[1], m[2] = 'a', 'b'; m[1]; m[3] = 'c'
+    'a'
+    >>> list(m), m.evictions
+    ([1, 3], 1)
+    >>> config.memo_policy = 'fifo'
+    >>> m = Memo(); m[1], m[2] = 'a', 'b'; m[1]; m[3] = 'c'
+    'a'
+    >>> list(m), m
+    ([2, 3], <memo: 2 results, 1 hits, 0 misses, 1 evictions, 0 invalidations>)
+    >>> config.memo_size, config.memo_policy = 10000, 'lru'
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.stamp = None  # the versions of the bindings the results depend on
+        self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def validate(self, stamp):
+        "Forget the results if they are memoized with other versions of the bindings."
+        if stamp != self.stamp:
+            if self: self.invalidations += 1
+            self.clear()
+            self.stamp = stamp
+
+    def __getitem__(self, val):
+        try:
+            result = super().__getitem__(val)
+        except KeyError:
+            self.misses += 1
+            raise
+        self.hits += 1
+        if config.memo_policy == 'lru':
+            self.move_to_end(val)
+        return result
+
+    def __setitem__(self, val, result):
+        super().__setitem__(val, result)
+        size = config.memo_size
+        while size and len(self) > size:
+            self.popitem(last=False)
+            self.evictions += 1
+
+    def __repr__(self):
+        return '<memo: %d results, %d hits, %d misses, %d evictions, %d invalidations>' % (
+            len(self), self.hits, self.misses, self.evictions, self.invalidations)
+
+
+class TailCall:
+    """A call of $map on $val in tail position of the body of a Map.
+
+    It is returned in place of the result of the call, which is then made
+    by Map._func in a loop, so that a Map recursing in tail position runs
+    in a constant depth of the python stack."""
+
+    __slots__ = 'map', 'val'
+
+    def __init__(self, map, val):
+        self.map = map
+        self.val = val
+
+
 class Map(Function):
     match = lambda val, form, parent: NotImplemented
-    eval = lambda tree, parent, mutable: NotImplemented
+    eval = lambda tree, parent: NotImplemented
+    compile = lambda tree, scope: NotImplemented
+    resolve = lambda form: NotImplemented
+    analyze = lambda tree: NotImplemented
+    fold_body = lambda form, body, env: NotImplemented
+    standardize = lambda val: NotImplemented
     builtins = None
 
-    def __init__(self, tree, env):
-        _, form, body = tree
+    def __init__(self, args, env):
+        form, body = args
         form = Map.eval(form, env)      # eval opt-pars
-        if body[0] == 'INHERIT':
-            self.inherit = body[1]
-            body = ['CLOSURE', ..., body[2]]
+        if tree_tag(body) == 'INHERIT':
+            self.inherit, body = body.args
         else:
             self.inherit = None
-            body = Map.eval(body, None)  # simplify the body
             
         self.form = form
-        self.body = body
+        self.source = body
         self.parent = env
-        self._pars = form[-1]
-        self._repr = tree2str(tree)
+        self._pars = form.args[-1]
+        self._slots = Map.resolve(form)  # name -> slot of the parameters
+        # analyze the source, so that the memo depends on the names folded too
+        self.free_names, self.effects = Map.analyze(Node('MAP', (form, args[1])))
+        self._repr = tree2str(Node('MAP', args))
         self.__name__ = None
         self.__doc__ = self._repr
         self._memo = NotImplemented
+        self.fold()
+
+    def fold(self):
+        "Evaluate the constant parts of the body, with the builtins bound now."
+        if self.inherit:
+            self.body, self._folded = self.source, ()
+        else:
+            self.body, self._folded = Map.fold_body(self.form, self.source, self.parent)
+        self._fold_stamp = self.stamp(self._folded)
+        self._code = None  # the compiled body
 
     @trace
     def _func(self, val):
-        try:  # try to return the memoized result
-            return self._memo[val]
-        except:
-            if self._memo is NotImplemented:
-                try:
-                    self._memo = {}
-                    result = self.check_local(val)
-                    assert type(result) not in [Env, Map]
-                    return result
-                except (UnboundName, AssertionError):
-                    self._memo = None
+        f, calls = self, []
+        result = f.call(val)
+        while type(result) is TailCall:  # make the tail calls in a loop
+            calls.append((f, val))
+            f, val = result.map, result.val
+            result = f.call(val)
+        if calls:  # the result is returned by each call in the chain
+            result = Map.standardize(result)
+            for f, val in calls: f.remember(val, result)
+        return result
+
+    def call(self, val):
+        "Apply on $val; a call in tail position of the body is returned as a TailCall."
+        if self._folded and self.stamp(self._folded) != self._fold_stamp:
+            self.fold()  # a builtin folded in the body is rebound
+        memo = self._memo
+        if memo is NotImplemented:  # decide at the first call, when self is named
+            memo = self._memo = Memo() if self.pure() else None
+        if memo is not None:
+            stamp = self.stamp()
+            if stamp is None:  # a Map it calls has effects
+                memo = None
+            else:
+                memo.validate(stamp)
+        if memo is not None:
+            try:  # try to return the memoized result
+                return memo[val]
+            except (KeyError, TypeError):
+                pass
         
-        local = self.parent.child()
+        local = Frame(self.parent, self._slots)
         Map.match(self.form, val, local)
                 
         if self.inherit:
-            upper = Map.eval(self.inherit, local, mutable=False)
+            upper = Map.eval(self.inherit, local)
             assert isinstance(upper, Env), "@ not applied to an Env"
-            self.body[1] = local
-            env = upper
+            try:
+                result = self.run(local)
+            except UnboundName:  # look up the names in the inherited Env
+                result = self.run(upper)
+            if isinstance(result, Env):
+                result.parent = upper
+                result.cls = str(self)
         else:
-            env = local
-            
-        result = Map.eval(self.body, env, mutable=False)
-        if self.inherit and isinstance(result, Env):
-            result.parent = upper
-            result.cls = str(self)
-            
-        # try to memoize result
+            result = self.run(local)
+
+        if type(result) is TailCall:  # remembered by _func once it is made
+            return result
+        self.remember(val, result)
+        return result
+
+    def remember(self, val, result):
+        "Try to memoize $result of the call on $val."
+        if isinstance(result, (Env, Map)):  # it can be changed by binding its names
+            return
         try: self._memo[val] = result
         except: pass
-        return result
     
-    def check_local(self, val):
-        "Try to apply on $val to test if self does not depend on outside variables."
-        local = Map.builtins.child()
-        local[self.__name__] = self
-        Map.match(self.form, val, local)
-        if self.inherit: self.body[1] = local
-        return Map.eval(self.body, local, False)
+    def pure(self):
+        "Whether the result of self only depends on its arguments and free names."
+        return not self.effects and self.free_names is not None
+
+    def stamp(self, names=None, seen=None):
+        """The versions of the bindings of the free $names, where they are looked
+        up, with the stamps of the Maps bound to them, since the results depend
+        on the names these Maps look up too; None if one of them has effects."""
+        seen = {id(self)} if seen is None else seen  # the Maps stamped, for recursion
+        versions = []
+        for name in self.free_names if names is None else names:
+            env = self.parent
+            while env is not None:
+                versions.append(env.version(name))
+                if name in env:
+                    f = env[name]
+                    if isinstance(f, Map) and id(f) not in seen:
+                        seen.add(id(f))
+                        inner = f.stamp(seen=seen) if f.pure() else None
+                        if inner is None: return None
+                        versions.append(inner)
+                    break
+                env = env.parent
+        return tuple(versions)
+
+    def run(self, env):
+        "Evaluate the body in $env, by the compiled body if config.compile is on."
+        if not config.compile:
+            return Map.eval(self.body, env)
+        if self._code is None:
+            # the inherited Env may take the place of the frame
+            scope = None if self.inherit else [self._slots]
+            self._code = Map.compile(self.body, scope)
+        return self._code(env)
     
     def __str__(self):
         path = self.parent.dir()
@@ -151,15 +412,18 @@ class Map(Function):
     
     def compose(self, func):
         "Enable arithmetic ops on Map."
-        return Map(self.form, ['SEQ', func, self.body])
+        return Map((self.form, Node('SEQ', (func, self.body))), self.parent)
 
 
 class Env(dict):
+    clock = count(1)  # stamps the versions of the bindings
+
     def __init__(self, val=None, parent=None, name=None, binds=None):
         if val is not None:
             self.val = val
         self.parent = parent
         self.name = name
+        self.versions = {}  # name -> the stamp of its last binding
         if binds: self.update(binds)
         self.cls = 'env'
     
@@ -170,6 +434,21 @@ class Env(dict):
             return self.parent[name]
         raise KeyError('unbound name: ' + name)
 
+    def __setitem__(self, name, val):
+        super().__setitem__(name, val)
+        self.touch(name)
+
+    def touch(self, name):
+        "Stamp a new version of the binding of $name, and of self in its parent."
+        self.versions[name] = next(Env.clock)
+        parent = self.parent
+        if self.name and parent is not None and dict.get(parent, self.name) is self:
+            parent.touch(self.name)
+
+    def version(self, name):
+        "The stamp of the binding of $name in self; 0 if it is never rebound."
+        return self.versions.get(name, 0)
+
     def dir(self):
         prefix = '' if not self.parent or not self.parent.name \
             else self.parent.dir() + '.'
@@ -180,6 +459,7 @@ class Env(dict):
     def delete(self, name):
         try: self.pop(name)
         except: print('%s is unbound' % name)
+        else: self.touch(name)
 
     def child(self, val=None, name=None, binds=None):
         env = Env(val, self, name, binds)
@@ -195,6 +475,69 @@ class Env(dict):
         return True
     
 
+class Frame(Env):
+    """The local env of a Map call.
+    
+    The values of the parameters are kept in the list $slots, at the indices
+    $index resolved when the Map is defined, so the compiled body of the Map
+    looks them up directly. Other names are bound in the dict as in an Env."""
+    
+    name = None
+    cls = 'env'
+
+    def __init__(self, parent, index):
+        self.parent = parent
+        self.index = index  # name -> slot
+        self.slots = [None] * len(index)
+
+    def __getitem__(self, name):
+        i = self.index.get(name)
+        if i is not None:
+            return self.slots[i]
+        try:
+            return dict.__getitem__(self, name)
+        except KeyError:
+            return self.parent[name]
+
+    def __setitem__(self, name, val):
+        i = self.index.get(name)
+        if i is None:
+            dict.__setitem__(self, name, val)
+        else:
+            self.slots[i] = val
+
+    # the bindings of a call are not changed
+    def touch(self, name): pass
+    def version(self, name): return 0
+
+    def __contains__(self, name):
+        return name in self.index or super().__contains__(name)
+
+    def items(self):
+        return [*zip(self.index, self.slots), *super().items()]
+    
+
+class Lazy:
+    """A list whose items are generated again each time it is iterated,
+    so that it is reduced in constant memory."""
+
+    def __init__(self, generate):
+        self.generate = generate
+
+    def __iter__(self):
+        return self.generate()
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __bool__(self):
+        for _ in self: return True
+        return False
+
+    def __repr__(self):
+        return '<lazy list>'
+    
+
 class Attr:
     def __init__(self, name):
         self.name = name
@@ -210,44 +553,395 @@ class Attr:
         
 
 class Range:
-    def __init__(self, first, last, step=None, second=None):
-        self.first = first
-        self.last = last
-        self.iterable = None
-        
-        if second:
-            self.step = second - first
+    """An arithmetic sequence from $first to $last by $step.
+
+    Instead of the step, the $second item may be given. The last item is
+    the last one of the sequence not beyond $last, and an empty range is ().
+    The items are computed from the first item and the step as exact
+    rationals (a float by its decimal digits, so 0:1:0.1 has 11 items), thus
+    its length, membership, indexing and slicing take a constant time.
+    >>> r = Range(1, 10, 2)
+    >>> r, len(r), r[-1], 7 in r, 8 in r
+    (1:9:2, 5, 9, True, False)
+    >>> r[1:3], 2 * r + 1, list(Range(0, 0.3, 0.1))
+    (3:5:2, 3:19:4, [0.0, 0.1, 0.2, 0.3])
+    """
+
+    def __new__(cls, first, last, step=None, second=None):
+        if second is not None:
+            step = second - first
         elif step is None:
-            self.step = 1 if first <= last else -1
-        else:
-            self.step = step
-            
-        # some checks
-        if self.step == 0:
+            step = 1 if first <= last else -1
+        if step == 0:
             raise ValueError('range step is 0')
-        
-    def __new__(cls, first, last, step=None, second=None):
+        a, s = exact(first), exact(step)
+        n = floor((exact(last) - a) / s) + 1
+        return cls.sequence(a, s, n, float in map(type, (first, last, step)))
+
+    @classmethod
+    def sequence(cls, first, step, n, inexact=False):
+        "The range of $n items from the exact $first by the exact $step."
+        if n <= 0: return ()  # empty range
         obj = super().__new__(cls)
-        obj.__init__(first, last, step, second)
-        if (obj.last - obj.first) * obj.step <= 0:
-            return ()  # empty range
-        else:
-            obj.iterable = range(obj.first, obj.last + obj.step, obj.step)
-            return obj
+        obj._first, obj._step, obj.len, obj.inexact = first, step, n, inexact
+        obj.first, obj.step, obj.last = obj.item(0), obj.value(step), obj.item(n-1)
+        return obj
+
+    def value(self, x):
+        if self.inexact:
+            return float(x)
+        elif type(x) is Fraction and x.denominator == 1:
+            return x.numerator
+        return x
+
+    def item(self, i):
+        return self.value(self._first + i * self._step)
 
     def __repr__(self):
         items = [self.first, self.last, self.step]
         if self.step in (1, -1): items.pop()
         return ':'.join(map(str, items))
-        
+
+    def __len__(self):
+        return self.len
+
     def __iter__(self):
-        return iter(self.iterable)
+        if type(self._first) is int and type(self._step) is int and not self.inexact:
+            return iter(range(self._first, self._first + self.len * self._step, self._step))
+        return map(self.item, range(self.len))
+
+    def __contains__(self, x):
+        try: k = (exact(x) - self._first) / Fraction(self._step)
+        except (TypeError, ValueError): return False
+        return k.denominator == 1 and 0 <= k < self.len
+
+    def __getitem__(self, index):
+        if type(index) is slice:
+            r = range(self.len)[index]
+            return Range.sequence(self._first + r.start * self._step,
+                                  self._step * r.step, len(r), self.inexact)
+        if index < 0: index += self.len
+        if not 0 <= index < self.len:
+            raise IndexError('range index out of range')
+        return self.item(index)
+
+    def __add__(self, other):
+        if isinstance(other, Range):
+            step = self._step + other._step
+            if self.len != other.len or step == 0:
+                return NotImplemented
+            return Range.sequence(self._first + other._first, step, self.len,
+                                  self.inexact or other.inexact)
+        if not isinstance(other, Real):
+            return NotImplemented
+        return Range.sequence(self._first + exact(other), self._step, self.len,
+                              self.inexact or type(other) is float)
+
+    __radd__ = __add__
+
+    def __neg__(self):
+        return Range.sequence(-self._first, -self._step, self.len, self.inexact)
+
+    def __sub__(self, other):
+        if not isinstance(other, (Range, Real)): return NotImplemented
+        return self + -other
+
+    def __rsub__(self, other):
+        return -self + other
+
+    def __mul__(self, other):
+        if not isinstance(other, Real) or other == 0:
+            return NotImplemented
+        k = exact(other)
+        return Range.sequence(self._first * k, self._step * k, self.len,
+                              self.inexact or type(other) is float)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        if not isinstance(other, Real) or other == 0:
+            return NotImplemented
+        return self * (1 / Fraction(exact(other)))  # keeps the items exact
 
     def __eq__(self, other):
         if not isinstance(other, Range): return False
-        return all(getattr(self, a) == getattr(other, a)
-                   for a in ['first', 'last', 'step'])
-        
+        return (self._first, self._step, self.len) == (other._first, other._step, other.len)
+
+    def __hash__(self):
+        return hash((self._first, self._step, self.len))
+
+
+def exact(x):
+    "The exact rational value of the number $x; a float is taken by its decimal digits."
+    if type(x) in (int, Fraction): return x
+    return Fraction(repr(x) if type(x) is float else str(x))
+
+
+class Array(ndarray):
+    """A homogeneous array of numbers backed by numpy.
+
+    The operators apply on its items natively by the ufuncs of numpy
+    instead of being broadcast over a tuple item by item.
+    The integers are kept as python integers, since those of numpy overflow.
+    >>> a = Array([1.5, 2, 3])
+    >>> a * 2 + 1, len(a)
+    (Array([4., 5., 7.]), 3)
+    >>> Array([1, 2]) * 10**20
+    Array([100000000000000000000, 200000000000000000000], dtype=object)
+    """
+
+    def __new__(cls, items):
+        array = asarray(items)
+        if array.dtype.kind in 'iu':
+            array = array.astype(object)
+        return array.view(cls)
+
+    def __bool__(self):
+        "Whether it is nonempty, like a tuple."
+        return self.size > 0 if self.ndim else bool(self.item())
+
+
+class Sparse:
+    """A sparse matrix of the shape (m, n), storing only its nonzero entries.
+
+    The entries are kept in the compressed sparse row format: $data holds
+    them sorted by row and then by column, $cols the column of each, and
+    $indptr the offset of the entries of each row in them; $rows holds the
+    row of each entry as well for the vectorized operations. The entries are
+    numpy floats or complex numbers, or else the exact numbers themselves.
+    >>> s = Sparse([(0, 0, 2), (1, 2, 1.5), (0, 0, 1)], (2, 3))
+    >>> s, s.dense()
+    (<sparse 2×3, 2 nonzeros>, ((3.0, 0.0, 0.0), (0.0, 0.0, 1.5)))
+    >>> (s @ s.T).dense(), s @ (1, 1, 2), 2 * s == s + s
+    (((9.0, 0.0), (0.0, 2.25)), ((3.0,), (3.0,)), True)
+    >>> Sparse.from_dense([[2, -1], [-1, 2]]).solve((1, 0))
+    (0.6666666666666666, 0.3333333333333333)
+    """
+
+    def __init__(self, triplets, shape):
+        """Make the matrix of $shape from the triplets (row, column, entry),
+        where the entries at the same position are summed."""
+        triplets = tuple(triplets)
+        rows, cols, data = zip(*triplets) if triplets else ((), (), ())
+        self.setup(np.array(rows, int), np.array(cols, int), Sparse.entries(data), shape)
+
+    @staticmethod
+    def entries(values):
+        "The numpy array of $values, where the exact numbers are kept as python objects."
+        types = set(map(type, values))
+        if types <= {int, float, complex} and types - {int}:
+            return np.array(values, complex if complex in types else float)
+        return np.array(values, object)
+
+    @classmethod
+    def coo(cls, rows, cols, data, shape):
+        "Make the matrix of $shape from the arrays of the rows, columns and entries."
+        sparse = cls.__new__(cls)
+        sparse.setup(rows, cols, data, shape)
+        return sparse
+
+    @classmethod
+    def from_dense(cls, matrix):
+        "Make the sparse matrix of the nonzero entries of the nested sequence $matrix."
+        shape = len(matrix), len(matrix[0]) if len(matrix) else 0
+        return cls([(i, j, x) for i, row in enumerate(matrix)
+                    for j, x in enumerate(row) if x != 0], shape)
+
+    def setup(self, rows, cols, data, shape):
+        "Sort the entries into the rows, summing the duplicates and dropping the zeros."
+        m, n = self.shape = tuple(map(int, shape))
+        if len(rows) and not (0 <= rows.min() and rows.max() < m and
+                              0 <= cols.min() and cols.max() < n):
+            raise IndexError('entry out of the shape %d×%d' % (m, n))
+        keys, positions = np.unique(rows * n + cols, return_inverse=True)
+        sums = np.zeros(len(keys), data.dtype)
+        np.add.at(sums, positions, data)
+        nonzero = sums != 0
+        self.rows, self.cols = np.divmod(keys[nonzero], n) if n else (keys, keys)
+        self.data = sums[nonzero]
+        self.indptr = np.searchsorted(self.rows, np.arange(m + 1))
+
+    @property
+    def nnz(self):
+        return len(self.data)
+
+    @property
+    def T(self):
+        return Sparse.coo(self.cols, self.rows, self.data, self.shape[::-1])
+
+    def dense(self):
+        "The nested tuple of all the entries."
+        matrix = np.zeros(self.shape, self.data.dtype)
+        matrix[self.rows, self.cols] = self.data
+        return List(map(List, matrix.tolist()))
+
+    def matvec(self, x):
+        "The product of the matrix and the numpy vector $x."
+        products = self.data * x[self.cols]
+        if products.dtype == object:
+            y = np.zeros(self.shape[0], object)
+            np.add.at(y, self.rows, products)
+            return y
+        y = np.bincount(self.rows, products.real, self.shape[0])
+        if products.dtype == complex:
+            y = y + 1j * np.bincount(self.rows, products.imag, self.shape[0])
+        return y
+
+    def __matmul__(self, other):
+        if type(other) is Sparse:
+            return self.matmul(other)
+        if not isinstance(other, tuple):
+            return NotImplemented
+        if len(other) != self.shape[1]:
+            raise ValueError('dim mismatch for dot product')
+        x = Sparse.entries(np.ravel(other).tolist()).reshape(np.shape(other))
+        if x.ndim == 1:  # a column, as the product of a matrix and a list
+            return List(List((y,)) for y in self.matvec(x).tolist())
+        columns = [self.matvec(x[:, j]) for j in range(x.shape[1])]
+        return List(map(List, np.column_stack(columns).tolist()))
+
+    def __rmatmul__(self, other):
+        if not isinstance(other, tuple):
+            return NotImplemented
+        matrix = other if isinstance(other[0], tuple) else (other,)
+        product = self.T @ tuple(zip(*matrix))  # (X S)ᵀ = Sᵀ Xᵀ
+        return List(map(List, zip(*product)))
+
+    def matmul(self, other):
+        "The product of the sparse matrices, pairing each entry (i, k) with the entries in the row k of $other."
+        if self.shape[1] != other.shape[0]:
+            raise ValueError('dim mismatch for dot product')
+        counts = other.indptr[self.cols + 1] - other.indptr[self.cols]
+        starts = np.repeat(other.indptr[self.cols] - np.cumsum(counts) + counts, counts)
+        pairs = starts + np.arange(counts.sum())
+        return Sparse.coo(np.repeat(self.rows, counts), other.cols[pairs],
+                          np.repeat(self.data, counts) * other.data[pairs],
+                          (self.shape[0], other.shape[1]))
+
+    def __add__(self, other):
+        if type(other) is not Sparse:
+            return NotImplemented
+        if self.shape != other.shape:
+            raise ValueError('dim mismatch for addition')
+        return Sparse.coo(np.concatenate([self.rows, other.rows]),
+                          np.concatenate([self.cols, other.cols]),
+                          np.concatenate([self.data, other.data]), self.shape)
+
+    def __neg__(self):
+        return Sparse.coo(self.rows, self.cols, -self.data, self.shape)
+
+    def __sub__(self, other):
+        return self + -other if type(other) is Sparse else NotImplemented
+
+    def __mul__(self, other):
+        if not isinstance(other, (Number, Basic)):
+            return NotImplemented
+        return Sparse.coo(self.rows, self.cols, self.data * other, self.shape)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        if isinstance(other, Rational):
+            return self * Fraction(1, other)
+        return self * (1 / other)
+
+    def __eq__(self, other):
+        return (type(other) is Sparse and self.shape == other.shape and
+                np.array_equal(self.rows, other.rows) and
+                np.array_equal(self.cols, other.cols) and
+                bool(np.all(self.data == other.data)))
+
+    __hash__ = None
+
+    def solve(self, b, tol=1e-10, maxiter=None):
+        """The solution x of self @ x = b, iterated by the conjugate gradients if the
+        matrix is real and symmetric, or else by BiCGSTAB, until the residual
+        is within $tol times |b|. The conjugate gradients only converge for a
+        positive definite matrix, and BiCGSTAB may break down on an indefinite
+        one, so each falls back to the next, and the last resort is the LU
+        decomposition of the dense matrix, which takes O(n²) memory and O(n³)
+        time. The vector b may be given as a column.
+        >>> Sparse([(0, 1, 1), (1, 0, 1)], (2, 2)).solve((1, 2))
+        (2.0, 1.0)
+        >>> Sparse([(0, 0, 1), (1, 1, 0)], (2, 2)).solve((1, 2))
+        Traceback (most recent call last):
+        ...
+        ValueError: the matrix is singular
+        """
+        m, n = self.shape
+        if m != n or len(b) != n:
+            raise ValueError('dim mismatch for solve')
+        A = self.float()
+        b = np.ravel(b).tolist()
+        if len(b) != n:
+            raise ValueError('dim mismatch for solve')
+        b = np.array(b, complex if A.data.dtype == complex or
+                     any(type(x) is complex for x in b) else float)
+        solvers = [bicgstab]
+        if A.data.dtype != complex and A == A.T:
+            solvers.insert(0, conjugate_gradient)
+        for solver in solvers:
+            x = solver(A, b, tol, maxiter or 10 * n)
+            if x is not None:
+                return List(x.tolist())
+        matrix = np.zeros(A.shape, np.result_type(A.data, b))
+        matrix[A.rows, A.cols] = A.data
+        try: x = np.linalg.solve(matrix, b)
+        except np.linalg.LinAlgError:
+            raise ValueError('the matrix is singular')
+        return List(x.tolist())
+
+    def float(self):
+        "The matrix with the entries as numpy floats or complex numbers."
+        if self.data.dtype != object:
+            return self
+        data = np.array(self.data.tolist(), complex if any(
+            type(x) is complex for x in self.data) else float)
+        return Sparse.coo(self.rows, self.cols, data, self.shape)
+
+    def __repr__(self):
+        return '<sparse %d×%d, %d nonzeros>' % (*self.shape, self.nnz)
+
+
+def conjugate_gradient(A, b, tol, maxiter):
+    "Solve A x = b for the symmetric positive definite sparse matrix $A, or return None."
+    x, r = np.zeros_like(b), b.copy()
+    p, rr, bound = r.copy(), np.vdot(r, r).real, (tol * np.linalg.norm(b)) ** 2
+    for _ in range(maxiter):
+        if rr <= bound: return x
+        Ap = A.matvec(p)
+        pAp = np.vdot(p, Ap).real
+        if pAp <= 0: return None  # not positive definite
+        alpha = rr / pAp
+        x += alpha * p
+        r -= alpha * Ap
+        rr, rr_prev = np.vdot(r, r).real, rr
+        p = r + rr / rr_prev * p
+    return x if rr <= bound else None
+
+def bicgstab(A, b, tol, maxiter):
+    "Solve A x = b for the sparse matrix $A by the stabilized biconjugate gradients, or return None."
+    x, r = np.zeros_like(b), b.copy()
+    r0, p, bound = r.copy(), r.copy(), tol * np.linalg.norm(b)
+    rho = np.vdot(r0, r)
+    for _ in range(maxiter):
+        if np.linalg.norm(r) <= bound: return x
+        v = A.matvec(p)
+        r0v = np.vdot(r0, v)
+        if r0v == 0: return None
+        alpha = rho / r0v
+        s = r - alpha * v
+        t = A.matvec(s)
+        tt = np.vdot(t, t)
+        omega = np.vdot(t, s) / tt if tt else 0
+        x += alpha * p + omega * s
+        r = s - omega * t
+        rho, rho_prev = np.vdot(r0, r), rho
+        if rho_prev == 0 or omega == 0:
+            return x if np.linalg.norm(r) <= bound else None
+        p = r + rho / rho_prev * alpha / omega * (p - omega * v)
+    return x if np.linalg.norm(r) <= bound else None
+
 
 class Enum:
     def __init__(self, iterable):
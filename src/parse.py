@@ -1,26 +1,22 @@
-import re, json
+import re, os, pickle, importlib
 import config
 from objects import stack
 from builtin import operators
-from utils.deco import memo, trace, disabled
+from lex import tokenize, keywords
+from node import Node, is_tree, tree_tag
 from utils.debug import check, check_record, pprint
 
 
 try:
     assert not config.debug
-    grammar = json.load(open('src/utils/grammar.json', 'r'))
-    trace = disabled
+    from utils import parser
 except:
-    from grammar import grammar
-
-
-keywords = {'if', 'else', 'in', 'dir', 'for', 'with', 'load',
-            'config', 'import', 'del', 'info'}
-
-trace = disabled
+    from grammar import grammar  # rebuilds utils/parser.py from grammar.txt
+    from utils import parser
 
 
 # functions dealing with tags
+# the parser builds a tree as a list [tag, *args], which becomes a Node when parsed
 def is_name(s):
     return type(s) is str and s
 
@@ -28,183 +24,247 @@ tag_pattern = re.compile('[A-Z_:]+')
 def is_tag(s):
     return is_name(s) and tag_pattern.match(s)
 
-def is_tree(t):
+def is_list_tree(t):
     return type(t) is list and t and is_tag(t[0])
 
-def tree_tag(t):
-    return t[0].split(':')[0] if is_tree(t) else None
+def list_tag(t):
+    return t[0].split(':')[0] if is_list_tree(t) else None
 
+def to_node(tree):
+    "Convert a tree in the list form into Nodes."
+    if type(tree) is not list:
+        return tree
+    elif is_list_tree(tree):
+        return Node(tree[0], map(to_node, tree[1:]))
+    else:
+        return tuple(map(to_node, tree))
 
-def calc_parse(text, tag='LINE', grammar=grammar):
-
-    whitespace = grammar[' ']
-    no_space = False
 
-    def lstrip(text):
-        if no_space: return text
-        sp = re.match(whitespace, text)
-        return text[sp.end():]
+FAIL = None, None
 
-    # @memo
-    def parse_tree(syntax, text):
-        tag, body = syntax[0], syntax[1:]
+must_have = {'BIND': '=', 'MAP': '->', 'MATCH': '::', 'GEN_LST': 'for', 
+             'LAZY_LST': 'for', '_EXT': '..', 'SLICE': ':', '_DLST': ';'}
 
-        if text == '' and tag not in ('ITEM_OP', 'RE'):
-            return None, None
 
-        if tag == 'EXP':
-            return parse_alts(body, text)
-        elif tag in ('ALT', 'ITEMS', 'VARS'):
-            return parse_seq(body, text)
-        elif tag in ('OBJ', 'PAR'):
-            return parse_tag(body[0], text)
-        elif tag == 'ITEM_OP':
-            item, [_, op] = body
-            return parse_op(item, op, text)
-        else:
-            return parse_atom(tag, body[0], text)
-
-    # @trace
-    def parse_alts(alts, text):
-        for alt in alts:
-            tree, rem = parse_tree(alt, text)
-            if rem is not None:
-                return tree, rem
-        return None, None
-
-    # @trace
-    def parse_seq(seq, text):
-        tree, rem = [], text
-
-        # precheck if the keywords are in the text
-        for item in seq:
-            if item[0] == 'STR' and item[1][1:-1] not in text:
-                return None, None
-
-        nonlocal no_space
-        for item in seq:
-            tr, rem = parse_tree(item, rem)
-            if rem is None: return None, None
-            if tr:
-                if tr[0] == '(nospace)':
-                    no_space = True
-                    tr.pop(0)
-                elif no_space:
-                    no_space = False
-                    if is_name(tr):
-                        try: tree[-1] += tr; continue
-                        except: pass
-                add_to_seq(tree, tr)
-
-        if len(tree) == 1: tree = tree[0]
-        return tree, rem
-
-    def add_to_seq(seq, tr):
-        if not tr: return
-        if tr[0] == '(merge)':  # (merge) is a special tag to merge into seq
+class ParserBase:
+    """Runtime support of the generated parsing rules.
+    
+    The rules parse at offsets of the immutable $text and return a pair
+    (tree, offset of the rest), or (None, None) if they fail. Results of
+    the tagged rules are memoized by (rule, offset), so each rule is tried
+    at most once at each offset of the text.
+    
+    The text is tokenized once beforehand. Terminals are matched against
+    the token starting at the offset; the text itself is only matched where
+    a terminal does not coincide with a token (e.g. '.' at the start of '..')."""
+
+    def __init__(self, text):
+        self.text = text
+        self.end = len(text)
+        self.memo = {}
+        self.last = {}
+        self.no_space = False
+        self.tokens = tokenize(text)
+        self.at = {}    # start offset -> token
+        self.skip = {}  # whitespace offset -> start of the next token
+        pos = 0
+        for tok in self.tokens:
+            for i in range(pos, tok.start):
+                self.skip[i] = tok.start
+            self.at[tok.start] = tok
+            pos = tok.end
+        for i in range(pos, self.end):
+            self.skip[i] = self.end
+
+    def skip_space(self, pos):
+        if self.no_space: return pos
+        return self.skip.get(pos, pos)
+
+    def last_index(self, keyword):
+        "The offset of the last occurrence of $keyword (-1 if absent)."
+        try: return self.last[keyword]
+        except KeyError:
+            index = self.last[keyword] = self.text.rfind(keyword)
+            return index
+
+    def match_re(self, pattern, pos):
+        m = pattern.match(self.text, self.skip_space(pos))
+        if not m: return FAIL
+        return m[0], m.end()
+
+    def next_char(self, pos):
+        pos = self.skip_space(pos)
+        return self.text[pos:pos+1]
+
+    def match_name(self, pattern, pos):
+        pos = self.skip_space(pos)
+        tok = self.at.get(pos)
+        if tok is None or tok.type == 'STR':
+            return self.match_re(pattern, pos)
+        elif tok.type in ('NAME', 'KEYWORD'):
+            return tok.text, tok.end
+        return FAIL
+
+    def match_any(self, literals, pos):
+        "Match the first of the alternative $literals."
+        pos = self.skip_space(pos)
+        tok = self.at.get(pos)
+        if tok is not None:
+            literals = literals.candidates(tok.text)
+        for lit in literals:
+            if self.text.startswith(lit, pos):
+                return lit, pos + len(lit)
+        return FAIL
+
+    def match_str(self, literal, pos):
+        end = self.literal_end(literal, pos)
+        if end is None: return FAIL
+        return literal, end
+
+    def match_mark(self, literal, pos):
+        end = self.literal_end(literal, pos)
+        if end is None: return FAIL
+        return [], end
+
+    def literal_end(self, literal, pos):
+        "The offset after $literal if it is at $pos (after spaces), otherwise None."
+        pos = self.skip_space(pos)
+        if not self.text.startswith(literal, pos): return None
+        end = pos + len(literal)
+        if literal[-1].isalpha() and end < self.end and \
+                (self.text[end].isalnum() or self.text[end] == '_'):
+            return None  # a keyword is only the prefix of a name
+        return end
+
+    def add_item(self, seq, tr):
+        "Add the parsed item $tr to $seq."
+        if tr[0] == '(nospace)':
+            self.no_space = True
             tr.pop(0)
-            for t in tr: add_to_seq(seq, t)
-        else: 
-            seq.append(tr)
-
-    def parse_atom(tag, pattern, text):
-        text = lstrip(text)
-        if tag in ('STR', 'RE'):
-            pattern = pattern[1:-1]
-        if tag in ('RE', 'CHARS'):
-            m = re.match(pattern, text)
-            if not m: return None, None
-            else: return m[0], text[m.end():]
-        else:  # STR or MARK
-            try:
-                pre, rem = text.split(pattern, 1)
-                assert not pre
-            except:
-                return None, None
-            return pattern if tag == 'STR' else [], rem
-
-    # @trace
-    # Caution: must not add @memo decorator!
-    def parse_op(item, op, text):
-        seq, rem = [], text
-        rep, maxrep = 0, (-1 if op in '+*' else 1)
-
-        while maxrep < 0 or rep < maxrep:
-            tr, _rem = parse_tree(item, rem)
-            if _rem is None: break
-            if tr:
-                if type(tr[0]) is list: seq.extend(tr)
-                else: seq.append(tr)
-            rem = _rem
-            rep += 1
-
-        if op in '+/-' and rep == 0:
-            return None, None
-        elif op == '!':
-            if rep: return None, None
-            else: return [], text 
-        elif op == '-':
-            seq = []
-        tree = ['(merge)'] + seq
-        if op == '/':
-            tree = ['(nospace)'] + tree
-        return tree, rem
-
-    must_have = {'BIND': '=', 'MAP': '->', 'MATCH': '::', 'GEN_LST': 'for', 
-                 '_EXT': '..', 'SLICE': ':', '_DLST': ';'}
-    @trace
-    @memo
-    def parse_tag(tag, text):
-        # allow OBJ:ALTNAME; changes the tag to ALTNAME
-        alttag = None
-        if ':' in tag: tag, alttag = tag.split(':')
+        elif self.no_space:
+            self.no_space = False
+            if is_name(tr):
+                try: seq[-1] += tr; return
+                except: pass
+        add_to_seq(seq, tr)
+
+    def parse_tag(self, tag, alttag, rule, pos):
+        "Parse by $rule at $pos and tag the result as $alttag."
+        key = tag, alttag, pos
+        try: return self.memo[key]
+        except KeyError: pass
 
         # prechecks to speed up parsing
-        if not text and tag not in ('LINE', 'EMPTY'):
-            return None, None
-        if tag in must_have and must_have[tag] not in text:
-            return None, None
-        if tag[-2:] == 'OP':
-            text = lstrip(text)
-
-        tree, rem = parse_tree(grammar[tag], text)
-        if rem is None:
-            return None, None
-        if tag == 'NAME' and tree in keywords:
-            return None, None
-        if tree and tree[0] == '(merge)':
-            tree = tree[1:]
-        tree = process_tag(alttag if alttag else tag, tree)
-        return tree, rem
-
-    kept_tags = lambda tag: tag[-3:] == 'LST' or \
-        tag in {'DIR', 'DEL', 'VARS', 'DICT',
-                'PARENT', 'WITH', 'INFO'}
-    # @trace
-    def process_tag(tag, tree):
-        if tag[0] == '_':
-            tag = '(merge)'
-        if tag == 'BIND':  # special syntax for inheritance
-            convert_if_inherit(tree)
-
-        if not tree:
-            return [tag]
-        elif is_name(tree):
-            return [tag, tree]
-        elif is_tree(tree):
-            if kept_tags(tag):
-                tree = [tag, tree]  # keep the list tag
-            elif tag == 'FORM':  # special case: split the pars
-                tree = split_pars(tree)
-            return tree
-        elif len(tree) == 1:
-            return process_tag(tag, tree[0])
+        if pos == self.end or tag in must_have and \
+                self.last_index(must_have[tag]) < pos:
+            result = FAIL
         else:
-            return [tag] + tree
-
-    text = lstrip(text)
-    if not text: return ['EMPTY'], ''
-    return parse_tag(tag, text)
+            if tag[-2:] == 'OP':
+                pos = self.skip_space(pos)
+            tree, rem = rule(pos)
+            if rem is None or tag == 'NAME' and tree in keywords:
+                result = FAIL
+            else:
+                if tree and tree[0] == '(merge)':
+                    tree = tree[1:]
+                result = process_tag(alttag, tree), rem
+
+        self.memo[key] = result
+        return result
+
+
+def load_parser():
+    "(Re)load the parser generated from grammar.txt."
+    global Parser
+    importlib.reload(parser)
+    Parser = type('Parser', (parser.Rules, ParserBase), {})
+
+load_parser()
+
+
+def calc_parse(text, tag='LINE'):
+    p = Parser(text)
+    pos = p.skip_space(0)
+    if pos == p.end: return Node('EMPTY'), ''
+    tree, pos = p.parse_tag(tag, tag, getattr(p, tag), pos)
+    return to_node(tree), None if pos is None else text[pos:]
+
+
+class ScriptCache:
+    """Parse trees of the lines in a script, kept in a __calccache__ folder
+    beside the script (like __pycache__). The cache file is named after the
+    grammar hash and is discarded once the mtime of the script changes."""
+
+    folder = '__calccache__'
+    version = 4  # bump it when the form of the trees or the parse results change
+
+    def __init__(self, path):
+        dirname, name = os.path.split(path)
+        self.file = os.path.join(dirname, self.folder, '%s.%s.pickle'
+                                 % (name, parser.GRAMMAR_HASH[:12]))
+        self.mtime = os.path.getmtime(path)
+        self.trees = {}
+        self.changed = False
+        try:
+            with open(self.file, 'rb') as f:
+                stamp, trees = pickle.load(f)
+            if stamp == (self.version, self.mtime):
+                self.trees = trees
+        except Exception:  # missing or corrupted cache
+            pass
+
+    def parse(self, text):
+        "The same as calc_parse, but looks up the cache first."
+        try:  # the trees are immutable, so the cached one is shared
+            return self.trees[text]
+        except KeyError:
+            result = self.trees[text] = calc_parse(text)
+            self.changed = True
+            return result
+
+    def save(self):
+        if not self.changed: return
+        try:
+            os.makedirs(os.path.dirname(self.file), exist_ok=True)
+            with open(self.file, 'wb') as f:
+                pickle.dump(((self.version, self.mtime), self.trees), f)
+        except OSError:  # cannot write beside the script
+            pass
+
+
+def add_to_seq(seq, tr):
+    if not tr: return
+    if tr[0] == '(merge)':  # (merge) is a special tag to merge into seq
+        tr.pop(0)
+        for t in tr: add_to_seq(seq, t)
+    else: 
+        seq.append(tr)
+
+
+kept_tags = lambda tag: tag[-3:] == 'LST' or \
+    tag in {'DIR', 'DEL', 'VARS', 'DICT',
+            'PARENT', 'WITH', 'INFO', 'MEMO'}
+
+def process_tag(tag, tree):
+    if tag[0] == '_':
+        tag = '(merge)'
+    if tag == 'BIND':  # special syntax for inheritance
+        convert_if_inherit(tree)
+
+    if not tree:
+        return [tag]
+    elif is_name(tree):
+        return [tag, tree]
+    elif is_list_tree(tree):
+        if kept_tags(tag):
+            tree = [tag, tree]  # keep the list tag
+        elif tag == 'FORM':  # special case: split the pars
+            tree = split_pars(tree)
+        return tree
+    elif len(tree) == 1:
+        return process_tag(tag, tree[0])
+    else:
+        return [tag] + tree
 
 
 def split_pars(form):
@@ -216,7 +276,7 @@ def split_pars(form):
         else:
             all_pars.add(par)
             
-    if tree_tag(form) == 'PAR':
+    if list_tag(form) == 'PAR':
         return form
     else:
         pars, opt_pars = ['PARS'], ['OPTPARS']
@@ -239,10 +299,10 @@ def split_pars(form):
 
 def convert_if_inherit(bind):
     "Transform the BIND tree if it contains an inheritance from PARENT."
-    if tree_tag(bind[1]) == 'PARENT':
+    if list_tag(bind[1]) == 'PARENT':
         parent = bind.pop(1)[1]
         body = bind[1]
-        tag = 'INHERIT' if tree_tag(bind[0]) == 'FUNC' else 'CLOSURE'
+        tag = 'INHERIT' if list_tag(bind[0]) == 'FUNC' else 'CLOSURE'
         bind[1] = [tag, parent, body]
     
 
@@ -257,66 +317,65 @@ def rev_parse(tree):
                  tr = list(map(rec, tr))
             return str(tr)
         
-        def group(s): return '(%s)' if in_seq else s
+        def group(s): return '(%s)' % s if in_seq else s
         # if in an operation sequence, add a pair of parentheses
         
-        tr = tr.copy()
-        tag = tree_tag(tr)
+        tag, args = tree_tag(tr), tr.args
         if tag in ('NAME', 'SYM', 'PAR', 'VAR'):
-            return tr[1]
+            return args[0]
         elif tag == 'FIELD':
-            return ''.join(map(rec, tr[1:]))
+            return ''.join(map(rec, args))
         elif tag == 'ATTR':
-            return '.' + tr[1]
+            return '.' + args[0]
         elif tag == 'SEQ':
-            return ''.join(rec(t, True) for t in tr[1:])
+            return ''.join(rec(t, True) for t in args)
         elif tag[-2:] == 'OP':
-            op = tr[1]
+            op = args[0]
             if type(op) is str:
                 op = operators[tag][op]
             template = ' %s ' if op.priority < 4 else '%s'
-            return template % str(tr[1])
+            return template % str(args[0])
         elif tag == 'NUM':
-            return str(tr[1])
+            return str(args[0])
         elif tag == 'FORM':
-            _, pars, optpars, extpar = tr
-            pars = [rec(par) for par in pars[1:]]
-            optpars = [f'{rec(optpar)}: {default}' for optpar, default in optpars[1:]]
+            pars, optpars, extpar = args
+            pars = [rec(par) for par in pars.args]
+            optpars = [f'{rec(optpar)}: {rec(default)}' for optpar, default in optpars.args]
             extpar = [extpar+'..'] if extpar else []
             return "[%s]" % ', '.join(pars + optpars + extpar)
         elif tag == 'IF_ELSE':
-            return group("%s if %s else %s" % tuple(map(rec, tr[1:])))
+            return group("%s if %s else %s" % tuple(map(rec, args)))
         elif tag[-3:] == 'LST':
-            return '[%s]' % ', '.join(map(rec, tr[1:]))
+            return '[%s]' % ', '.join(map(rec, args))
         elif tag == 'MAP':
-            _, form, exp = tr
+            form, exp = args
             return group('%s -> %s' % (rec(form), rec(exp)))
         elif tag == 'DICT':
-            return '(%s)' % ', '.join(map(rec, tr[1:]))
+            return '(%s)' % ', '.join(map(rec, args))
         elif tag == 'BIND':
-            if tree_tag(tr[-1]) == 'DOC': tr = tr[1:]
-            tup = tuple(rec(t) for t in tr[1:])
-            if tree_tag(tr[2]) == 'AT':
+            if tree_tag(args[-1]) == 'DOC': args = args[:-1]
+            tup = tuple(rec(t) for t in args)
+            if tree_tag(args[1]) == 'AT':
                 return '%s %s = %s' % tup
             else:
                 return '%s = %s' % tup
         elif tag == 'MATCH':
-            _, form, exp = tr
+            form, exp = args
             return group('%s::%s' % (rec(form), rec(exp)))
         elif tag == 'CLOSURE':
-            _, local, exp = tr
+            local, exp = args
             return '%s %s' % (rec(local), rec(exp))
         elif tag == 'FUNC':
-            _, name, form = tr
+            name, form = args
             return '%s%s' % (rec(name), rec(form))
         elif tag == 'AT':
-            return '@' + rec(tr[1])
+            return '@' + rec(args[0])
         elif tag == 'DELAY':
-            return rec(tr[1], in_seq)
+            return rec(args[0], in_seq)
         elif tag in ('PRINT', 'DOC'):
             return ''
         else:
-            return str(list(map(rec, tr)))
+            return str([tag, *map(rec, args)])
     return rec(tree)
 
 
@@ -0,0 +1,328 @@
+"Generate a recursive descent parser module from the calc grammar."
+
+import re
+from hashlib import sha1
+from lex import name_pattern
+
+try:
+    from re import _parser as sre_parse, _constants as sre
+except ImportError:  # python < 3.11
+    import sre_parse, sre_constants as sre
+
+
+header = '''\
+# Generated by parsegen.py from grammar.txt -- DO NOT EDIT.
+# Rebuild it by importing grammar.py (done automatically in debug mode).
+import re
+from sys import intern
+from lex import Literals
+
+FAIL = None, None
+
+'''
+
+
+ASCII = frozenset(map(chr, range(128)))
+
+
+class First:
+    """The FIRST set of a grammar item: the ASCII characters it can begin with,
+    whether it can begin with a non-ASCII one and whether it can match ''."""
+
+    def __init__(self, chars=(), unicode=False, nullable=False):
+        self.chars = frozenset(chars)
+        self.unicode = unicode
+        self.nullable = nullable
+
+    def __or__(self, other):
+        return First(self.chars | other.chars, self.unicode or other.unicode,
+                     self.nullable or other.nullable)
+
+    def __eq__(self, other):
+        return (self.chars, self.unicode, self.nullable) == \
+            (other.chars, other.unicode, other.nullable)
+
+    def then(self, other):
+        "The FIRST set of self followed by $other."
+        if not self.nullable: return self
+        return First(self.chars | other.chars, self.unicode or other.unicode,
+                     other.nullable)
+
+    def optional(self):
+        return First(self.chars, self.unicode, True)
+
+    @staticmethod
+    def of_seq(firsts):
+        result = First(nullable=True)
+        for first in firsts:
+            result = result.then(first)
+        return result
+
+    @staticmethod
+    def of_literal(text):
+        if not text: return First(nullable=True)
+        return First({text[0]} & ASCII, text[0] not in ASCII)
+
+
+ANYTHING = First(ASCII, True, True)
+
+categories = {sre.CATEGORY_WORD: r'\w', sre.CATEGORY_NOT_WORD: r'\W',
+              sre.CATEGORY_DIGIT: r'\d', sre.CATEGORY_NOT_DIGIT: r'\D',
+              sre.CATEGORY_SPACE: r'\s', sre.CATEGORY_NOT_SPACE: r'\S'}
+categories = {cat: {c for c in ASCII if re.match(pat, c)}
+              for cat, pat in categories.items()}
+
+def regex_first(pattern):
+    "The FIRST set of a regular expression."
+
+    def seq_first(items):
+        return First.of_seq(item_first(op, av) for op, av in items)
+
+    def item_first(op, av):
+        if op is sre.LITERAL:
+            return First.of_literal(chr(av))
+        elif op is sre.NOT_LITERAL:
+            return First(ASCII - {chr(av)}, True)
+        elif op is sre.ANY:
+            return First(ASCII - {'\n'}, True)
+        elif op is sre.IN:
+            return set_first(av)
+        elif op in (sre.MAX_REPEAT, sre.MIN_REPEAT):
+            lo, _, items = av
+            first = seq_first(items)
+            return first.optional() if lo == 0 else first
+        elif op is sre.SUBPATTERN:
+            return seq_first(av[-1])
+        elif op is sre.BRANCH:
+            first = First()
+            for items in av[1]:
+                first |= seq_first(items)
+            return first
+        elif op in (sre.AT, sre.ASSERT, sre.ASSERT_NOT):
+            return First(nullable=True)  # zero width
+        else:
+            return ANYTHING
+
+    def set_first(items):
+        chars, unicode = set(), False
+        for op, av in items:
+            if op is sre.LITERAL:
+                chars.add(chr(av))
+            elif op is sre.RANGE:
+                chars.update(map(chr, range(av[0], av[1] + 1)))
+            elif op is sre.CATEGORY:
+                chars |= categories[av]
+                unicode = True
+        unicode = unicode or not chars <= ASCII
+        if items and items[0][0] is sre.NEGATE:
+            return First(ASCII - chars, True)
+        return First(chars & ASCII, unicode)
+
+    return seq_first(sre_parse.parse(pattern))
+
+
+def first_sets(grammar):
+    "Compute the FIRST set of each rule in $grammar."
+    firsts = {tag: First() for tag in grammar if tag != ' '}
+
+    def node_first(node):
+        tag, body = node[0], node[1:]
+        if tag in ('OBJ', 'PAR'):
+            return firsts[body[0].split(':')[0]]
+        elif tag == 'STR':
+            return First.of_literal(body[0][1:-1])
+        elif tag == 'MARK':
+            return First.of_literal(body[0])
+        elif tag in ('RE', 'CHARS'):
+            return regex_first(body[0][1:-1] if tag == 'RE' else body[0])
+        elif tag == 'EXP':
+            first = First()
+            for alt in body:
+                first |= node_first(alt)
+            return first
+        elif tag == 'ITEM_OP':
+            item, (_, op) = body
+            if op == '!': return First(nullable=True)
+            first = node_first(item)
+            return first.optional() if op in '*?' else first
+        else:
+            return First.of_seq(map(node_first, body))
+
+    changed = True
+    while changed:  # iterate to the fixed point
+        changed = False
+        for tag in firsts:
+            first = node_first(grammar[tag])
+            if first != firsts[tag]:
+                firsts[tag] = first
+                changed = True
+    firsts[None] = node_first
+    return firsts
+
+
+class ParserGen:
+    "Translate the grammar tuples into methods of a Rules class."
+
+    def __init__(self, grammar):
+        self.grammar = grammar
+        self.regexes = {}   # pattern -> constant name
+        self.literals = {}  # literal -> constant name
+        self.alternatives = {}  # tuple of literal names -> constant name
+        self.charsets = {}  # FIRST characters -> constant name
+        self.first = first_sets(grammar)[None]
+        self.methods = []
+        self.counter = 0
+
+    def regex(self, pattern):
+        if pattern not in self.regexes:
+            self.regexes[pattern] = 'RE_%d' % len(self.regexes)
+        return self.regexes[pattern]
+
+    def literal(self, text):
+        if text not in self.literals:
+            self.literals[text] = 'LIT_%d' % len(self.literals)
+        return self.literals[text]
+
+    def literals_alts(self, literals):
+        names = tuple(map(self.literal, literals))
+        if names not in self.alternatives:
+            self.alternatives[names] = 'ALTS_%d' % len(self.alternatives)
+        return self.alternatives[names]
+
+    def charset(self, chars):
+        chars = ''.join(sorted(chars))
+        if chars not in self.charsets:
+            self.charsets[chars] = 'FIRST_%d' % len(self.charsets)
+        return self.charsets[chars]
+
+    def predict(self, node):
+        "A condition that the next character $c can begin $node, or None if it may not apply."
+        first = self.first(node)
+        if first.nullable: return None
+        cond = 'c in ' + self.charset(first.chars)
+        if first.unicode: cond += " or c > '\\x7f'"
+        return cond
+
+    def helper(self, rule):
+        self.counter += 1
+        return '_%s_%d' % (rule, self.counter)
+
+    def expr(self, node, rule, pos):
+        "A python expression that parses $node at the offset $pos."
+        tag, body = node[0], node[1:]
+        if tag in ('OBJ', 'PAR'):
+            name, _, alt = body[0].partition(':')
+            return 'self.parse_tag(%r, %r, self.%s, %s)' % (
+                name, alt or name, name, pos)
+        elif tag in ('STR', 'MARK'):
+            lit = body[0][1:-1] if tag == 'STR' else body[0]
+            method = 'match_str' if tag == 'STR' else 'match_mark'
+            return 'self.%s(%s, %s)' % (method, self.literal(lit), pos)
+        elif tag in ('RE', 'CHARS'):
+            pattern = body[0][1:-1] if tag == 'RE' else body[0]
+            method = 'match_name' if pattern == name_pattern else 'match_re'
+            return 'self.%s(%s, %s)' % (method, self.regex(pattern), pos)
+        else:
+            name = self.helper(rule)
+            self.method(name, node, rule)
+            return 'self.%s(%s)' % (name, pos)
+
+    def method(self, name, node, rule):
+        "Generate the method $name parsing $node."
+        tag, body = node[0], node[1:]
+        index = len(self.methods)
+        self.methods.append(None)  # keep the place before its helpers
+        if tag == 'EXP':
+            lines = self.gen_alts(body, rule)
+        elif tag in ('ALT', 'ITEMS', 'VARS'):
+            lines = self.gen_seq(body, rule)
+        elif tag == 'ITEM_OP':
+            item, (_, op) = body
+            lines = self.gen_op(item, op, rule)
+        else:  # a single atom
+            lines = ['return ' + self.expr(node, rule, 'pos')]
+        src = '    def %s(self, pos):\n' % name
+        src += ''.join('        %s\n' % line for line in lines)
+        self.methods[index] = src
+
+    def gen_alts(self, alts, rule):
+        lines = ['if pos == self.end: return FAIL']
+        if all(alt[0] == 'STR' for alt in alts):  # look up by the token
+            literals = [alt[1][1:-1] for alt in alts]
+            return lines + ['return self.match_any(%s, pos)' % self.literals_alts(literals)]
+        # skip the alternatives that cannot begin with the next character
+        lines.append('c = self.next_char(pos)')
+        for alt in alts:
+            parse = ['tree, rem = ' + self.expr(alt, rule, 'pos'),
+                     'if rem is not None: return tree, rem']
+            cond = self.predict(alt)
+            if cond: parse = ['if %s:' % cond] + ['    ' + line for line in parse]
+            lines += parse
+        lines.append('return FAIL')
+        return lines
+
+    def gen_seq(self, seq, rule):
+        lines = ['if pos == self.end: return FAIL']
+        # precheck if the keywords are in the rest of the text
+        for item in seq:
+            if item[0] == 'STR':
+                lines.append('if self.last_index(%s) < pos: return FAIL'
+                             % self.literal(item[1][1:-1]))
+        lines.append('seq, rem = [], pos')
+        for item in seq:
+            lines += ['tr, rem = ' + self.expr(item, rule, 'rem'),
+                      'if rem is None: return FAIL',
+                      'if tr: self.add_item(seq, tr)']
+        lines.append('return (seq[0] if len(seq) == 1 else seq), rem')
+        return lines
+
+    def gen_op(self, item, op, rule):
+        parse_item = 'tr, _rem = ' + self.expr(item, rule, 'rem')
+        collect = ['    if tr:',
+                   '        if type(tr[0]) is list: seq.extend(tr)',
+                   '        else: seq.append(tr)',
+                   '    rem = _rem']
+        if op == '!':
+            return ['tr, rem = ' + self.expr(item, rule, 'pos'),
+                    'return FAIL if rem is not None else ([], pos)']
+        lines = ["seq, rem = ['(merge)'], pos"]
+        if op in '+*':
+            lines += ['rep = 0', 'while True:', '    ' + parse_item,
+                      '    if _rem is None: break'] + collect + ['    rep += 1']
+            if op == '+':
+                lines.append('if not rep: return FAIL')
+        else:
+            lines += [parse_item, 'if _rem is not None:'] + collect
+            if op in '/-':
+                lines.append('else: return FAIL')
+        if op == '-':
+            lines.append("return ['(merge)'], rem")
+        elif op == '/':
+            lines.append("return ['(nospace)'] + seq, rem")
+        else:
+            lines.append('return seq, rem')
+        return lines
+
+    def source(self):
+        for tag, node in self.grammar.items():
+            if tag == ' ': continue
+            self.method(tag, node, tag)
+        consts = ['WHITESPACE = re.compile(%r)' % self.grammar[' ']]
+        consts += ['%s = re.compile(%r)' % (name, pattern)
+                   for pattern, name in self.regexes.items()]
+        consts += ['%s = intern(%r)' % (name, lit)
+                   for lit, name in self.literals.items()]
+        consts += ['%s = Literals([%s])' % (name, ', '.join(lits))
+                   for lits, name in self.alternatives.items()]
+        consts += ['%s = frozenset(%r)' % (name, chars)
+                   for chars, name in self.charsets.items()]
+        digest = sha1(repr(sorted(self.grammar.items())).encode()).hexdigest()
+        consts.insert(0, 'GRAMMAR_HASH = %r\n' % digest)
+        rules = 'class Rules:\n    "Parsing methods, one for each grammar rule."\n\n'
+        return header + '\n'.join(consts) + '\n\n\n' + rules + '\n'.join(self.methods)
+
+
+def gen_parser(grammar, path='src/utils/parser.py'):
+    "Write the parser module generated from $grammar to $path."
+    with open(path, 'w', encoding='utf8') as f:
+        f.write(ParserGen(grammar).source())
@@ -0,0 +1,1911 @@
+# Generated by parsegen.py from grammar.txt -- DO NOT EDIT.
+# Rebuild it by importing grammar.py (done automatically in debug mode).
+import re
+from sys import intern
+from lex import Literals
+
+FAIL = None, None
+
+GRAMMAR_HASH = '85e19056723a2ac38f4ff934a8892830bfb1d167'
+
+WHITESPACE = re.compile('\\s*')
+RE_0 = re.compile('\\s*')
+RE_1 = re.compile('\\w+')
+RE_2 = re.compile('\\w[\\w-]*')
+RE_3 = re.compile('[\\w\\.]+')
+RE_4 = re.compile('-[tvw]')
+RE_5 = re.compile('-[vw]')
+RE_6 = re.compile('".*"')
+RE_7 = re.compile("[^\\W\\d][\\w]*'*")
+RE_8 = re.compile('".*?"')
+RE_9 = re.compile('f".*?"')
+RE_10 = re.compile('\\?\\w*')
+RE_11 = re.compile('[^\\W\\d]([\\w?]+|{\\w*?})*')
+RE_12 = re.compile('%(\\d+|%*)')
+RE_13 = re.compile('[+-]')
+RE_14 = re.compile('-?\\d+(\\.\\d+)?')
+RE_15 = re.compile('[eE]')
+RE_16 = re.compile('-?\\d+')
+RE_17 = re.compile('0b[01]+')
+RE_18 = re.compile('0x[0-9a-fA-F]+')
+LIT_0 = intern(';')
+LIT_1 = intern('config')
+LIT_2 = intern('dir')
+LIT_3 = intern('del')
+LIT_4 = intern(',')
+LIT_5 = intern('load')
+LIT_6 = intern('import')
+LIT_7 = intern('info')
+LIT_8 = intern('memo')
+LIT_9 = intern('exit')
+LIT_10 = intern('.')
+LIT_11 = intern('AT:PARENT')
+LIT_12 = intern('=')
+LIT_13 = intern('[')
+LIT_14 = intern(']')
+LIT_15 = intern('..')
+LIT_16 = intern('ENV')
+LIT_17 = intern('->')
+LIT_18 = intern('@')
+LIT_19 = intern('(')
+LIT_20 = intern(')')
+LIT_21 = intern('if')
+LIT_22 = intern('else')
+LIT_23 = intern('&')
+LIT_24 = intern("'")
+LIT_25 = intern('I')
+LIT_26 = intern('IDC_LST')
+LIT_27 = intern('$')
+LIT_28 = intern('for')
+LIT_29 = intern('in')
+LIT_30 = intern('with')
+LIT_31 = intern('(adj)')
+LIT_32 = intern('(app)')
+LIT_33 = intern('xor')
+LIT_34 = intern('and')
+LIT_35 = intern('//')
+LIT_36 = intern('==')
+LIT_37 = intern('/=')
+LIT_38 = intern('<=')
+LIT_39 = intern('>=')
+LIT_40 = intern('or')
+LIT_41 = intern('+')
+LIT_42 = intern('-')
+LIT_43 = intern('*')
+LIT_44 = intern('/')
+LIT_45 = intern('^')
+LIT_46 = intern('%')
+LIT_47 = intern('|')
+LIT_48 = intern('<')
+LIT_49 = intern('>')
+LIT_50 = intern(':')
+LIT_51 = intern('not')
+LIT_52 = intern('~')
+LIT_53 = intern('!')
+ALTS_0 = Literals([LIT_31, LIT_32, LIT_33, LIT_34, LIT_35, LIT_36, LIT_37, LIT_38, LIT_39, LIT_29, LIT_40, LIT_41, LIT_42, LIT_43, LIT_44, LIT_45, LIT_46, LIT_10, LIT_23, LIT_47, LIT_48, LIT_49, LIT_50])
+ALTS_1 = Literals([LIT_51, LIT_42, LIT_52])
+ALTS_2 = Literals([LIT_15, LIT_53])
+FIRST_0 = frozenset('cdeilm')
+FIRST_1 = frozenset('ABCDEFGHIJKLMNOPQRSTUVWXYZ[_abcdefghijklmnopqrstuvwxyz')
+FIRST_2 = frozenset("%&'(-0123456789?@ABCDEFGHIJKLMNOPQRSTUVWXYZ[_abcdefghijklmnopqrstuvwxyz~")
+FIRST_3 = frozenset('c')
+FIRST_4 = frozenset('d')
+FIRST_5 = frozenset('i')
+FIRST_6 = frozenset('m')
+FIRST_7 = frozenset('l')
+FIRST_8 = frozenset('e')
+FIRST_9 = frozenset('-0123456789')
+FIRST_10 = frozenset('0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ_abcdefghijklmnopqrstuvwxyz')
+FIRST_11 = frozenset('ABCDEFGHIJKLMNOPQRSTUVWXYZ_abcdefghijklmnopqrstuvwxyz')
+FIRST_12 = frozenset('[')
+FIRST_13 = frozenset('@')
+FIRST_14 = frozenset('E')
+FIRST_15 = frozenset("%&'(-0123456789?ABCDEFGHIJKLMNOPQRSTUVWXYZ[_abcdefghijklmnopqrstuvwxyz~")
+FIRST_16 = frozenset('(')
+FIRST_17 = frozenset('&')
+FIRST_18 = frozenset("%'-0123456789?ABCDEFGHIJKLMNOPQRSTUVWXYZ_abcdefghijklmnopqrstuvwxyz")
+FIRST_19 = frozenset("'(I[")
+FIRST_20 = frozenset('?')
+FIRST_21 = frozenset("'")
+FIRST_22 = frozenset('%')
+FIRST_23 = frozenset('0')
+FIRST_24 = frozenset('I')
+FIRST_25 = frozenset('$')
+
+
+class Rules:
+    "Parsing methods, one for each grammar rule."
+
+    def LINE(self, pos):
+        if pos == self.end: return FAIL
+        seq, rem = [], pos
+        tr, rem = self._LINE_1(rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self._LINE_2(rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        return (seq[0] if len(seq) == 1 else seq), rem
+
+    def _LINE_1(self, pos):
+        if pos == self.end: return FAIL
+        c = self.next_char(pos)
+        if c in FIRST_0:
+            tree, rem = self.parse_tag('CMD', 'CMD', self.CMD, pos)
+            if rem is not None: return tree, rem
+        if c in FIRST_1 or c > '\x7f':
+            tree, rem = self.parse_tag('DEF', 'DEF', self.DEF, pos)
+            if rem is not None: return tree, rem
+        if c in FIRST_2 or c > '\x7f':
+            tree, rem = self.parse_tag('EXP', 'EXP', self.EXP, pos)
+            if rem is not None: return tree, rem
+        tree, rem = self.parse_tag('EMPTY', 'EMPTY', self.EMPTY, pos)
+        if rem is not None: return tree, rem
+        return FAIL
+
+    def _LINE_2(self, pos):
+        seq, rem = ['(merge)'], pos
+        rep = 0
+        while True:
+            tr, _rem = self._LINE_3(rem)
+            if _rem is None: break
+            if tr:
+                if type(tr[0]) is list: seq.extend(tr)
+                else: seq.append(tr)
+            rem = _rem
+            rep += 1
+        return seq, rem
+
+    def _LINE_3(self, pos):
+        if pos == self.end: return FAIL
+        seq, rem = [], pos
+        tr, rem = self.match_mark(LIT_0, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self._LINE_4(rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        return (seq[0] if len(seq) == 1 else seq), rem
+
+    def _LINE_4(self, pos):
+        if pos == self.end: return FAIL
+        c = self.next_char(pos)
+        if c in FIRST_0:
+            tree, rem = self.parse_tag('CMD', 'CMD', self.CMD, pos)
+            if rem is not None: return tree, rem
+        if c in FIRST_1 or c > '\x7f':
+            tree, rem = self.parse_tag('DEF', 'DEF', self.DEF, pos)
+            if rem is not None: return tree, rem
+        if c in FIRST_2 or c > '\x7f':
+            tree, rem = self.parse_tag('EXP', 'EXP', self.EXP, pos)
+            if rem is not None: return tree, rem
+        tree, rem = self.parse_tag('EMPTY', 'EMPTY', self.EMPTY, pos)
+        if rem is not None: return tree, rem
+        return FAIL
+
+    def EMPTY(self, pos):
+        return self.match_re(RE_0, pos)
+
+    def CMD(self, pos):
+        if pos == self.end: return FAIL
+        c = self.next_char(pos)
+        if c in FIRST_3:
+            tree, rem = self.parse_tag('CONF', 'CONF', self.CONF, pos)
+            if rem is not None: return tree, rem
+        if c in FIRST_4:
+            tree, rem = self.parse_tag('DIR', 'DIR', self.DIR, pos)
+            if rem is not None: return tree, rem
+        if c in FIRST_5:
+            tree, rem = self.parse_tag('INFO', 'INFO', self.INFO, pos)
+            if rem is not None: return tree, rem
+        if c in FIRST_6:
+            tree, rem = self.parse_tag('MEMO', 'MEMO', self.MEMO, pos)
+            if rem is not None: return tree, rem
+        if c in FIRST_4:
+            tree, rem = self.parse_tag('DEL', 'DEL', self.DEL, pos)
+            if rem is not None: return tree, rem
+        if c in FIRST_7:
+            tree, rem = self.parse_tag('LOAD', 'LOAD', self.LOAD, pos)
+            if rem is not None: return tree, rem
+        if c in FIRST_5:
+            tree, rem = self.parse_tag('IMPORT', 'IMPORT', self.IMPORT, pos)
+            if rem is not None: return tree, rem
+        if c in FIRST_8:
+            tree, rem = self.parse_tag('EXIT', 'EXIT', self.EXIT, pos)
+            if rem is not None: return tree, rem
+        return FAIL
+
+    def CONF(self, pos):
+        if pos == self.end: return FAIL
+        seq, rem = [], pos
+        tr, rem = self.match_mark(LIT_1, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self.match_re(RE_1, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self._CONF_5(rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        return (seq[0] if len(seq) == 1 else seq), rem
+
+    def _CONF_5(self, pos):
+        seq, rem = ['(merge)'], pos
+        tr, _rem = self._CONF_6(rem)
+        if _rem is not None:
+            if tr:
+                if type(tr[0]) is list: seq.extend(tr)
+                else: seq.append(tr)
+            rem = _rem
+        return seq, rem
+
+    def _CONF_6(self, pos):
+        if pos == self.end: return FAIL
+        c = self.next_char(pos)
+        if c in FIRST_9 or c > '\x7f':
+            tree, rem = self.parse_tag('NUM', 'NUM', self.NUM, pos)
+            if rem is not None: return tree, rem
+        if c in FIRST_10 or c > '\x7f':
+            tree, rem = self.match_re(RE_2, pos)
+            if rem is not None: return tree, rem
+        return FAIL
+
+    def DIR(self, pos):
+        if pos == self.end: return FAIL
+        seq, rem = [], pos
+        tr, rem = self.match_mark(LIT_2, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self._DIR_7(rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        return (seq[0] if len(seq) == 1 else seq), rem
+
+    def _DIR_7(self, pos):
+        seq, rem = ['(merge)'], pos
+        tr, _rem = self.parse_tag('FIELD', 'FIELD', self.FIELD, rem)
+        if _rem is not None:
+            if tr:
+                if type(tr[0]) is list: seq.extend(tr)
+                else: seq.append(tr)
+            rem = _rem
+        return seq, rem
+
+    def DEL(self, pos):
+        if pos == self.end: return FAIL
+        seq, rem = [], pos
+        tr, rem = self.match_mark(LIT_3, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self._DEL_8(rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        return (seq[0] if len(seq) == 1 else seq), rem
+
+    def _DEL_8(self, pos):
+        if pos == self.end: return FAIL
+        seq, rem = [], pos
+        tr, rem = self.parse_tag('FIELD', 'FIELD', self.FIELD, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self._DEL_9(rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        return (seq[0] if len(seq) == 1 else seq), rem
+
+    def _DEL_9(self, pos):
+        seq, rem = ['(merge)'], pos
+        rep = 0
+        while True:
+            tr, _rem = self._DEL_10(rem)
+            if _rem is None: break
+            if tr:
+                if type(tr[0]) is list: seq.extend(tr)
+                else: seq.append(tr)
+            rem = _rem
+            rep += 1
+        return seq, rem
+
+    def _DEL_10(self, pos):
+        if pos == self.end: return FAIL
+        seq, rem = [], pos
+        tr, rem = self.match_mark(LIT_4, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self.parse_tag('FIELD', 'FIELD', self.FIELD, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        return (seq[0] if len(seq) == 1 else seq), rem
+
+    def LOAD(self, pos):
+        if pos == self.end: return FAIL
+        seq, rem = [], pos
+        tr, rem = self.match_mark(LIT_5, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self.match_re(RE_3, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self._LOAD_11(rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        return (seq[0] if len(seq) == 1 else seq), rem
+
+    def _LOAD_11(self, pos):
+        seq, rem = ['(merge)'], pos
+        rep = 0
+        while True:
+            tr, _rem = self.match_re(RE_4, rem)
+            if _rem is None: break
+            if tr:
+                if type(tr[0]) is list: seq.extend(tr)
+                else: seq.append(tr)
+            rem = _rem
+            rep += 1
+        return seq, rem
+
+    def IMPORT(self, pos):
+        if pos == self.end: return FAIL
+        seq, rem = [], pos
+        tr, rem = self.match_mark(LIT_6, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self.match_re(RE_3, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self._IMPORT_12(rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        return (seq[0] if len(seq) == 1 else seq), rem
+
+    def _IMPORT_12(self, pos):
+        seq, rem = ['(merge)'], pos
+        rep = 0
+        while True:
+            tr, _rem = self.match_re(RE_5, rem)
+            if _rem is None: break
+            if tr:
+                if type(tr[0]) is list: seq.extend(tr)
+                else: seq.append(tr)
+            rem = _rem
+            rep += 1
+        return seq, rem
+
+    def INFO(self, pos):
+        if pos == self.end: return FAIL
+        seq, rem = [], pos
+        tr, rem = self.match_mark(LIT_7, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self._INFO_13(rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        return (seq[0] if len(seq) == 1 else seq), rem
+
+    def _INFO_13(self, pos):
+        seq, rem = ['(merge)'], pos
+        tr, _rem = self.parse_tag('FIELD', 'FIELD', self.FIELD, rem)
+        if _rem is not None:
+            if tr:
+                if type(tr[0]) is list: seq.extend(tr)
+                else: seq.append(tr)
+            rem = _rem
+        return seq, rem
+
+    def MEMO(self, pos):
+        if pos == self.end: return FAIL
+        seq, rem = [], pos
+        tr, rem = self.match_mark(LIT_8, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self._MEMO_14(rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        return (seq[0] if len(seq) == 1 else seq), rem
+
+    def _MEMO_14(self, pos):
+        seq, rem = ['(merge)'], pos
+        tr, _rem = self.parse_tag('FIELD', 'FIELD', self.FIELD, rem)
+        if _rem is not None:
+            if tr:
+                if type(tr[0]) is list: seq.extend(tr)
+                else: seq.append(tr)
+            rem = _rem
+        return seq, rem
+
+    def EXIT(self, pos):
+        return self.match_mark(LIT_9, pos)
+
+    def DEF(self, pos):
+        if pos == self.end: return FAIL
+        seq, rem = [], pos
+        tr, rem = self._DEF_15(rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self.parse_tag('BIND', 'BIND', self.BIND, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        return (seq[0] if len(seq) == 1 else seq), rem
+
+    def _DEF_15(self, pos):
+        seq, rem = ['(merge)'], pos
+        tr, _rem = self.parse_tag('NM_SP', 'NM_SP', self.NM_SP, rem)
+        if _rem is not None:
+            if tr:
+                if type(tr[0]) is list: seq.extend(tr)
+                else: seq.append(tr)
+            rem = _rem
+        return seq, rem
+
+    def NM_SP(self, pos):
+        seq, rem = ['(merge)'], pos
+        rep = 0
+        while True:
+            tr, _rem = self._NM_SP_16(rem)
+            if _rem is None: break
+            if tr:
+                if type(tr[0]) is list: seq.extend(tr)
+                else: seq.append(tr)
+            rem = _rem
+            rep += 1
+        if not rep: return FAIL
+        return seq, rem
+
+    def _NM_SP_16(self, pos):
+        if pos == self.end: return FAIL
+        seq, rem = [], pos
+        tr, rem = self.parse_tag('NAME', 'NAME', self.NAME, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self.match_mark(LIT_10, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        return (seq[0] if len(seq) == 1 else seq), rem
+
+    def BIND(self, pos):
+        if pos == self.end: return FAIL
+        seq, rem = [], pos
+        tr, rem = self._BIND_17(rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self._BIND_18(rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self.match_mark(LIT_12, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self.parse_tag('EXP', 'EXP', self.EXP, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self._BIND_19(rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        return (seq[0] if len(seq) == 1 else seq), rem
+
+    def _BIND_17(self, pos):
+        if pos == self.end: return FAIL
+        c = self.next_char(pos)
+        if c in FIRST_11 or c > '\x7f':
+            tree, rem = self.parse_tag('FUNC', 'FUNC', self.FUNC, pos)
+            if rem is not None: return tree, rem
+        if c in FIRST_1 or c > '\x7f':
+            tree, rem = self.parse_tag('VAR_', 'VAR_', self.VAR_, pos)
+            if rem is not None: return tree, rem
+        return FAIL
+
+    def _BIND_18(self, pos):
+        seq, rem = ['(merge)'], pos
+        tr, _rem = self.match_mark(LIT_11, rem)
+        if _rem is not None:
+            if tr:
+                if type(tr[0]) is list: seq.extend(tr)
+                else: seq.append(tr)
+            rem = _rem
+        return seq, rem
+
+    def _BIND_19(self, pos):
+        seq, rem = ['(merge)'], pos
+        tr, _rem = self.parse_tag('DOC', 'DOC', self.DOC, rem)
+        if _rem is not None:
+            if tr:
+                if type(tr[0]) is list: seq.extend(tr)
+                else: seq.append(tr)
+            rem = _rem
+        return seq, rem
+
+    def FUNC(self, pos):
+        if pos == self.end: return FAIL
+        seq, rem = [], pos
+        tr, rem = self.parse_tag('NAME', 'VAR', self.NAME, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self.parse_tag('FORM', 'FORM', self.FORM, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        return (seq[0] if len(seq) == 1 else seq), rem
+
+    def VAR_(self, pos):
+        if pos == self.end: return FAIL
+        c = self.next_char(pos)
+        if c in FIRST_12:
+            tree, rem = self.parse_tag('VARS', 'VARS', self.VARS, pos)
+            if rem is not None: return tree, rem
+        if c in FIRST_11 or c > '\x7f':
+            tree, rem = self.parse_tag('NAME', 'VAR', self.NAME, pos)
+            if rem is not None: return tree, rem
+        return FAIL
+
+    def VARS(self, pos):
+        if pos == self.end: return FAIL
+        seq, rem = [], pos
+        tr, rem = self.match_mark(LIT_13, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self._VARS_20(rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self.match_mark(LIT_14, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        return (seq[0] if len(seq) == 1 else seq), rem
+
+    def _VARS_20(self, pos):
+        if pos == self.end: return FAIL
+        seq, rem = [], pos
+        tr, rem = self.parse_tag('VAR_', 'VAR_', self.VAR_, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self._VARS_21(rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        return (seq[0] if len(seq) == 1 else seq), rem
+
+    def _VARS_21(self, pos):
+        seq, rem = ['(merge)'], pos
+        rep = 0
+        while True:
+            tr, _rem = self._VARS_22(rem)
+            if _rem is None: break
+            if tr:
+                if type(tr[0]) is list: seq.extend(tr)
+                else: seq.append(tr)
+            rem = _rem
+            rep += 1
+        return seq, rem
+
+    def _VARS_22(self, pos):
+        if pos == self.end: return FAIL
+        seq, rem = [], pos
+        tr, rem = self.match_mark(LIT_4, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self.parse_tag('VAR_', 'VAR_', self.VAR_, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        return (seq[0] if len(seq) == 1 else seq), rem
+
+    def DOC(self, pos):
+        return self.match_re(RE_6, pos)
+
+    def FIELD(self, pos):
+        if pos == self.end: return FAIL
+        seq, rem = [], pos
+        tr, rem = self.parse_tag('NAME', 'NAME', self.NAME, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self._FIELD_23(rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        return (seq[0] if len(seq) == 1 else seq), rem
+
+    def _FIELD_23(self, pos):
+        seq, rem = ['(merge)'], pos
+        rep = 0
+        while True:
+            tr, _rem = self.parse_tag('ATTR', 'ATTR', self.ATTR, rem)
+            if _rem is None: break
+            if tr:
+                if type(tr[0]) is list: seq.extend(tr)
+                else: seq.append(tr)
+            rem = _rem
+            rep += 1
+        return seq, rem
+
+    def NAME(self, pos):
+        return self.match_name(RE_7, pos)
+
+    def ATTR(self, pos):
+        if pos == self.end: return FAIL
+        seq, rem = [], pos
+        tr, rem = self._ATTR_24(rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self.parse_tag('NAME', 'ATTR', self.NAME, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        return (seq[0] if len(seq) == 1 else seq), rem
+
+    def _ATTR_24(self, pos):
+        seq, rem = ['(merge)'], pos
+        tr, _rem = self.match_mark(LIT_10, rem)
+        if _rem is not None:
+            if tr:
+                if type(tr[0]) is list: seq.extend(tr)
+                else: seq.append(tr)
+            rem = _rem
+        else: return FAIL
+        return ['(nospace)'] + seq, rem
+
+    def FORM(self, pos):
+        return self.parse_tag('PAR_IT', 'PAR_IT', self.PAR_IT, pos)
+
+    def PAR_IT(self, pos):
+        if pos == self.end: return FAIL
+        c = self.next_char(pos)
+        if c in FIRST_12:
+            tree, rem = self.parse_tag('PAR_LST', 'PAR_LST', self.PAR_LST, pos)
+            if rem is not None: return tree, rem
+        if c in FIRST_11 or c > '\x7f':
+            tree, rem = self.parse_tag('NAME', 'PAR', self.NAME, pos)
+            if rem is not None: return tree, rem
+        return FAIL
+
+    def PAR_LST(self, pos):
+        if pos == self.end: return FAIL
+        seq, rem = [], pos
+        tr, rem = self.match_mark(LIT_13, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self._PAR_LST_25(rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self.match_mark(LIT_14, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        return (seq[0] if len(seq) == 1 else seq), rem
+
+    def _PAR_LST_25(self, pos):
+        if pos == self.end: return FAIL
+        c = self.next_char(pos)
+        if c in FIRST_1 or c > '\x7f':
+            tree, rem = self._PAR_LST_26(pos)
+            if rem is not None: return tree, rem
+        if c in FIRST_1 or c > '\x7f':
+            tree, rem = self._PAR_LST_31(pos)
+            if rem is not None: return tree, rem
+        tree, rem = self._PAR_LST_34(pos)
+        if rem is not None: return tree, rem
+        return FAIL
+
+    def _PAR_LST_26(self, pos):
+        if pos == self.end: return FAIL
+        seq, rem = [], pos
+        tr, rem = self.parse_tag('_PARS', '_PARS', self._PARS, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self._PAR_LST_27(rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self._PAR_LST_29(rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        return (seq[0] if len(seq) == 1 else seq), rem
+
+    def _PAR_LST_27(self, pos):
+        seq, rem = ['(merge)'], pos
+        tr, _rem = self._PAR_LST_28(rem)
+        if _rem is not None:
+            if tr:
+                if type(tr[0]) is list: seq.extend(tr)
+                else: seq.append(tr)
+            rem = _rem
+        return seq, rem
+
+    def _PAR_LST_28(self, pos):
+        if pos == self.end: return FAIL
+        seq, rem = [], pos
+        tr, rem = self.match_mark(LIT_4, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self.parse_tag('_OPTS', '_OPTS', self._OPTS, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        return (seq[0] if len(seq) == 1 else seq), rem
+
+    def _PAR_LST_29(self, pos):
+        seq, rem = ['(merge)'], pos
+        tr, _rem = self._PAR_LST_30(rem)
+        if _rem is not None:
+            if tr:
+                if type(tr[0]) is list: seq.extend(tr)
+                else: seq.append(tr)
+            rem = _rem
+        return seq, rem
+
+    def _PAR_LST_30(self, pos):
+        if pos == self.end: return FAIL
+        seq, rem = [], pos
+        tr, rem = self.match_mark(LIT_4, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self.parse_tag('_EXT', '_EXT', self._EXT, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        return (seq[0] if len(seq) == 1 else seq), rem
+
+    def _PAR_LST_31(self, pos):
+        if pos == self.end: return FAIL
+        seq, rem = [], pos
+        tr, rem = self.parse_tag('_OPTS', '_OPTS', self._OPTS, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self._PAR_LST_32(rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        return (seq[0] if len(seq) == 1 else seq), rem
+
+    def _PAR_LST_32(self, pos):
+        seq, rem = ['(merge)'], pos
+        tr, _rem = self._PAR_LST_33(rem)
+        if _rem is not None:
+            if tr:
+                if type(tr[0]) is list: seq.extend(tr)
+                else: seq.append(tr)
+            rem = _rem
+        return seq, rem
+
+    def _PAR_LST_33(self, pos):
+        if pos == self.end: return FAIL
+        seq, rem = [], pos
+        tr, rem = self.match_mark(LIT_4, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self.parse_tag('_EXT', '_EXT', self._EXT, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        return (seq[0] if len(seq) == 1 else seq), rem
+
+    def _PAR_LST_34(self, pos):
+        seq, rem = ['(merge)'], pos
+        tr, _rem = self.parse_tag('_EXT', '_EXT', self._EXT, rem)
+        if _rem is not None:
+            if tr:
+                if type(tr[0]) is list: seq.extend(tr)
+                else: seq.append(tr)
+            rem = _rem
+        return seq, rem
+
+    def _PARS(self, pos):
+        if pos == self.end: return FAIL
+        seq, rem = [], pos
+        tr, rem = self.__PARS_35(rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self.__PARS_38(rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        return (seq[0] if len(seq) == 1 else seq), rem
+
+    def __PARS_35(self, pos):
+        if pos == self.end: return FAIL
+        seq, rem = [], pos
+        tr, rem = self.__PARS_36(rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self.parse_tag('PAR_IT', 'PAR_IT', self.PAR_IT, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self.__PARS_37(rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        return (seq[0] if len(seq) == 1 else seq), rem
+
+    def __PARS_36(self, pos):
+        tr, rem = self.parse_tag('BIND', 'BIND', self.BIND, pos)
+        return FAIL if rem is not None else ([], pos)
+
+    def __PARS_37(self, pos):
+        tr, rem = self.match_mark(LIT_15, pos)
+        return FAIL if rem is not None else ([], pos)
+
+    def __PARS_38(self, pos):
+        seq, rem = ['(merge)'], pos
+        rep = 0
+        while True:
+            tr, _rem = self.__PARS_39(rem)
+            if _rem is None: break
+            if tr:
+                if type(tr[0]) is list: seq.extend(tr)
+                else: seq.append(tr)
+            rem = _rem
+            rep += 1
+        return seq, rem
+
+    def __PARS_39(self, pos):
+        if pos == self.end: return FAIL
+        seq, rem = [], pos
+        tr, rem = self.match_mark(LIT_4, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self.__PARS_40(rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        return (seq[0] if len(seq) == 1 else seq), rem
+
+    def __PARS_40(self, pos):
+        if pos == self.end: return FAIL
+        seq, rem = [], pos
+        tr, rem = self.__PARS_41(rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self.parse_tag('PAR_IT', 'PAR_IT', self.PAR_IT, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self.__PARS_42(rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        return (seq[0] if len(seq) == 1 else seq), rem
+
+    def __PARS_41(self, pos):
+        tr, rem = self.parse_tag('BIND', 'BIND', self.BIND, pos)
+        return FAIL if rem is not None else ([], pos)
+
+    def __PARS_42(self, pos):
+        tr, rem = self.match_mark(LIT_15, pos)
+        return FAIL if rem is not None else ([], pos)
+
+    def _OPTS(self, pos):
+        if pos == self.end: return FAIL
+        seq, rem = [], pos
+        tr, rem = self.__OPTS_43(rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self.__OPTS_45(rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        return (seq[0] if len(seq) == 1 else seq), rem
+
+    def __OPTS_43(self, pos):
+        if pos == self.end: return FAIL
+        seq, rem = [], pos
+        tr, rem = self.parse_tag('BIND', 'OPTPAR', self.BIND, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self.__OPTS_44(rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        return (seq[0] if len(seq) == 1 else seq), rem
+
+    def __OPTS_44(self, pos):
+        tr, rem = self.match_mark(LIT_15, pos)
+        return FAIL if rem is not None else ([], pos)
+
+    def __OPTS_45(self, pos):
+        seq, rem = ['(merge)'], pos
+        rep = 0
+        while True:
+            tr, _rem = self.__OPTS_46(rem)
+            if _rem is None: break
+            if tr:
+                if type(tr[0]) is list: seq.extend(tr)
+                else: seq.append(tr)
+            rem = _rem
+            rep += 1
+        return seq, rem
+
+    def __OPTS_46(self, pos):
+        if pos == self.end: return FAIL
+        seq, rem = [], pos
+        tr, rem = self.match_mark(LIT_4, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self.__OPTS_47(rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        return (seq[0] if len(seq) == 1 else seq), rem
+
+    def __OPTS_47(self, pos):
+        if pos == self.end: return FAIL
+        seq, rem = [], pos
+        tr, rem = self.parse_tag('BIND', 'OPTPAR', self.BIND, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self.__OPTS_48(rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        return (seq[0] if len(seq) == 1 else seq), rem
+
+    def __OPTS_48(self, pos):
+        tr, rem = self.match_mark(LIT_15, pos)
+        return FAIL if rem is not None else ([], pos)
+
+    def _EXT(self, pos):
+        if pos == self.end: return FAIL
+        seq, rem = [], pos
+        tr, rem = self.parse_tag('NAME', 'EXTPAR', self.NAME, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self.match_mark(LIT_15, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        return (seq[0] if len(seq) == 1 else seq), rem
+
+    def EXP(self, pos):
+        if pos == self.end: return FAIL
+        c = self.next_char(pos)
+        if c in FIRST_1 or c > '\x7f':
+            tree, rem = self.parse_tag('MAP', 'MAP', self.MAP, pos)
+            if rem is not None: return tree, rem
+        if c in FIRST_13:
+            tree, rem = self.parse_tag('CLOSURE', 'CLOSURE', self.CLOSURE, pos)
+            if rem is not None: return tree, rem
+        if c in FIRST_14:
+            tree, rem = self.match_mark(LIT_16, pos)
+            if rem is not None: return tree, rem
+        if c in FIRST_15 or c > '\x7f':
+            tree, rem = self.parse_tag('BODY', 'BODY', self.BODY, pos)
+            if rem is not None: return tree, rem
+        return FAIL
+
+    def MAP(self, pos):
+        if pos == self.end: return FAIL
+        seq, rem = [], pos
+        tr, rem = self.parse_tag('FORM', 'FORM', self.FORM, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self.match_mark(LIT_17, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self.parse_tag('EXP', 'EXP', self.EXP, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        return (seq[0] if len(seq) == 1 else seq), rem
+
+    def CLOSURE(self, pos):
+        if pos == self.end: return FAIL
+        seq, rem = [], pos
+        tr, rem = self.match_mark(LIT_18, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self.parse_tag('ITEM', 'ITEM', self.ITEM, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self.parse_tag('EXP', 'EXP', self.EXP, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        return (seq[0] if len(seq) == 1 else seq), rem
+
+    def DICT(self, pos):
+        if pos == self.end: return FAIL
+        seq, rem = [], pos
+        tr, rem = self._DICT_49(rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self._DICT_50(rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self._DICT_53(rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        return (seq[0] if len(seq) == 1 else seq), rem
+
+    def _DICT_49(self, pos):
+        seq, rem = ['(merge)'], pos
+        tr, _rem = self.match_str(LIT_19, rem)
+        if _rem is not None:
+            if tr:
+                if type(tr[0]) is list: seq.extend(tr)
+                else: seq.append(tr)
+            rem = _rem
+        else: return FAIL
+        return ['(merge)'], rem
+
+    def _DICT_50(self, pos):
+        if pos == self.end: return FAIL
+        seq, rem = [], pos
+        tr, rem = self.parse_tag('BIND', 'BIND', self.BIND, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self._DICT_51(rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        return (seq[0] if len(seq) == 1 else seq), rem
+
+    def _DICT_51(self, pos):
+        seq, rem = ['(merge)'], pos
+        rep = 0
+        while True:
+            tr, _rem = self._DICT_52(rem)
+            if _rem is None: break
+            if tr:
+                if type(tr[0]) is list: seq.extend(tr)
+                else: seq.append(tr)
+            rem = _rem
+            rep += 1
+        return seq, rem
+
+    def _DICT_52(self, pos):
+        if pos == self.end: return FAIL
+        seq, rem = [], pos
+        tr, rem = self.match_mark(LIT_4, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self.parse_tag('BIND', 'BIND', self.BIND, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        return (seq[0] if len(seq) == 1 else seq), rem
+
+    def _DICT_53(self, pos):
+        seq, rem = ['(merge)'], pos
+        tr, _rem = self.match_str(LIT_20, rem)
+        if _rem is not None:
+            if tr:
+                if type(tr[0]) is list: seq.extend(tr)
+                else: seq.append(tr)
+            rem = _rem
+        else: return FAIL
+        return ['(merge)'], rem
+
+    def BODY(self, pos):
+        if pos == self.end: return FAIL
+        seq, rem = [], pos
+        tr, rem = self._BODY_54(rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self._BODY_55(rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self._BODY_56(rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        return (seq[0] if len(seq) == 1 else seq), rem
+
+    def _BODY_54(self, pos):
+        seq, rem = ['(merge)'], pos
+        tr, _rem = self.parse_tag('PRINT', 'PRINT', self.PRINT, rem)
+        if _rem is not None:
+            if tr:
+                if type(tr[0]) is list: seq.extend(tr)
+                else: seq.append(tr)
+            rem = _rem
+        return seq, rem
+
+    def _BODY_55(self, pos):
+        if pos == self.end: return FAIL
+        c = self.next_char(pos)
+        if c in FIRST_15 or c > '\x7f':
+            tree, rem = self.parse_tag('IF_ELSE', 'IF_ELSE', self.IF_ELSE, pos)
+            if rem is not None: return tree, rem
+        if c in FIRST_15 or c > '\x7f':
+            tree, rem = self.parse_tag('SEQ', 'SEQ', self.SEQ, pos)
+            if rem is not None: return tree, rem
+        return FAIL
+
+    def _BODY_56(self, pos):
+        seq, rem = ['(merge)'], pos
+        tr, _rem = self.parse_tag('PRINT', 'PRINT', self.PRINT, rem)
+        if _rem is not None:
+            if tr:
+                if type(tr[0]) is list: seq.extend(tr)
+                else: seq.append(tr)
+            rem = _rem
+        return seq, rem
+
+    def IF_ELSE(self, pos):
+        if pos == self.end: return FAIL
+        seq, rem = [], pos
+        tr, rem = self.parse_tag('SEQ', 'SEQ', self.SEQ, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self.match_mark(LIT_21, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self.parse_tag('SEQ', 'SEQ', self.SEQ, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self.match_mark(LIT_22, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self.parse_tag('EXP', 'EXP', self.EXP, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        return (seq[0] if len(seq) == 1 else seq), rem
+
+    def SEQ(self, pos):
+        if pos == self.end: return FAIL
+        seq, rem = [], pos
+        tr, rem = self.parse_tag('_TERM', '_TERM', self._TERM, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self._SEQ_57(rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        return (seq[0] if len(seq) == 1 else seq), rem
+
+    def _SEQ_57(self, pos):
+        seq, rem = ['(merge)'], pos
+        rep = 0
+        while True:
+            tr, _rem = self._SEQ_58(rem)
+            if _rem is None: break
+            if tr:
+                if type(tr[0]) is list: seq.extend(tr)
+                else: seq.append(tr)
+            rem = _rem
+            rep += 1
+        return seq, rem
+
+    def _SEQ_58(self, pos):
+        if pos == self.end: return FAIL
+        seq, rem = [], pos
+        tr, rem = self._SEQ_59(rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self.parse_tag('_TERM', '_TERM', self._TERM, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        return (seq[0] if len(seq) == 1 else seq), rem
+
+    def _SEQ_59(self, pos):
+        seq, rem = ['(merge)'], pos
+        tr, _rem = self.parse_tag('BOP', 'BOP', self.BOP, rem)
+        if _rem is not None:
+            if tr:
+                if type(tr[0]) is list: seq.extend(tr)
+                else: seq.append(tr)
+            rem = _rem
+        return seq, rem
+
+    def _TERM(self, pos):
+        if pos == self.end: return FAIL
+        seq, rem = [], pos
+        tr, rem = self.__TERM_60(rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self.parse_tag('ITEM', 'ITEM', self.ITEM, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self.__TERM_61(rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self.__TERM_62(rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        return (seq[0] if len(seq) == 1 else seq), rem
+
+    def __TERM_60(self, pos):
+        seq, rem = ['(merge)'], pos
+        tr, _rem = self.parse_tag('LOP', 'LOP', self.LOP, rem)
+        if _rem is not None:
+            if tr:
+                if type(tr[0]) is list: seq.extend(tr)
+                else: seq.append(tr)
+            rem = _rem
+        return seq, rem
+
+    def __TERM_61(self, pos):
+        seq, rem = ['(merge)'], pos
+        tr, _rem = self.parse_tag('ATTR', 'ATTR', self.ATTR, rem)
+        if _rem is not None:
+            if tr:
+                if type(tr[0]) is list: seq.extend(tr)
+                else: seq.append(tr)
+            rem = _rem
+        return seq, rem
+
+    def __TERM_62(self, pos):
+        seq, rem = ['(merge)'], pos
+        tr, _rem = self.parse_tag('ROP', 'ROP', self.ROP, rem)
+        if _rem is not None:
+            if tr:
+                if type(tr[0]) is list: seq.extend(tr)
+                else: seq.append(tr)
+            rem = _rem
+        return seq, rem
+
+    def STR(self, pos):
+        return self.match_re(RE_8, pos)
+
+    def PRINT(self, pos):
+        return self.match_re(RE_9, pos)
+
+    def ITEM(self, pos):
+        if pos == self.end: return FAIL
+        c = self.next_char(pos)
+        if c in FIRST_16:
+            tree, rem = self.parse_tag('GROUP', 'GROUP', self.GROUP, pos)
+            if rem is not None: return tree, rem
+        if c in FIRST_17:
+            tree, rem = self.parse_tag('MACRO', 'MACRO', self.MACRO, pos)
+            if rem is not None: return tree, rem
+        if c in FIRST_18 or c > '\x7f':
+            tree, rem = self.parse_tag('ATOM', 'ATOM', self.ATOM, pos)
+            if rem is not None: return tree, rem
+        if c in FIRST_19:
+            tree, rem = self.parse_tag('LIST', 'LIST', self.LIST, pos)
+            if rem is not None: return tree, rem
+        return FAIL
+
+    def GROUP(self, pos):
+        if pos == self.end: return FAIL
+        seq, rem = [], pos
+        tr, rem = self._GROUP_63(rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self.parse_tag('EXP', 'EXP', self.EXP, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self._GROUP_64(rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        return (seq[0] if len(seq) == 1 else seq), rem
+
+    def _GROUP_63(self, pos):
+        seq, rem = ['(merge)'], pos
+        tr, _rem = self.match_str(LIT_19, rem)
+        if _rem is not None:
+            if tr:
+                if type(tr[0]) is list: seq.extend(tr)
+                else: seq.append(tr)
+            rem = _rem
+        else: return FAIL
+        return ['(merge)'], rem
+
+    def _GROUP_64(self, pos):
+        seq, rem = ['(merge)'], pos
+        tr, _rem = self.match_str(LIT_20, rem)
+        if _rem is not None:
+            if tr:
+                if type(tr[0]) is list: seq.extend(tr)
+                else: seq.append(tr)
+            rem = _rem
+        else: return FAIL
+        return ['(merge)'], rem
+
+    def MACRO(self, pos):
+        if pos == self.end: return FAIL
+        seq, rem = [], pos
+        tr, rem = self._MACRO_65(rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self.parse_tag('NAME', 'NAME', self.NAME, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self.parse_tag('VAL_LST', 'VAL_LST', self.VAL_LST, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        return (seq[0] if len(seq) == 1 else seq), rem
+
+    def _MACRO_65(self, pos):
+        seq, rem = ['(merge)'], pos
+        tr, _rem = self.match_mark(LIT_23, rem)
+        if _rem is not None:
+            if tr:
+                if type(tr[0]) is list: seq.extend(tr)
+                else: seq.append(tr)
+            rem = _rem
+        else: return FAIL
+        return ['(nospace)'] + seq, rem
+
+    def ATOM(self, pos):
+        if pos == self.end: return FAIL
+        c = self.next_char(pos)
+        if c in FIRST_11 or c > '\x7f':
+            tree, rem = self.parse_tag('FIELD', 'FIELD', self.FIELD, pos)
+            if rem is not None: return tree, rem
+        if c in FIRST_20:
+            tree, rem = self.parse_tag('UNKNOWN', 'UNKNOWN', self.UNKNOWN, pos)
+            if rem is not None: return tree, rem
+        if c in FIRST_21:
+            tree, rem = self._ATOM_66(pos)
+            if rem is not None: return tree, rem
+        if c in FIRST_22:
+            tree, rem = self.parse_tag('ANS', 'ANS', self.ANS, pos)
+            if rem is not None: return tree, rem
+        if c in FIRST_9 or c > '\x7f':
+            tree, rem = self.parse_tag('NUM', 'NUM', self.NUM, pos)
+            if rem is not None: return tree, rem
+        return FAIL
+
+    def _ATOM_66(self, pos):
+        if pos == self.end: return FAIL
+        seq, rem = [], pos
+        tr, rem = self.match_mark(LIT_24, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self.parse_tag('SYM', 'SYM', self.SYM, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        return (seq[0] if len(seq) == 1 else seq), rem
+
+    def UNKNOWN(self, pos):
+        return self.match_re(RE_10, pos)
+
+    def SYM(self, pos):
+        return self.match_re(RE_11, pos)
+
+    def ANS(self, pos):
+        return self.match_re(RE_12, pos)
+
+    def NUM(self, pos):
+        if pos == self.end: return FAIL
+        c = self.next_char(pos)
+        if c in FIRST_23:
+            tree, rem = self.parse_tag('BIN', 'BIN', self.BIN, pos)
+            if rem is not None: return tree, rem
+        if c in FIRST_23:
+            tree, rem = self.parse_tag('HEX', 'HEX', self.HEX, pos)
+            if rem is not None: return tree, rem
+        if c in FIRST_9 or c > '\x7f':
+            tree, rem = self.parse_tag('COMPLEX', 'COMPLEX', self.COMPLEX, pos)
+            if rem is not None: return tree, rem
+        if c in FIRST_9 or c > '\x7f':
+            tree, rem = self.parse_tag('REAL', 'REAL', self.REAL, pos)
+            if rem is not None: return tree, rem
+        return FAIL
+
+    def COMPLEX(self, pos):
+        if pos == self.end: return FAIL
+        seq, rem = [], pos
+        tr, rem = self.parse_tag('REAL', 'REAL', self.REAL, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self.match_re(RE_13, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self.parse_tag('REAL', 'REAL', self.REAL, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self.match_mark(LIT_25, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        return (seq[0] if len(seq) == 1 else seq), rem
+
+    def REAL(self, pos):
+        if pos == self.end: return FAIL
+        seq, rem = [], pos
+        tr, rem = self.match_re(RE_14, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self._REAL_67(rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        return (seq[0] if len(seq) == 1 else seq), rem
+
+    def _REAL_67(self, pos):
+        seq, rem = ['(merge)'], pos
+        tr, _rem = self._REAL_68(rem)
+        if _rem is not None:
+            if tr:
+                if type(tr[0]) is list: seq.extend(tr)
+                else: seq.append(tr)
+            rem = _rem
+        return seq, rem
+
+    def _REAL_68(self, pos):
+        if pos == self.end: return FAIL
+        seq, rem = [], pos
+        tr, rem = self._REAL_69(rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self.match_re(RE_16, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        return (seq[0] if len(seq) == 1 else seq), rem
+
+    def _REAL_69(self, pos):
+        seq, rem = ['(merge)'], pos
+        tr, _rem = self.match_re(RE_15, rem)
+        if _rem is not None:
+            if tr:
+                if type(tr[0]) is list: seq.extend(tr)
+                else: seq.append(tr)
+            rem = _rem
+        else: return FAIL
+        return ['(merge)'], rem
+
+    def BIN(self, pos):
+        return self.match_re(RE_17, pos)
+
+    def HEX(self, pos):
+        return self.match_re(RE_18, pos)
+
+    def LIST(self, pos):
+        if pos == self.end: return FAIL
+        c = self.next_char(pos)
+        if c in FIRST_21:
+            tree, rem = self._LIST_70(pos)
+            if rem is not None: return tree, rem
+        if c in FIRST_12:
+            tree, rem = self.parse_tag('GEN_LST', 'GEN_LST', self.GEN_LST, pos)
+            if rem is not None: return tree, rem
+        if c in FIRST_16:
+            tree, rem = self.parse_tag('LAZY_LST', 'LAZY_LST', self.LAZY_LST, pos)
+            if rem is not None: return tree, rem
+        if c in FIRST_24:
+            tree, rem = self.match_mark(LIT_26, pos)
+            if rem is not None: return tree, rem
+        if c in FIRST_12:
+            tree, rem = self.parse_tag('VAL_LST', 'VAL_LST', self.VAL_LST, pos)
+            if rem is not None: return tree, rem
+        return FAIL
+
+    def _LIST_70(self, pos):
+        if pos == self.end: return FAIL
+        seq, rem = [], pos
+        tr, rem = self.match_mark(LIT_24, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self.parse_tag('SYM_LST', 'SYM_LST', self.SYM_LST, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        return (seq[0] if len(seq) == 1 else seq), rem
+
+    def SYM_LST(self, pos):
+        if pos == self.end: return FAIL
+        seq, rem = [], pos
+        tr, rem = self.match_mark(LIT_13, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self._SYM_LST_71(rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self.match_mark(LIT_14, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        return (seq[0] if len(seq) == 1 else seq), rem
+
+    def _SYM_LST_71(self, pos):
+        seq, rem = ['(merge)'], pos
+        tr, _rem = self._SYM_LST_72(rem)
+        if _rem is not None:
+            if tr:
+                if type(tr[0]) is list: seq.extend(tr)
+                else: seq.append(tr)
+            rem = _rem
+        return seq, rem
+
+    def _SYM_LST_72(self, pos):
+        if pos == self.end: return FAIL
+        seq, rem = [], pos
+        tr, rem = self._SYM_LST_73(rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self._SYM_LST_74(rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        return (seq[0] if len(seq) == 1 else seq), rem
+
+    def _SYM_LST_73(self, pos):
+        if pos == self.end: return FAIL
+        c = self.next_char(pos)
+        if c in FIRST_25:
+            tree, rem = self.parse_tag('UNQUOTE', 'UNQUOTE', self.UNQUOTE, pos)
+            if rem is not None: return tree, rem
+        if c in FIRST_12:
+            tree, rem = self.parse_tag('SYM_LST', 'SYM_LST', self.SYM_LST, pos)
+            if rem is not None: return tree, rem
+        if c in FIRST_11 or c > '\x7f':
+            tree, rem = self.parse_tag('SYM', 'SYM', self.SYM, pos)
+            if rem is not None: return tree, rem
+        return FAIL
+
+    def _SYM_LST_74(self, pos):
+        seq, rem = ['(merge)'], pos
+        rep = 0
+        while True:
+            tr, _rem = self._SYM_LST_75(rem)
+            if _rem is None: break
+            if tr:
+                if type(tr[0]) is list: seq.extend(tr)
+                else: seq.append(tr)
+            rem = _rem
+            rep += 1
+        return seq, rem
+
+    def _SYM_LST_75(self, pos):
+        if pos == self.end: return FAIL
+        seq, rem = [], pos
+        tr, rem = self.match_mark(LIT_4, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self._SYM_LST_76(rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        return (seq[0] if len(seq) == 1 else seq), rem
+
+    def _SYM_LST_76(self, pos):
+        if pos == self.end: return FAIL
+        c = self.next_char(pos)
+        if c in FIRST_25:
+            tree, rem = self.parse_tag('UNQUOTE', 'UNQUOTE', self.UNQUOTE, pos)
+            if rem is not None: return tree, rem
+        if c in FIRST_12:
+            tree, rem = self.parse_tag('SYM_LST', 'SYM_LST', self.SYM_LST, pos)
+            if rem is not None: return tree, rem
+        if c in FIRST_11 or c > '\x7f':
+            tree, rem = self.parse_tag('SYM', 'SYM', self.SYM, pos)
+            if rem is not None: return tree, rem
+        return FAIL
+
+    def UNQUOTE(self, pos):
+        if pos == self.end: return FAIL
+        seq, rem = [], pos
+        tr, rem = self.match_mark(LIT_27, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self.parse_tag('ITEM', 'ITEM', self.ITEM, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        return (seq[0] if len(seq) == 1 else seq), rem
+
+    def GEN_LST(self, pos):
+        if pos == self.end: return FAIL
+        seq, rem = [], pos
+        tr, rem = self.match_mark(LIT_13, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self._GEN_LST_77(rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self.match_mark(LIT_14, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        return (seq[0] if len(seq) == 1 else seq), rem
+
+    def _GEN_LST_77(self, pos):
+        if pos == self.end: return FAIL
+        seq, rem = [], pos
+        tr, rem = self.parse_tag('EXP', 'EXP', self.EXP, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self._GEN_LST_78(rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        return (seq[0] if len(seq) == 1 else seq), rem
+
+    def _GEN_LST_78(self, pos):
+        seq, rem = ['(merge)'], pos
+        rep = 0
+        while True:
+            tr, _rem = self._GEN_LST_79(rem)
+            if _rem is None: break
+            if tr:
+                if type(tr[0]) is list: seq.extend(tr)
+                else: seq.append(tr)
+            rem = _rem
+            rep += 1
+        if not rep: return FAIL
+        return seq, rem
+
+    def _GEN_LST_79(self, pos):
+        if pos == self.end: return FAIL
+        seq, rem = [], pos
+        tr, rem = self.match_mark(LIT_28, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self.parse_tag('CONSTR', 'CONSTR', self.CONSTR, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        return (seq[0] if len(seq) == 1 else seq), rem
+
+    def LAZY_LST(self, pos):
+        if pos == self.end: return FAIL
+        seq, rem = [], pos
+        tr, rem = self._LAZY_LST_80(rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self._LAZY_LST_81(rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self._LAZY_LST_84(rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        return (seq[0] if len(seq) == 1 else seq), rem
+
+    def _LAZY_LST_80(self, pos):
+        seq, rem = ['(merge)'], pos
+        tr, _rem = self.match_str(LIT_19, rem)
+        if _rem is not None:
+            if tr:
+                if type(tr[0]) is list: seq.extend(tr)
+                else: seq.append(tr)
+            rem = _rem
+        else: return FAIL
+        return ['(merge)'], rem
+
+    def _LAZY_LST_81(self, pos):
+        if pos == self.end: return FAIL
+        seq, rem = [], pos
+        tr, rem = self.parse_tag('EXP', 'EXP', self.EXP, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self._LAZY_LST_82(rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        return (seq[0] if len(seq) == 1 else seq), rem
+
+    def _LAZY_LST_82(self, pos):
+        seq, rem = ['(merge)'], pos
+        rep = 0
+        while True:
+            tr, _rem = self._LAZY_LST_83(rem)
+            if _rem is None: break
+            if tr:
+                if type(tr[0]) is list: seq.extend(tr)
+                else: seq.append(tr)
+            rem = _rem
+            rep += 1
+        if not rep: return FAIL
+        return seq, rem
+
+    def _LAZY_LST_83(self, pos):
+        if pos == self.end: return FAIL
+        seq, rem = [], pos
+        tr, rem = self.match_mark(LIT_28, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self.parse_tag('CONSTR', 'CONSTR', self.CONSTR, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        return (seq[0] if len(seq) == 1 else seq), rem
+
+    def _LAZY_LST_84(self, pos):
+        seq, rem = ['(merge)'], pos
+        tr, _rem = self.match_str(LIT_20, rem)
+        if _rem is not None:
+            if tr:
+                if type(tr[0]) is list: seq.extend(tr)
+                else: seq.append(tr)
+            rem = _rem
+        else: return FAIL
+        return ['(merge)'], rem
+
+    def CONSTR(self, pos):
+        if pos == self.end: return FAIL
+        seq, rem = [], pos
+        tr, rem = self.parse_tag('FORM', 'FORM', self.FORM, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self.match_mark(LIT_29, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self.parse_tag('EXP', 'EXP', self.EXP, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self._CONSTR_85(rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self._CONSTR_86(rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        return (seq[0] if len(seq) == 1 else seq), rem
+
+    def _CONSTR_85(self, pos):
+        seq, rem = ['(merge)'], pos
+        tr, _rem = self.parse_tag('WITH', 'WITH', self.WITH, rem)
+        if _rem is not None:
+            if tr:
+                if type(tr[0]) is list: seq.extend(tr)
+                else: seq.append(tr)
+            rem = _rem
+        return seq, rem
+
+    def _CONSTR_86(self, pos):
+        seq, rem = ['(merge)'], pos
+        tr, _rem = self.parse_tag('COND', 'COND', self.COND, rem)
+        if _rem is not None:
+            if tr:
+                if type(tr[0]) is list: seq.extend(tr)
+                else: seq.append(tr)
+            rem = _rem
+        return seq, rem
+
+    def WITH(self, pos):
+        if pos == self.end: return FAIL
+        seq, rem = [], pos
+        tr, rem = self.match_mark(LIT_30, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self._WITH_87(rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        return (seq[0] if len(seq) == 1 else seq), rem
+
+    def _WITH_87(self, pos):
+        if pos == self.end: return FAIL
+        c = self.next_char(pos)
+        if c in FIRST_16:
+            tree, rem = self.parse_tag('DICT', 'DICT', self.DICT, pos)
+            if rem is not None: return tree, rem
+        if c in FIRST_1 or c > '\x7f':
+            tree, rem = self.parse_tag('BIND', 'BIND', self.BIND, pos)
+            if rem is not None: return tree, rem
+        return FAIL
+
+    def COND(self, pos):
+        if pos == self.end: return FAIL
+        seq, rem = [], pos
+        tr, rem = self.match_mark(LIT_21, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self.parse_tag('EXP', 'EXP', self.EXP, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        return (seq[0] if len(seq) == 1 else seq), rem
+
+    def VAL_LST(self, pos):
+        if pos == self.end: return FAIL
+        c = self.next_char(pos)
+        if c in FIRST_12:
+            tree, rem = self._VAL_LST_88(pos)
+            if rem is not None: return tree, rem
+        if c in FIRST_12:
+            tree, rem = self._VAL_LST_93(pos)
+            if rem is not None: return tree, rem
+        return FAIL
+
+    def _VAL_LST_88(self, pos):
+        if pos == self.end: return FAIL
+        seq, rem = [], pos
+        tr, rem = self.match_mark(LIT_13, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self._VAL_LST_89(rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self.match_mark(LIT_14, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        return (seq[0] if len(seq) == 1 else seq), rem
+
+    def _VAL_LST_89(self, pos):
+        seq, rem = ['(merge)'], pos
+        tr, _rem = self._VAL_LST_90(rem)
+        if _rem is not None:
+            if tr:
+                if type(tr[0]) is list: seq.extend(tr)
+                else: seq.append(tr)
+            rem = _rem
+        return seq, rem
+
+    def _VAL_LST_90(self, pos):
+        if pos == self.end: return FAIL
+        seq, rem = [], pos
+        tr, rem = self.parse_tag('EXP', 'EXP', self.EXP, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self._VAL_LST_91(rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        return (seq[0] if len(seq) == 1 else seq), rem
+
+    def _VAL_LST_91(self, pos):
+        seq, rem = ['(merge)'], pos
+        rep = 0
+        while True:
+            tr, _rem = self._VAL_LST_92(rem)
+            if _rem is None: break
+            if tr:
+                if type(tr[0]) is list: seq.extend(tr)
+                else: seq.append(tr)
+            rem = _rem
+            rep += 1
+        return seq, rem
+
+    def _VAL_LST_92(self, pos):
+        if pos == self.end: return FAIL
+        seq, rem = [], pos
+        tr, rem = self.match_mark(LIT_4, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self.parse_tag('EXP', 'EXP', self.EXP, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        return (seq[0] if len(seq) == 1 else seq), rem
+
+    def _VAL_LST_93(self, pos):
+        if pos == self.end: return FAIL
+        seq, rem = [], pos
+        tr, rem = self.match_mark(LIT_13, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self._VAL_LST_94(rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self.match_mark(LIT_14, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        return (seq[0] if len(seq) == 1 else seq), rem
+
+    def _VAL_LST_94(self, pos):
+        seq, rem = ['(merge)'], pos
+        tr, _rem = self._VAL_LST_95(rem)
+        if _rem is not None:
+            if tr:
+                if type(tr[0]) is list: seq.extend(tr)
+                else: seq.append(tr)
+            rem = _rem
+        return seq, rem
+
+    def _VAL_LST_95(self, pos):
+        if pos == self.end: return FAIL
+        seq, rem = [], pos
+        tr, rem = self.parse_tag('SUB_LST', 'VAL_LST', self.SUB_LST, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self._VAL_LST_96(rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        return (seq[0] if len(seq) == 1 else seq), rem
+
+    def _VAL_LST_96(self, pos):
+        seq, rem = ['(merge)'], pos
+        rep = 0
+        while True:
+            tr, _rem = self._VAL_LST_97(rem)
+            if _rem is None: break
+            if tr:
+                if type(tr[0]) is list: seq.extend(tr)
+                else: seq.append(tr)
+            rem = _rem
+            rep += 1
+        return seq, rem
+
+    def _VAL_LST_97(self, pos):
+        if pos == self.end: return FAIL
+        seq, rem = [], pos
+        tr, rem = self.match_mark(LIT_0, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self.parse_tag('SUB_LST', 'VAL_LST', self.SUB_LST, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        return (seq[0] if len(seq) == 1 else seq), rem
+
+    def SUB_LST(self, pos):
+        if pos == self.end: return FAIL
+        seq, rem = [], pos
+        tr, rem = self.parse_tag('EXP', 'EXP', self.EXP, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self._SUB_LST_98(rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        return (seq[0] if len(seq) == 1 else seq), rem
+
+    def _SUB_LST_98(self, pos):
+        seq, rem = ['(merge)'], pos
+        rep = 0
+        while True:
+            tr, _rem = self._SUB_LST_99(rem)
+            if _rem is None: break
+            if tr:
+                if type(tr[0]) is list: seq.extend(tr)
+                else: seq.append(tr)
+            rem = _rem
+            rep += 1
+        return seq, rem
+
+    def _SUB_LST_99(self, pos):
+        if pos == self.end: return FAIL
+        seq, rem = [], pos
+        tr, rem = self.match_mark(LIT_4, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        tr, rem = self.parse_tag('EXP', 'EXP', self.EXP, rem)
+        if rem is None: return FAIL
+        if tr: self.add_item(seq, tr)
+        return (seq[0] if len(seq) == 1 else seq), rem
+
+    def BOP(self, pos):
+        if pos == self.end: return FAIL
+        return self.match_any(ALTS_0, pos)
+
+    def LOP(self, pos):
+        if pos == self.end: return FAIL
+        return self.match_any(ALTS_1, pos)
+
+    def ROP(self, pos):
+        if pos == self.end: return FAIL
+        return self.match_any(ALTS_2, pos)